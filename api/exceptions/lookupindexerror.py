@@ -0,0 +1,2 @@
+class LookupIndexError(Exception):
+    pass
@@ -1,25 +1,27 @@
-class AutomatedTuningModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.product = ""
-        self.condensed_form = ""
-        self.location_group = ""
-        self.salt_value = ""
-        self.price_up_active_flag = ""
-        self.price_up_measurement_level = ""
-        self.price_up_concentration = 0.0
-        self.price_up_magnitude = 0.0
-        self.price_up_realization = 0.0
-        self.price_up_min_win_rate_diff = 0.0
-        self.price_up_sig_level = 0.0
-        self.price_up_power = 0.0
-        self.price_up_obs_req = 0.0
-        self.price_down_active_flag = 0.0
-        self.price_down_measurement_level = 0.0
-        self.price_down_concentration = 0.0
-        self.price_down_magnitude = 0.0
-        self.price_down_realization = 0.0
-        self.price_down_min_win_rate_diff = 0.0
-        self.price_down_sig_level = 0.0
-        self.price_down_power = 0.0
-        self.price_down_obs_req = 0.0
+from typing import NamedTuple
+
+
+class AutomatedTuningModel(NamedTuple):
+    unique_id: str = ""
+    product: str = ""
+    condensed_form: str = ""
+    location_group: str = ""
+    salt_value: str = ""
+    price_up_active_flag: str = ""
+    price_up_measurement_level: str = ""
+    price_up_concentration: float = 0.0
+    price_up_magnitude: float = 0.0
+    price_up_realization: float = 0.0
+    price_up_min_win_rate_diff: float = 0.0
+    price_up_sig_level: float = 0.0
+    price_up_power: float = 0.0
+    price_up_obs_req: int = 0
+    price_down_active_flag: str = ""
+    price_down_measurement_level: str = ""
+    price_down_concentration: float = 0.0
+    price_down_magnitude: float = 0.0
+    price_down_realization: float = 0.0
+    price_down_min_win_rate_diff: float = 0.0
+    price_down_sig_level: float = 0.0
+    price_down_power: float = 0.0
+    price_down_obs_req: int = 0
@@ -1,7 +1,9 @@
-class BwRatingModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.multi_market_name = ""
-        self.bellwether_material = ""
-        self.bw_rating_value = ""
-        self.bw_ratting_adder = ""
+from typing import NamedTuple
+
+
+class BwRatingModel(NamedTuple):
+    unique_id: str = ""
+    multi_market_name: str = ""
+    bellwether_material: str = ""
+    bw_rating_value: str = ""
+    bw_ratting_adder: float = 0.0
@@ -0,0 +1,8 @@
+import datetime
+from typing import NamedTuple
+
+
+class CalculationClockModel(NamedTuple):
+    now: datetime.datetime
+    year_from_now: datetime.datetime
+    monday_date: str
@@ -0,0 +1,12 @@
+from typing import NamedTuple, Optional
+
+from marshmallow import Schema
+
+
+class CalculationNodeModel(NamedTuple):
+    name: str
+    formula: str
+    trace: Optional[str] = None
+    schema: Optional[type[Schema]] = None
+    row: bool = False
+    check: bool = False
@@ -1,9 +1,11 @@
-class ClCodeModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.customer_number = ""
-        self.customer_sales_office = ""
-        self.product = ""
-        self.form = ""
-        self.cl_code_value = ""
-        self.cl_discount = ""
+from typing import NamedTuple
+
+
+class ClCodeModel(NamedTuple):
+    unique_id: str = ""
+    customer_number: str = ""
+    customer_sales_office: str = ""
+    product: str = ""
+    form: str = ""
+    cl_code_value: str = ""
+    cl_discount: float = 0.0
@@ -1,11 +1,13 @@
-class CostAdjustmentModel:
-    def __init__(self):
-        self.product = ""
-        self.cost = 0.0
-        self.form = ""
-        self.material = ""
-        self.material_classification = ""
-        self.material_description = ""
-        self.stock_plant = ""
-        self.target_margin = 0.0
-        self.unique_id = ""
+from typing import NamedTuple
+
+
+class CostAdjustmentModel(NamedTuple):
+    product: str = ""
+    cost: float = 0.0
+    form: str = ""
+    material: str = ""
+    material_classification: str = ""
+    material_description: str = ""
+    stock_plant: str = ""
+    target_margin: float = 0.0
+    unique_id: str = ""
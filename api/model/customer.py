@@ -1,15 +1,17 @@
-class CustomerModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.customer_number = ""
-        self.sap_ind = ""
-        self.multi_market_name = ""
-        self.customer_sales_office = ""
-        self.isr_office = ""
-        self.customer_name = ""
-        self.rc_mapping = ""
-        self.dso = ""
-        self.waive_skid = ""
-        self.dso_adder = ""
-        self.percent_adder = ""
-        self.dollar_adder = ""
+from typing import Any, NamedTuple
+
+
+class CustomerModel(NamedTuple):
+    unique_id: str = ""
+    customer_number: str = ""
+    sap_ind: str = ""
+    multi_market_name: str = ""
+    customer_sales_office: str = ""
+    isr_office: str = ""
+    customer_name: str = ""
+    rc_mapping: str = ""
+    dso: float = 0.0
+    waive_skid: str = ""
+    dso_adder: Any = None
+    percent_adder: float = 0.0
+    dollar_adder: float = 0.0
@@ -1,7 +1,9 @@
-class FreightDefaultModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.ship_plant = ""
-        self.state = ""
-        self.default_freight_charge_per_100_pounds = ""
-        self.default_minimum_freight_charge = ""
+from typing import NamedTuple
+
+
+class FreightDefaultModel(NamedTuple):
+    unique_id: str = ""
+    ship_plant: str = ""
+    state: str = ""
+    default_freight_charge_per_100_pounds: float = 0.0
+    default_minimum_freight_charge: float = 0.0
@@ -1,8 +1,10 @@
-class IdoModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.stock_plant = ""
-        self.ship_plant = ""
-        self.ido_per_pound = ""
-        self.ido_min = ""
-        self.ido_max = ""
+from typing import Any, NamedTuple
+
+
+class IdoModel(NamedTuple):
+    unique_id: str = ""
+    stock_plant: str = ""
+    ship_plant: str = ""
+    ido_per_pound: Any = None
+    ido_min: float = 0.0
+    ido_max: float = 0.0
@@ -0,0 +1,18 @@
+from typing import NamedTuple, Optional
+
+from api.model.costadjustment import CostAdjustmentModel
+from api.model.ido import IdoModel
+from api.model.materialsalesoffice import MaterialSalesOfficeModel
+from api.model.milltoplantfreight import MillToPlantFreightModel
+from api.model.packagingcost import PackagingCostModel
+from api.model.product import ProductModel
+
+
+class LineContextModel(NamedTuple):
+    product: Optional[ProductModel] = None
+    cost_adjustment: Optional[CostAdjustmentModel] = None
+    mill_to_plant_freight_key: Optional[str] = None
+    mill_to_plant_freight: Optional[MillToPlantFreightModel] = None
+    ido: Optional[IdoModel] = None
+    material_sales_office: Optional[MaterialSalesOfficeModel] = None
+    packaging_cost: Optional[PackagingCostModel] = None
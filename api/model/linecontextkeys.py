@@ -0,0 +1,11 @@
+from typing import NamedTuple, Optional
+
+
+class LineContextKeysModel(NamedTuple):
+    product_key: Optional[str] = None
+    cost_adjustment_key: Optional[str] = None
+    ship_plant: Optional[str] = None
+    cost_plus_mtp_key: Optional[str] = None
+    ido_key: Optional[str] = None
+    material_sales_office_key: Optional[str] = None
+    overhead_group_key: Optional[str] = None
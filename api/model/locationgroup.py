@@ -1,6 +1,8 @@
-class LocationGroupModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.rc_mapping = ""
-        self.location_group_value = ""
-        self.region = ""
+from typing import NamedTuple
+
+
+class LocationGroupModel(NamedTuple):
+    unique_id: str = ""
+    rc_mapping: str = ""
+    location_group_value: str = ""
+    region: str = ""
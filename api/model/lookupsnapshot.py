@@ -0,0 +1,9 @@
+import datetime
+
+
+class LookupSnapshotModel:
+    def __init__(self, version: str, lookup_service, signature: tuple):
+        self.version = version
+        self.lookup_service = lookup_service
+        self.signature = signature
+        self.create_date = datetime.datetime.now()
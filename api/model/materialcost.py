@@ -0,0 +1,43 @@
+from typing import Any, NamedTuple, Optional, Union
+
+from api.model.costadjustment import CostAdjustmentModel
+from api.model.ido import IdoModel
+from api.model.milltoplantfreight import MillToPlantFreightModel
+from api.model.packagingcost import PackagingCostModel
+from api.model.product import ProductModel
+from api.model.southskidcharge import SouthSkidChargeModel
+
+
+class MaterialCostModel(NamedTuple):
+    product_info: Optional[ProductModel] = None
+    cost_adjustment_test_info: Optional[CostAdjustmentModel] = None
+    material_classification: Optional[str] = None
+    cost_plus: Optional[bool] = None
+    bell_wether_material: Optional[str] = None
+    bell_wether_base_cost: Any = None
+    index: Optional[str] = None
+    exchange_rate_info: Optional[ProductModel] = None
+    exchange_rate_value: Optional[float] = None
+    material_description: Optional[str] = None
+    product: Optional[str] = None
+    form: Optional[str] = None
+    market_movement_adder: Optional[float] = None
+    percent_adjustment: Optional[float] = None
+    dollar_adjustment: Optional[float] = None
+    modeled_cost_raw: Optional[float] = None
+    mtp_ship_plant_info: Optional[MillToPlantFreightModel] = None
+    mill_to_plant_freight: Optional[float] = None
+    ido_info: Optional[IdoModel] = None
+    ido_per_pound: Optional[float] = None
+    ido_min: Optional[float] = None
+    ido_max: Optional[float] = None
+    packaging_cost_info: Optional[PackagingCostModel] = None
+    packaging_cost_info_final: Optional[Union[PackagingCostModel, ProductModel]] = None
+    unit_handling_cost: Optional[float] = None
+    south_skid_charge_info: Optional[SouthSkidChargeModel] = None
+    south_skid_charge_weight: Optional[float] = None
+    south_skid_charge: Optional[float] = None
+    per_ton_packaging_cost: Optional[float] = None
+    per_ton_stocking_cost: Optional[float] = None
+    stocking_cost_per_pound: Optional[float] = None
+    errors: tuple[tuple[str, Exception], ...] = ()
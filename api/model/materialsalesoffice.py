@@ -1,10 +1,12 @@
-class MaterialSalesOfficeModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.material = ""
-        self.isr_office = ""
-        self.start_effective_date = ""
-        self.end_effective_date = ""
-        self.red_margin_threshold = ""
-        self.yellow_margin_threshold = ""
-        self.price_adjustment = ""
+from typing import NamedTuple
+
+
+class MaterialSalesOfficeModel(NamedTuple):
+    unique_id: str = ""
+    material: str = ""
+    isr_office: str = ""
+    start_effective_date: str = ""
+    end_effective_date: str = ""
+    red_margin_threshold: float = 0.0
+    yellow_margin_threshold: float = 0.0
+    price_adjustment: float = 0.0
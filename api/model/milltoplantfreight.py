@@ -1,6 +1,8 @@
-class MillToPlantFreightModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.bellwether_material = ""
-        self.ship_plant = ""
-        self.mill_to_plant_freight_value = 0.00
+from typing import NamedTuple
+
+
+class MillToPlantFreightModel(NamedTuple):
+    unique_id: str = ""
+    bellwether_material: str = ""
+    ship_plant: str = ""
+    mill_to_plant_freight_value: float = 0.0
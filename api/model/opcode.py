@@ -1,14 +1,15 @@
-class OpCodeModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.op_code_value = ""
-        self.description = ""
-        self.cutting_operation = ""
-        self.fab_indicator = ""
-        self.net_weight_low = 0.0
-        self.net_weight_high = 0.0
-        self.pieces_weight_low = 0.0
-        self.pieces_weight_high = 0.0
-        self.long_base_pull_time = 0.0
-        self.op_code_type = ""
+from typing import NamedTuple
 
+
+class OpCodeModel(NamedTuple):
+    unique_id: str = ""
+    op_code_value: str = ""
+    description: str = ""
+    cutting_operation: str = ""
+    fab_indicator: str = ""
+    net_weight_low: float = 0.0
+    net_weight_high: float = 0.0
+    pieces_weight_low: float = 0.0
+    pieces_weight_high: float = 0.0
+    long_base_pull_time: float = 0.0
+    op_code_type: str = ""
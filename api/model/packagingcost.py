@@ -1,8 +1,10 @@
-class PackagingCostModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.overhead_group = ""
-        self.overhead_group_name = ""
-        self.unit_handling_cost = ""
-        self.per_ton_packaging_cost = ""
-        self.per_ton_stocking_cost = ""
+from typing import NamedTuple
+
+
+class PackagingCostModel(NamedTuple):
+    unique_id: str = ""
+    overhead_group: str = ""
+    overhead_group_name: str = ""
+    unit_handling_cost: float = 0.0
+    per_ton_packaging_cost: float = 0.0
+    per_ton_stocking_cost: float = 0.0
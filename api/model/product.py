@@ -1,19 +1,21 @@
-class ProductModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.rc_mapping = ""
-        self.material = ""
-        self.bellwether_material = ""
-        self.product_name = ""
-        self.form = ""
-        self.index = ""
-        self.bellwether_base_cost = 0.0
-        self.market_movement_adder = 0.0
-        self.percent_adjustment = 0.0
-        self.dollar_adjustment = 0.0
-        self.modeled_cost = 0.00
-        self.unit_handling_cost = 0.00
-        self.per_ton_packaging_cost = 0.00
-        self.per_ton_stocking_cost = 0.00
-        self.material_description = ""
-        self.exchange_rate = 0.0
+from typing import NamedTuple
+
+
+class ProductModel(NamedTuple):
+    unique_id: str = ""
+    rc_mapping: str = ""
+    material: str = ""
+    bellwether_material: str = ""
+    product_name: str = ""
+    form: str = ""
+    index: str = ""
+    bellwether_base_cost: float = 0.0
+    market_movement_adder: float = 0.0
+    percent_adjustment: float = 0.0
+    dollar_adjustment: float = 0.0
+    modeled_cost: float = 0.0
+    unit_handling_cost: float = 0.0
+    per_ton_packaging_cost: float = 0.0
+    per_ton_stocking_cost: float = 0.0
+    material_description: str = ""
+    exchange_rate: float = 0.0
@@ -1,6 +1,8 @@
-class ShipZoneModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.customer_id = ""
-        self.ship_plant = ""
-        self.zone = ""
+from typing import NamedTuple
+
+
+class ShipZoneModel(NamedTuple):
+    unique_id: str = ""
+    customer_id: str = ""
+    ship_plant: str = ""
+    zone: str = ""
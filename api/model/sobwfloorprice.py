@@ -1,6 +1,8 @@
-class SoBwFloorPriceModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.isr_office = ""
-        self.bellwether_material = ""
-        self.floor_price = ""
+from typing import NamedTuple
+
+
+class SoBwFloorPriceModel(NamedTuple):
+    unique_id: str = ""
+    isr_office: str = ""
+    bellwether_material: str = ""
+    floor_price: float = 0.0
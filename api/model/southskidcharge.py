@@ -1,7 +1,9 @@
-class SouthSkidChargeModel:
-    def __init__(self):
-        self.unique_id = ""
-        self.product = ""
-        self.form = ""
-        self.weight_per_skid = ""
-        self.skid_charge = ""
+from typing import NamedTuple
+
+
+class SouthSkidChargeModel(NamedTuple):
+    unique_id: str = ""
+    product: str = ""
+    form: str = ""
+    weight_per_skid: float = 0.0
+    skid_charge: float = 0.0
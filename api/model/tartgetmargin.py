@@ -1,6 +1,8 @@
-class TargetMarginModel():
-    def __init__(self):
-        self.unique_id = ""
-        self.isr_office = ""
-        self.bell_wether_material = ""
-        self.target_margin_value = 0.0
+from typing import NamedTuple
+
+
+class TargetMarginModel(NamedTuple):
+    unique_id: str = ""
+    isr_office: str = ""
+    bell_wether_material: str = ""
+    target_margin_value: float = 0.0
@@ -8,16 +8,13 @@ from flasgger import swag_from
 from http import HTTPStatus
 from requests.structures import CaseInsensitiveDict
 
-from api.service.modelservice import ModelService
-from config import Config
 from api.schema.responsewrapperwithmeta import ResponseWrapperWithMetaSchema
 from api.schema.errorwrapperwithmeta import ErrorWrapperWithMetaSchema
 from api.service.authenticationhelper import AuthenticationHelper
+from api.service.modelserializer import model_serializer
 from api.model.calculationoutput import CalculationOutputModel
-from api.service.recommendedprice import RecommendedPrice
-from api.service.quotelinesap import QuoteLineSap
-from api.service.sqllitelookupservice import SqlLiteLookupService
-from api.service.queuedlogger import QueuedLogger
+from api.service.requestlookupservice import RequestLookupService
+from api.service.serviceregistry import ServiceRegistry
 
 
 def lower_keys(data):
@@ -148,6 +145,9 @@ def convert_calculation_outputs_to_array(outputs: list) -> list:
 
 
 class CalculationApi(Resource):
+    def __init__(self, registry: ServiceRegistry):
+        self._registry = registry
+
     @swag_from({
         'parameters': [
             {
@@ -206,7 +206,7 @@ class CalculationApi(Resource):
 
             output = generate_error_wrapper_with_meta(HTTPStatus.NOT_FOUND, error_info, calculation_id)
 
-            return ErrorWrapperWithMetaSchema().dump(output), HTTPStatus.NOT_FOUND
+            return model_serializer(ErrorWrapperWithMetaSchema)(output), HTTPStatus.NOT_FOUND
 
         debug_header = request.headers.get("x-insight-debug")
 
@@ -243,7 +243,7 @@ class CalculationApi(Resource):
 
                 output = generate_error_wrapper_with_meta(HTTPStatus.NOT_FOUND, error_info, calculation_id)
 
-                return ErrorWrapperWithMetaSchema().dump(output), HTTPStatus.BAD_REQUEST
+                return model_serializer(ErrorWrapperWithMetaSchema)(output), HTTPStatus.BAD_REQUEST
 
         if calculation_inputs.get("modelinputs") is None:
             payload_error_info = "Input payload not structured correctly, neither property 'InputParameters' or 'modelInput' is not set."
@@ -254,29 +254,26 @@ class CalculationApi(Resource):
 
             output = generate_error_wrapper_with_meta(HTTPStatus.BAD_REQUEST, payload_error_info, calculation_id)
 
-            return ErrorWrapperWithMetaSchema().dump(output), http.client.BAD_REQUEST
+            return model_serializer(ErrorWrapperWithMetaSchema)(output), http.client.BAD_REQUEST
 
         try:
-            model_service = ModelService()
+            model = self._registry.model_service.get_model(model_id, is_debug_header_set and has_debug_permissions)
 
-            if model_id.casefold() == "recommendedPrice".casefold():
-                model = model_service.get_model(model_id, is_debug_header_set and has_debug_permissions)
+            engine = self._registry.get_engine(model_id)
 
-                lookup_service = SqlLiteLookupService(Config)
-                queued_logger = QueuedLogger()
-                quote_line_sap = QuoteLineSap(lookup_service, queued_logger, Config)
-                recommended_price_model = RecommendedPrice(lookup_service, queued_logger, Config, quote_line_sap)
+            # The whole calculation reads from the snapshot that is active when it starts
+            snapshot = self._registry.snapshots.current
 
-                json_output = recommended_price_model.execute_model(authenticated_client_id, client_id, model, calculation_inputs, calculation_id, token)
-            else:
-                model = model_service.get_model(model_id, is_debug_header_set and has_debug_permissions)
+            metadata["lookupversion"] = snapshot.version
 
-                lookup_service = SqlLiteLookupService(Config)
-                queued_logger = QueuedLogger()
+            # Lines of one quote repeat the same customer level lookups, they are queried once per request
+            request_lookup_service = RequestLookupService(snapshot.lookup_service)
 
-                quote_line_sap = QuoteLineSap(lookup_service, queued_logger, Config)
+            json_output = engine.execute_model(authenticated_client_id, client_id, model, calculation_inputs, calculation_id, token, request_lookup_service)
 
-                json_output = quote_line_sap.execute_model(authenticated_client_id, client_id, model, calculation_inputs, calculation_id, token)
+            if model.debug_mode:
+                metadata["lookupqueries"] = request_lookup_service.queries
+                metadata["savedlookupqueries"] = request_lookup_service.saved_queries
 
             # Collect all the outputs from the calc engine into the output dictionary
             output_dictionary = {k: json.dumps(v) for (k, v) in json_output.items()}
@@ -301,7 +298,7 @@ class CalculationApi(Resource):
 
             output = generate_error_wrapper_with_meta(HTTPStatus.BAD_REQUEST, error, calculation_id)
 
-            return ErrorWrapperWithMetaSchema().dump(output), http.client.BAD_REQUEST
+            return model_serializer(ErrorWrapperWithMetaSchema)(output), http.client.BAD_REQUEST
 
         if calculation_inputs["inputparameters"] is not None:
             converted_output = convert_json_to_calculation_output(json_output)
@@ -312,4 +309,4 @@ class CalculationApi(Resource):
 
         response = {"data": data, "metadata": metadata}
 
-        return ResponseWrapperWithMetaSchema().dump(response), HTTPStatus.OK
+        return model_serializer(ResponseWrapperWithMetaSchema)(response), HTTPStatus.OK
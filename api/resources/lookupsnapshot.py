@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+from flask import request
+from flask_restful import Resource
+from flasgger import swag_from
+
+from api.schema.responsewrapperwithmeta import ResponseWrapperWithMetaSchema
+from api.service.authenticationhelper import AuthenticationHelper
+from api.service.modelserializer import model_serializer
+from api.service.serviceregistry import ServiceRegistry
+
+
+class LookupSnapshotApi(Resource):
+    def __init__(self, registry: ServiceRegistry):
+        self._registry = registry
+
+    @staticmethod
+    def _snapshot_response(snapshot) -> dict:
+        data = {"version": snapshot.version, "createDate": snapshot.create_date.isoformat(timespec="seconds")}
+
+        return model_serializer(ResponseWrapperWithMetaSchema)({"data": data, "metadata": {"lookupversion": snapshot.version}})
+
+    @swag_from({
+        'responses': {
+            HTTPStatus.OK: {
+                'description': 'The active lookup snapshot.',
+                'schema': ResponseWrapperWithMetaSchema
+            }
+        }
+    })
+    def get(self):
+        """
+        Returns the version of the active lookup snapshot.
+        ---
+        """
+        return self._snapshot_response(self._registry.snapshots.current), HTTPStatus.OK
+
+    @swag_from({
+        'responses': {
+            HTTPStatus.OK: {
+                'description': 'The lookup snapshot that was swapped in.',
+                'schema': ResponseWrapperWithMetaSchema
+            },
+            HTTPStatus.UNAUTHORIZED: {
+                'description': 'Caller did not present the admin token.',
+                'schema': ResponseWrapperWithMetaSchema
+            },
+            HTTPStatus.CONFLICT: {
+                'description': 'A reload is already in progress.',
+                'schema': ResponseWrapperWithMetaSchema
+            }
+        }
+    })
+    def post(self):
+        """
+        Rebuilds the lookup snapshot from the lookup database and swaps it in, running calculations finish on the previous one. Requires the admin token in the x-insight-admin-token header.
+        ---
+        """
+        if not AuthenticationHelper.is_admin(self._registry.configuration.admin_token, request.headers.get("x-insight-admin-token")):
+            return model_serializer(ResponseWrapperWithMetaSchema)({"data": {}, "metadata": {}}), HTTPStatus.UNAUTHORIZED
+
+        snapshot = self._registry.snapshots.reload(wait=False)
+
+        if snapshot is None:
+            return model_serializer(ResponseWrapperWithMetaSchema)({"data": {}, "metadata": {"lookupversion": self._registry.snapshots.current.version}}), HTTPStatus.CONFLICT
+
+        return self._snapshot_response(snapshot), HTTPStatus.OK
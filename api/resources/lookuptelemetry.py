@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+from flask import request
+from flask_restful import Resource
+from flasgger import swag_from
+
+from api.schema.responsewrapperwithmeta import ResponseWrapperWithMetaSchema
+from api.service.authenticationhelper import AuthenticationHelper
+from api.service.modelserializer import model_serializer
+from api.service.serviceregistry import ServiceRegistry
+
+
+class LookupTelemetryApi(Resource):
+    def __init__(self, registry: ServiceRegistry):
+        self._registry = registry
+
+    def _is_admin(self) -> bool:
+        return AuthenticationHelper.is_admin(self._registry.configuration.admin_token, request.headers.get("x-insight-admin-token"))
+
+    @staticmethod
+    def _unauthorized_response() -> dict:
+        return model_serializer(ResponseWrapperWithMetaSchema)({"data": {}, "metadata": {}})
+
+    def _telemetry_response(self) -> dict:
+        return model_serializer(ResponseWrapperWithMetaSchema)({"data": self._registry.lookup_statistics(), "metadata": {"lookupversion": self._registry.snapshots.current.version}})
+
+    @swag_from({
+        'responses': {
+            HTTPStatus.OK: {
+                'description': 'Lookup telemetry per table and result cache statistics.',
+                'schema': ResponseWrapperWithMetaSchema
+            },
+            HTTPStatus.UNAUTHORIZED: {
+                'description': 'Caller did not present the admin token.',
+                'schema': ResponseWrapperWithMetaSchema
+            }
+        }
+    })
+    def get(self):
+        """
+        Returns calls, keys, misses, rows decoded and a latency histogram per lookup table and method, slowest tables first, with the result cache statistics. Requires the admin token in the x-insight-admin-token header.
+        ---
+        """
+        if not self._is_admin():
+            return self._unauthorized_response(), HTTPStatus.UNAUTHORIZED
+
+        return self._telemetry_response(), HTTPStatus.OK
+
+    @swag_from({
+        'responses': {
+            HTTPStatus.OK: {
+                'description': 'The lookup telemetry was reset.',
+                'schema': ResponseWrapperWithMetaSchema
+            },
+            HTTPStatus.UNAUTHORIZED: {
+                'description': 'Caller did not present the admin token.',
+                'schema': ResponseWrapperWithMetaSchema
+            }
+        }
+    })
+    def delete(self):
+        """
+        Resets the lookup telemetry. Requires the admin token in the x-insight-admin-token header.
+        ---
+        """
+        if not self._is_admin():
+            return self._unauthorized_response(), HTTPStatus.UNAUTHORIZED
+
+        self._registry.lookup_telemetry.reset()
+
+        return self._telemetry_response(), HTTPStatus.OK
@@ -1,5 +1,9 @@
 from .calculation import CalculationApi
+from .lookupsnapshot import LookupSnapshotApi
+from .lookuptelemetry import LookupTelemetryApi
 
 
-def initialize_routes(api):
-    api.add_resource(CalculationApi, '/ces/clients/<string:client_id>/calculations/<string:model_id>')
+def initialize_routes(api, registry):
+    api.add_resource(CalculationApi, '/ces/clients/<string:client_id>/calculations/<string:model_id>', resource_class_kwargs={"registry": registry})
+    api.add_resource(LookupSnapshotApi, '/ces/admin/lookups/snapshot', resource_class_kwargs={"registry": registry})
+    api.add_resource(LookupTelemetryApi, '/ces/admin/lookups/telemetry', resource_class_kwargs={"registry": registry})
@@ -1,5 +1,7 @@
 import base64
+import hmac
 import json
+from typing import Optional
 
 
 class AuthenticationHelper:
@@ -27,3 +29,11 @@ class AuthenticationHelper:
             client_id = "unknown"
 
         return client_id
+
+    @staticmethod
+    def is_admin(admin_token: str, presented_token: Optional[str]) -> bool:
+        """Admin endpoints stay closed until an admin token is configured, a calculation token is not an admin credential"""
+        if admin_token == "" or presented_token is None:
+            return False
+
+        return hmac.compare_digest(admin_token.encode("utf-8"), presented_token.encode("utf-8"))
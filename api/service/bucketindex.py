@@ -0,0 +1,78 @@
+import sqlite3
+import sys
+from bisect import bisect_left
+from typing import Any, Optional
+
+
+class BucketIndex:
+    """Sorted boundaries of a bucket table (min, max columns, null meaning unbounded), resolved with binary search"""
+
+    def __init__(self, rows: list[dict[str, Any]]):
+        self._rows = rows
+
+        ranges = [(sys.maxsize if row["min"] is None else row["min"], sys.maxsize if row["max"] is None else row["max"]) for row in rows]
+
+        self._boundaries = sorted({boundary for (low, high) in ranges for boundary in (low, high)})
+
+        # Every value strictly between two boundaries falls in the same rows, so each boundary and each gap
+        # around it resolves to the first matching row, the same row the SQL query returns first
+        self._boundary_rows = [self._first_row(ranges, boundary) for boundary in self._boundaries]
+        self._gap_rows = [self._first_row(ranges, self._gap_value(i)) for i in range(len(self._boundaries) + 1)]
+
+    @staticmethod
+    def _first_row(ranges: list[tuple[Any, Any]], val: float) -> Optional[int]:
+        for (i, (low, high)) in enumerate(ranges):
+            if low <= val <= high:
+                return i
+
+        return None
+
+    def _gap_value(self, i: int) -> float:
+        if len(self._boundaries) == 0:
+            return 0.0
+
+        if i == 0:
+            return self._boundaries[0] - 1
+
+        if i == len(self._boundaries):
+            return self._boundaries[-1] + 1
+
+        return (self._boundaries[i - 1] + self._boundaries[i]) / 2
+
+    @classmethod
+    def load(cls, connection: sqlite3.Connection, table_id: str) -> "BucketIndex":
+        cursor = connection.cursor()
+
+        cursor.row_factory = sqlite3.Row
+
+        return cls([dict(row) for row in cursor.execute(f"SELECT * FROM {table_id}")])
+
+    def find(self, val: float) -> Optional[dict[str, Any]]:
+        i = bisect_left(self._boundaries, val)
+
+        if i < len(self._boundaries) and self._boundaries[i] == val:
+            row = self._boundary_rows[i]
+        else:
+            row = self._gap_rows[i]
+
+        return None if row is None else self._rows[row]
+
+    def lookup(self, val: float, column: str) -> Any:
+        row = self.find(val)
+
+        return None if row is None else row[column]
+
+    def lookup_many(self, vals: list[float], column: str) -> list[Any]:
+        boundaries = self._boundaries
+        boundary_count = len(boundaries)
+        values = [None if row is None else self._rows[row][column] for row in self._boundary_rows]
+        gap_values = [None if row is None else self._rows[row][column] for row in self._gap_rows]
+
+        results = list()
+
+        for val in vals:
+            i = bisect_left(boundaries, val)
+
+            results.append(values[i] if i < boundary_count and boundaries[i] == val else gap_values[i])
+
+        return results
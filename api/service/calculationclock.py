@@ -0,0 +1,18 @@
+import datetime
+from typing import Optional
+
+from dateutil.relativedelta import relativedelta
+
+from api.model.calculationclock import CalculationClockModel
+
+
+def calculation_clock(now: Optional[datetime.datetime] = None) -> CalculationClockModel:
+    """The times a calculation reads, taken once so every quote line of a request is priced at the same moment"""
+    if now is None:
+        now = datetime.datetime.now()
+
+    return CalculationClockModel(
+        now=now,
+        year_from_now=now + relativedelta(years=1),
+        monday_date=(now + relativedelta(days=-now.weekday())).strftime("%Y-%m-%d")
+    )
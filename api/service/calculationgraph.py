@@ -0,0 +1,142 @@
+import ast
+import builtins
+import threading
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional
+
+from marshmallow import Schema
+
+from api.exceptions.breakerror import BreakError
+from api.exceptions.symbolnotfounderror import SymbolNotFoundError
+from api.model.calculationnode import CalculationNodeModel
+from api.service.calculationtrace import CalculationTrace
+from api.service.modelserializer import model_serializer
+
+
+def break_when(condition: bool, message: str):
+    """A check node stops the calculation with message when condition holds"""
+    if condition:
+        raise BreakError(message)
+
+
+def formula_names(formula: str) -> list[str]:
+    """Names a formula reads, in the order they first appear"""
+    names = list()
+
+    for element in ast.walk(ast.parse(formula, mode="eval")):
+        if isinstance(element, ast.Name) and element.id not in names:
+            names.append(element.id)
+
+    return names
+
+
+class CalculationStep(NamedTuple):
+    name: str
+    function: Callable[..., Any]
+    arguments: Callable[[dict[str, Any]], tuple]
+    trace: Optional[str]
+    schema: Optional[type[Schema]]
+    row: bool
+
+
+class CalculationGraph:
+    """Named formulas over the values of other nodes and the sources of a calculation. Only the nodes the targets need are evaluated, always in the order they are declared, and check nodes are evaluated for every calculation"""
+
+    def __init__(self, nodes: list[CalculationNodeModel], sources: tuple[str, ...], namespace: dict[str, Any]):
+        self.nodes = {}
+        self.sources = sources
+        self.namespace = namespace
+        self.dependencies = dict()
+        self._steps = dict()
+        self._plans = dict()
+        self._lock = threading.Lock()
+
+        for node in nodes:
+            if node.name in self.nodes or node.name in sources:
+                raise ValueError(f"Calculation '{node.name}' is declared twice.")
+
+            dependencies = list()
+
+            for name in formula_names(node.formula):
+                if name in self.nodes or name in sources:
+                    dependencies.append(name)
+                elif name not in namespace and not hasattr(builtins, name):
+                    # Nodes are declared after the nodes they read
+                    raise SymbolNotFoundError(f"'{name}' used by calculation '{node.name}' is not defined before it.")
+
+            self.nodes[node.name] = node
+            self.dependencies[node.name] = tuple(dependencies)
+
+            function = eval(f"lambda {', '.join(dependencies)}: {node.formula}", dict(namespace))
+
+            if len(dependencies) == 0:
+                arguments = lambda values: ()
+            elif len(dependencies) == 1:
+                arguments = lambda values, name=dependencies[0]: (values[name],)
+            else:
+                arguments = itemgetter(*dependencies)
+
+            self._steps[node.name] = CalculationStep(node.name, function, arguments, node.trace, node.schema, node.row)
+
+        self.checks = tuple(node.name for node in nodes if node.check)
+
+    def plan(self, targets: Iterable[str]) -> tuple[CalculationStep, ...]:
+        """Steps that evaluate the targets and every check, in declaration order"""
+        key = frozenset(targets)
+        plan = self._plans.get(key)
+
+        if plan is not None:
+            return plan
+
+        needed = set()
+        pending = list(key) + list(self.checks)
+
+        while len(pending) > 0:
+            name = pending.pop()
+
+            if name in needed or name in self.sources:
+                continue
+
+            if name not in self.nodes:
+                raise SymbolNotFoundError(f"Calculation '{name}' is not defined.")
+
+            needed.add(name)
+            pending.extend(self.dependencies[name])
+
+        plan = tuple(step for (name, step) in self._steps.items() if name in needed)
+
+        with self._lock:
+            self._plans[key] = plan
+
+        return plan
+
+    def traced(self) -> list[str]:
+        return [node.name for node in self.nodes.values() if node.trace is not None]
+
+    def evaluate(self, plan: tuple[CalculationStep, ...], values: dict[str, Any], trace: CalculationTrace) -> dict[str, Any]:
+        """Evaluates the steps of plan into values, which start out with the sources"""
+        if not trace.enabled:
+            for step in plan:
+                values[step.name] = step.function(*step.arguments(values))
+
+            return values
+
+        for step in plan:
+            value = values[step.name] = step.function(*step.arguments(values))
+
+            if step.trace is None or (step.row and value is None):
+                continue
+
+            if step.schema is not None:
+                trace.dump(step.trace, step.schema, value)
+            else:
+                trace[step.trace] = value
+
+        return values
+
+    def read(self, outputs: list[tuple[str, str]], values: dict[str, Any]) -> Iterator[tuple[str, Any]]:
+        """Output name and value of each output name and node pair, a node with a schema is dumped with it"""
+        for (output_name, name) in outputs:
+            schema = self.nodes[name].schema
+
+            yield output_name, values[name] if schema is None else model_serializer(schema)(values[name])
@@ -0,0 +1,64 @@
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
+
+from marshmallow import Schema
+
+from api.service.modelserializer import model_serializer
+
+# off keeps nothing, keys keeps the calculated values without the looked up rows, full keeps both
+TRACE_LEVELS = ("off", "keys", "full")
+
+
+def trace_level(level: str) -> str:
+    """Checked and normalized trace level, engines resolve the configured level once so a bad setting fails at startup"""
+    normalized = level.strip().casefold()
+
+    if normalized not in TRACE_LEVELS:
+        raise ValueError(f"Unknown calculation trace level '{level}', expected one of {', '.join(TRACE_LEVELS)}.")
+
+    return normalized
+
+
+class _RowDump:
+    __slots__ = ("schema", "row")
+
+    def __init__(self, schema: type[Schema], row: Any):
+        self.schema = schema
+        self.row = row
+
+
+class CalculationTrace(Mapping):
+    """Intermediate calculations of one calculation, only as much as the trace level asks for. Looked up rows are dumped when the trace is read, never while calculating"""
+
+    def __init__(self, level: str = "full"):
+        self.level = trace_level(level)
+        self.enabled = self.level != "off"
+        self._keeps_rows = self.level == "full"
+        self._values = dict()
+
+    def __setitem__(self, name: str, value: Any):
+        if self.enabled:
+            self._values[name] = value
+
+    def update(self, values: Iterable[tuple[str, Any]]):
+        if self.enabled:
+            self._values.update(values)
+
+    def dump(self, name: str, schema: type[Schema], row: Any):
+        """Keeps the row to be dumped with schema when it is read"""
+        if self._keeps_rows:
+            self._values[name] = _RowDump(schema, row)
+
+    def __getitem__(self, name: str) -> Any:
+        value = self._values[name]
+
+        if type(value) is _RowDump:
+            value = self._values[name] = model_serializer(value.schema)(value.row)
+
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -0,0 +1,274 @@
+import sqlite3
+import threading
+from abc import ABC
+from typing import Optional, Any
+
+from api.model.automatedtuning import AutomatedTuningModel
+from api.model.bwrating import BwRatingModel
+from api.model.clcode import ClCodeModel
+from api.model.costadjustment import CostAdjustmentModel
+from api.model.customer import CustomerModel
+from api.model.freightdefault import FreightDefaultModel
+from api.model.ido import IdoModel
+from api.model.linecontext import LineContextModel
+from api.model.linecontextkeys import LineContextKeysModel
+from api.model.locationgroup import LocationGroupModel
+from api.model.materialsalesoffice import MaterialSalesOfficeModel
+from api.model.milltoplantfreight import MillToPlantFreightModel
+from api.model.opcode import OpCodeModel
+from api.model.packagingcost import PackagingCostModel
+from api.model.product import ProductModel
+from api.model.sapfreight import SapFreightModel
+from api.model.shipzone import ShipZoneModel
+from api.model.sobwfloorprice import SoBwFloorPriceModel
+from api.model.southfreight import SouthFreightModel
+from api.model.southskidcharge import SouthSkidChargeModel
+from api.model.tmadjustment import TmAdjustmentModel
+from api.service.bucketindex import BucketIndex
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from api.service.linecontext import compose_line_context
+from api.service.lookupconnectionfactory import LookupConnectionFactory
+from api.service.opcodeindex import OpCodeIndex
+from api.service.rowdecoder import RowDecoder
+from api.service.sqllitelookupservice import LOOKUP_TABLES, PACKAGING_COST_TABLE, customer_from_row, product_from_row, packaging_cost_from_row, op_code_from_row, normalize_key
+from config import Config
+
+
+class InMemoryLookupService(LookupServiceInterface, ABC):
+    """Serves every lookup from dictionaries loaded from the lookup database at construction"""
+
+    def __init__(self, configuration: Config):
+        self._connection_factory = LookupConnectionFactory(configuration)
+        self._lock = threading.Lock()
+
+        connection = self._connection_factory.connect()
+
+        try:
+            self._tables = {table_id: self._load_table(connection, table_id, from_row) for (table_id, from_row) in LOOKUP_TABLES.items()}
+            self._packaging_costs = self._load_packaging_costs(connection)
+            self._customers_by_number = self._load_index(connection, "SELECT * FROM customers", "customernumber", customer_from_row)
+            self._customers_by_sales_office = self._load_index(connection, "SELECT * FROM customers", "customersalesoffice", customer_from_row)
+            self._products_by_rc_mapping = self._load_index(connection, "SELECT * FROM products", "rcmapping", product_from_row)
+            self._op_codes = OpCodeIndex.load(connection, op_code_from_row)
+            self._buckets = {"weight_class": BucketIndex.load(connection, "weight_class")}
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _load_index(connection: sqlite3.Connection, query: str, column: str, from_row: RowDecoder) -> dict[str, Any]:
+        index = dict()
+
+        cursor = connection.execute(query)
+
+        position = [column_name.casefold() for (column_name, *_) in cursor.description].index(column)
+        decode = from_row.for_cursor(cursor)
+
+        for row in cursor:
+            # Mirror fetchone() by keeping the first row for a duplicated key
+            index.setdefault(normalize_key(row[position]), decode(row))
+
+        return index
+
+    @staticmethod
+    def _load_table(connection: sqlite3.Connection, table_id: str, from_row: RowDecoder) -> dict[str, Any]:
+        return InMemoryLookupService._load_index(connection, f"SELECT * FROM {table_id}", "uniqueid", from_row)
+
+    @staticmethod
+    def _load_packaging_costs(connection: sqlite3.Connection) -> dict[str, PackagingCostModel]:
+        query = f"select ogl.uniqueid as lookupkey, pkl.* from {PACKAGING_COST_TABLE} pkl inner join OverheadGroupLookups ogl on pkl.uniqueid = ogl.overheadgroup"
+
+        return InMemoryLookupService._load_index(connection, query, "lookupkey", packaging_cost_from_row)
+
+    def _get_bucket_index(self, table_id: str) -> BucketIndex:
+        bucket_index = self._buckets.get(table_id)
+
+        if bucket_index is None:
+            with self._lock:
+                bucket_index = self._buckets.get(table_id)
+
+                if bucket_index is None:
+                    connection = self._connection_factory.connect()
+
+                    try:
+                        bucket_index = BucketIndex.load(connection, table_id)
+                    finally:
+                        connection.close()
+
+                    self._buckets = self._buckets | {table_id: bucket_index}
+
+        return bucket_index
+
+    def _get_table(self, table_id: str, from_row: RowDecoder) -> dict[str, Any]:
+        table = self._tables.get(table_id)
+
+        if table is None:
+            # Tables outside LOOKUP_TABLES are loaded the first time they are asked for
+            with self._lock:
+                table = self._tables.get(table_id)
+
+                if table is None:
+                    connection = self._connection_factory.connect()
+
+                    try:
+                        table = self._load_table(connection, table_id, from_row)
+                    finally:
+                        connection.close()
+
+                    self._tables = self._tables | {table_id: table}
+
+        return table
+
+    def _lookup(self, table_id: str, label: str, from_row: RowDecoder) -> Any:
+        return self._get_table(table_id, from_row).get(normalize_key(label))
+
+    @staticmethod
+    def _lookup_many(table: dict[str, Any], labels: list[str]) -> dict[str, Any]:
+        results = dict()
+
+        for label in labels:
+            key = normalize_key(label)
+            value = table.get(key)
+
+            if value is not None:
+                results[key] = value
+
+        return results
+
+    def lookup_customer(self, client_id: str, table_id: str, label: str, default_value: Optional[CustomerModel]) -> CustomerModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["customers"])
+
+    def lookup_product(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["products"])
+
+    def lookup_packaging_cost(self, client_id: str, table_id: str, label: str, default_value: Optional[PackagingCostModel]) -> PackagingCostModel:
+        return self._packaging_costs.get(normalize_key(label))
+
+    def lookup_tm_adjustment(self, client_id: str, table_id: str, label: str, default_value: Optional[TmAdjustmentModel]) -> TmAdjustmentModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["tm_adjustments"])
+
+    def lookup_mill_to_plant_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[MillToPlantFreightModel]) -> MillToPlantFreightModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["mill_to_plant_freights"])
+
+    def lookup_material_sales_office(self, client_id: str, table_id: str, label: str, default_value: Optional[MaterialSalesOfficeModel]) -> MaterialSalesOfficeModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["MaterialSalesOfficeLookups"])
+
+    def lookup_sap_freight(self, client_id, table_id: str, label: str, default_value: Optional[SapFreightModel]) -> SapFreightModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["sap_freight_lookups"])
+
+    def lookup_south_skid_charge(self, client_id: str, table_id: str, label: str, default_value: Optional[SouthSkidChargeModel]) -> SouthSkidChargeModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["south_skid_charge_lookup"])
+
+    def lookup_op_code(self, op_code: str, adjusted_net_weight_of_sales_item: float, net_weight_of_sales_item: float) -> OpCodeModel:
+        return self._op_codes.find(op_code, adjusted_net_weight_of_sales_item, net_weight_of_sales_item)
+
+    def lookup_south_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[SouthFreightModel]) -> SouthFreightModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["south_freight_lookups"])
+
+    def lookup_ship_zone(self, client_id: str, table_id: str, label: str, default_value: Optional[ShipZoneModel]) -> ShipZoneModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["ship_zone_lookups"])
+
+    def lookup_so_bw_floor_price(self, client_id: str, table_id: str, label: str, default_value: Optional[SoBwFloorPriceModel]) -> SoBwFloorPriceModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["so_bw_floor_price_lookup"])
+
+    def lookup_bw_rating(self, client_id: str, table_id: str, label: str, default_value: Optional[BwRatingModel]) -> BwRatingModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["bw_rating_lookup"])
+
+    def lookup_freight_default(self, client_id: str, table_id: str, label: str, default_value: Optional[FreightDefaultModel]) -> FreightDefaultModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["freight_defaults"])
+
+    def lookup_target_margin(self, client_id: str, table_id: str, label: str, default_value: Optional[float]) -> float:
+        target_margin = self._lookup(table_id, label, LOOKUP_TABLES["target_margin_lookups"])
+
+        if target_margin is None:
+            return None
+
+        return target_margin.target_margin_value
+
+    def lookup_cl_code(self, client_id: str, table_id: str, label: str, default_value: Optional[ClCodeModel]) -> ClCodeModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["cl_codes"])
+
+    def lookup_ido(self, client_id: str, table_id: str, label: str, default_value: Optional[IdoModel]) -> IdoModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["ido_lookup"])
+
+    def bucketed_lookup(self, client_id: str, table_id: str, val: float, column: str) -> str:
+        return self._get_bucket_index(table_id).lookup(val, column)
+
+    def bucketed_lookup_many(self, client_id: str, table_id: str, vals: list[float], column: str) -> list[str]:
+        return self._get_bucket_index(table_id).lookup_many(vals, column)
+
+    def get_customer_without_office(self, customer_number: str) -> CustomerModel:
+        return self._customers_by_number.get(normalize_key(customer_number))
+
+    def get_default_office(self, customer_sales_office: str) -> CustomerModel:
+        return self._customers_by_sales_office.get(normalize_key(customer_sales_office))
+
+    def lookup_automated_tuning(self, client_id: str, table_id: str, label: str, default_value: Optional[AutomatedTuningModel]) -> AutomatedTuningModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["automated_tuning_lookup"])
+
+    def lookup_location_group(self, client_id: str, table_id: str, label: str, default_value: Optional[LocationGroupModel]) -> LocationGroupModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["location_group_lookup"])
+
+    def lookup_cost_adjustment(self, client_id: str, table_id: str, label: str, default_value: Optional[CostAdjustmentModel]) -> CostAdjustmentModel:
+        return self._lookup(table_id, label, LOOKUP_TABLES["cost_adjustment_test_materials"])
+
+    def lookup_exchange_rate(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
+        return self._products_by_rc_mapping.get(normalize_key(label))
+
+    def lookup_product_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ProductModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["products"]), labels)
+
+    def lookup_packaging_cost_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, PackagingCostModel]:
+        return self._lookup_many(self._packaging_costs, labels)
+
+    def lookup_mill_to_plant_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MillToPlantFreightModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["mill_to_plant_freights"]), labels)
+
+    def lookup_tm_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, TmAdjustmentModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["tm_adjustments"]), labels)
+
+    def lookup_material_sales_office_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MaterialSalesOfficeModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["MaterialSalesOfficeLookups"]), labels)
+
+    def lookup_sap_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SapFreightModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["sap_freight_lookups"]), labels)
+
+    def lookup_south_skid_charge_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthSkidChargeModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["south_skid_charge_lookup"]), labels)
+
+    def lookup_south_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthFreightModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["south_freight_lookups"]), labels)
+
+    def lookup_ship_zone_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ShipZoneModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["ship_zone_lookups"]), labels)
+
+    def lookup_so_bw_floor_price_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SoBwFloorPriceModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["so_bw_floor_price_lookup"]), labels)
+
+    def lookup_bw_rating_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, BwRatingModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["bw_rating_lookup"]), labels)
+
+    def lookup_freight_default_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, FreightDefaultModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["freight_defaults"]), labels)
+
+    def lookup_target_margin_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, float]:
+        target_margins = self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["target_margin_lookups"]), labels)
+
+        return {key: target_margin.target_margin_value for (key, target_margin) in target_margins.items()}
+
+    def lookup_cl_code_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ClCodeModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["cl_codes"]), labels)
+
+    def lookup_ido_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, IdoModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["ido_lookup"]), labels)
+
+    def lookup_automated_tuning_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, AutomatedTuningModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["automated_tuning_lookup"]), labels)
+
+    def lookup_location_group_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, LocationGroupModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["location_group_lookup"]), labels)
+
+    def lookup_cost_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, CostAdjustmentModel]:
+        return self._lookup_many(self._get_table(table_id, LOOKUP_TABLES["cost_adjustment_test_materials"]), labels)
+
+    def lookup_line_context(self, client_id: str, keys: LineContextKeysModel) -> LineContextModel:
+        return compose_line_context(self, client_id, keys)
@@ -0,0 +1,192 @@
+import time
+from abc import ABC
+from typing import Optional, Any, Callable
+
+from api.model.automatedtuning import AutomatedTuningModel
+from api.model.bwrating import BwRatingModel
+from api.model.clcode import ClCodeModel
+from api.model.costadjustment import CostAdjustmentModel
+from api.model.customer import CustomerModel
+from api.model.freightdefault import FreightDefaultModel
+from api.model.ido import IdoModel
+from api.model.linecontext import LineContextModel
+from api.model.linecontextkeys import LineContextKeysModel
+from api.model.locationgroup import LocationGroupModel
+from api.model.materialsalesoffice import MaterialSalesOfficeModel
+from api.model.milltoplantfreight import MillToPlantFreightModel
+from api.model.opcode import OpCodeModel
+from api.model.packagingcost import PackagingCostModel
+from api.model.product import ProductModel
+from api.model.sapfreight import SapFreightModel
+from api.model.shipzone import ShipZoneModel
+from api.model.sobwfloorprice import SoBwFloorPriceModel
+from api.model.southfreight import SouthFreightModel
+from api.model.southskidcharge import SouthSkidChargeModel
+from api.model.tmadjustment import TmAdjustmentModel
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from api.service.lookuptelemetry import LookupTelemetry
+from api.service.sqllitelookupservice import normalize_key
+
+
+class InstrumentedLookupService(LookupServiceInterface, ABC):
+    """Records the latency, keys and rows found of every call into the wrapped lookup service"""
+
+    def __init__(self, lookup_service: LookupServiceInterface, telemetry: LookupTelemetry):
+        self._lookup_service = lookup_service
+        self.telemetry = telemetry
+
+    def _timed(self, method: str, table_id: str, lookup: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        value = lookup()
+
+        self.telemetry.record(method, table_id, time.perf_counter() - started, 1, value is not None)
+
+        return value
+
+    def _timed_many(self, method: str, table_id: str, keys: int, lookup_many: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        values = lookup_many()
+        rows = len(values) if isinstance(values, dict) else sum(value is not None for value in values)
+
+        self.telemetry.record(method, table_id, time.perf_counter() - started, keys, rows)
+
+        return values
+
+    def lookup_customer(self, client_id: str, table_id: str, label: str, default_value: Optional[CustomerModel]) -> CustomerModel:
+        return self._timed("lookup_customer", table_id, lambda: self._lookup_service.lookup_customer(client_id, table_id, label, default_value))
+
+    def lookup_product(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
+        return self._timed("lookup_product", table_id, lambda: self._lookup_service.lookup_product(client_id, table_id, label, default_value))
+
+    def lookup_packaging_cost(self, client_id: str, table_id: str, label: str, default_value: Optional[PackagingCostModel]) -> PackagingCostModel:
+        return self._timed("lookup_packaging_cost", table_id, lambda: self._lookup_service.lookup_packaging_cost(client_id, table_id, label, default_value))
+
+    def lookup_mill_to_plant_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[MillToPlantFreightModel]) -> MillToPlantFreightModel:
+        return self._timed("lookup_mill_to_plant_freight", table_id, lambda: self._lookup_service.lookup_mill_to_plant_freight(client_id, table_id, label, default_value))
+
+    def lookup_tm_adjustment(self, client_id: str, table_id: str, label: str, default_value: Optional[TmAdjustmentModel]) -> TmAdjustmentModel:
+        return self._timed("lookup_tm_adjustment", table_id, lambda: self._lookup_service.lookup_tm_adjustment(client_id, table_id, label, default_value))
+
+    def lookup_material_sales_office(self, client_id: str, table_id: str, label: str, default_value: Optional[MaterialSalesOfficeModel]) -> MaterialSalesOfficeModel:
+        return self._timed("lookup_material_sales_office", table_id, lambda: self._lookup_service.lookup_material_sales_office(client_id, table_id, label, default_value))
+
+    def lookup_sap_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[SapFreightModel]) -> SapFreightModel:
+        return self._timed("lookup_sap_freight", table_id, lambda: self._lookup_service.lookup_sap_freight(client_id, table_id, label, default_value))
+
+    def lookup_south_skid_charge(self, client_id: str, table_id: str, label: str, default_value: Optional[SouthSkidChargeModel]) -> SouthSkidChargeModel:
+        return self._timed("lookup_south_skid_charge", table_id, lambda: self._lookup_service.lookup_south_skid_charge(client_id, table_id, label, default_value))
+
+    def lookup_south_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[SouthFreightModel]) -> SouthFreightModel:
+        return self._timed("lookup_south_freight", table_id, lambda: self._lookup_service.lookup_south_freight(client_id, table_id, label, default_value))
+
+    def lookup_ship_zone(self, client_id: str, table_id: str, label: str, default_value: Optional[ShipZoneModel]) -> ShipZoneModel:
+        return self._timed("lookup_ship_zone", table_id, lambda: self._lookup_service.lookup_ship_zone(client_id, table_id, label, default_value))
+
+    def lookup_so_bw_floor_price(self, client_id: str, table_id: str, label: str, default_value: Optional[SoBwFloorPriceModel]) -> SoBwFloorPriceModel:
+        return self._timed("lookup_so_bw_floor_price", table_id, lambda: self._lookup_service.lookup_so_bw_floor_price(client_id, table_id, label, default_value))
+
+    def lookup_bw_rating(self, client_id: str, table_id: str, label: str, default_value: Optional[BwRatingModel]) -> BwRatingModel:
+        return self._timed("lookup_bw_rating", table_id, lambda: self._lookup_service.lookup_bw_rating(client_id, table_id, label, default_value))
+
+    def lookup_freight_default(self, client_id: str, table_id: str, label: str, default_value: Optional[FreightDefaultModel]) -> FreightDefaultModel:
+        return self._timed("lookup_freight_default", table_id, lambda: self._lookup_service.lookup_freight_default(client_id, table_id, label, default_value))
+
+    def lookup_target_margin(self, client_id: str, table_id: str, label: str, default_value: Optional[float]) -> float:
+        return self._timed("lookup_target_margin", table_id, lambda: self._lookup_service.lookup_target_margin(client_id, table_id, label, default_value))
+
+    def lookup_cl_code(self, client_id: str, table_id: str, label: str, default_value: Optional[ClCodeModel]) -> ClCodeModel:
+        return self._timed("lookup_cl_code", table_id, lambda: self._lookup_service.lookup_cl_code(client_id, table_id, label, default_value))
+
+    def lookup_ido(self, client_id: str, table_id: str, label: str, default_value: Optional[IdoModel]) -> IdoModel:
+        return self._timed("lookup_ido", table_id, lambda: self._lookup_service.lookup_ido(client_id, table_id, label, default_value))
+
+    def lookup_automated_tuning(self, client_id: str, table_id: str, label: str, default_value: Optional[AutomatedTuningModel]) -> AutomatedTuningModel:
+        return self._timed("lookup_automated_tuning", table_id, lambda: self._lookup_service.lookup_automated_tuning(client_id, table_id, label, default_value))
+
+    def lookup_location_group(self, client_id: str, table_id: str, label: str, default_value: Optional[LocationGroupModel]) -> LocationGroupModel:
+        return self._timed("lookup_location_group", table_id, lambda: self._lookup_service.lookup_location_group(client_id, table_id, label, default_value))
+
+    def lookup_cost_adjustment(self, client_id: str, table_id: str, label: str, default_value: Optional[CostAdjustmentModel]) -> CostAdjustmentModel:
+        return self._timed("lookup_cost_adjustment", table_id, lambda: self._lookup_service.lookup_cost_adjustment(client_id, table_id, label, default_value))
+
+    def lookup_op_code(self, op_code: str, adjusted_net_weight_of_sales_item: float, net_weight_of_sales_item: float) -> OpCodeModel:
+        return self._timed("lookup_op_code", "opcodes", lambda: self._lookup_service.lookup_op_code(op_code, adjusted_net_weight_of_sales_item, net_weight_of_sales_item))
+
+    def bucketed_lookup(self, client_id: str, table_id: str, val: float, column: str) -> str:
+        return self._timed("bucketed_lookup", f"{table_id}.{column}", lambda: self._lookup_service.bucketed_lookup(client_id, table_id, val, column))
+
+    def bucketed_lookup_many(self, client_id: str, table_id: str, vals: list[float], column: str) -> list[str]:
+        return self._timed_many("bucketed_lookup_many", f"{table_id}.{column}", len(vals), lambda: self._lookup_service.bucketed_lookup_many(client_id, table_id, vals, column))
+
+    def get_customer_without_office(self, customer_number: str) -> CustomerModel:
+        return self._timed("get_customer_without_office", "customers.customernumber", lambda: self._lookup_service.get_customer_without_office(customer_number))
+
+    def get_default_office(self, customer_sales_office: str) -> CustomerModel:
+        return self._timed("get_default_office", "customers.customersalesoffice", lambda: self._lookup_service.get_default_office(customer_sales_office))
+
+    def lookup_exchange_rate(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
+        return self._timed("lookup_exchange_rate", f"{table_id}.rcmapping", lambda: self._lookup_service.lookup_exchange_rate(client_id, table_id, label, default_value))
+
+    def lookup_product_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ProductModel]:
+        return self._timed_many("lookup_product_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_product_many(client_id, table_id, labels))
+
+    def lookup_packaging_cost_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, PackagingCostModel]:
+        return self._timed_many("lookup_packaging_cost_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_packaging_cost_many(client_id, table_id, labels))
+
+    def lookup_mill_to_plant_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MillToPlantFreightModel]:
+        return self._timed_many("lookup_mill_to_plant_freight_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_mill_to_plant_freight_many(client_id, table_id, labels))
+
+    def lookup_tm_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, TmAdjustmentModel]:
+        return self._timed_many("lookup_tm_adjustment_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_tm_adjustment_many(client_id, table_id, labels))
+
+    def lookup_material_sales_office_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MaterialSalesOfficeModel]:
+        return self._timed_many("lookup_material_sales_office_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_material_sales_office_many(client_id, table_id, labels))
+
+    def lookup_sap_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SapFreightModel]:
+        return self._timed_many("lookup_sap_freight_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_sap_freight_many(client_id, table_id, labels))
+
+    def lookup_south_skid_charge_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthSkidChargeModel]:
+        return self._timed_many("lookup_south_skid_charge_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_south_skid_charge_many(client_id, table_id, labels))
+
+    def lookup_south_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthFreightModel]:
+        return self._timed_many("lookup_south_freight_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_south_freight_many(client_id, table_id, labels))
+
+    def lookup_ship_zone_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ShipZoneModel]:
+        return self._timed_many("lookup_ship_zone_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_ship_zone_many(client_id, table_id, labels))
+
+    def lookup_so_bw_floor_price_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SoBwFloorPriceModel]:
+        return self._timed_many("lookup_so_bw_floor_price_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_so_bw_floor_price_many(client_id, table_id, labels))
+
+    def lookup_bw_rating_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, BwRatingModel]:
+        return self._timed_many("lookup_bw_rating_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_bw_rating_many(client_id, table_id, labels))
+
+    def lookup_freight_default_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, FreightDefaultModel]:
+        return self._timed_many("lookup_freight_default_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_freight_default_many(client_id, table_id, labels))
+
+    def lookup_target_margin_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, float]:
+        return self._timed_many("lookup_target_margin_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_target_margin_many(client_id, table_id, labels))
+
+    def lookup_cl_code_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ClCodeModel]:
+        return self._timed_many("lookup_cl_code_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_cl_code_many(client_id, table_id, labels))
+
+    def lookup_ido_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, IdoModel]:
+        return self._timed_many("lookup_ido_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_ido_many(client_id, table_id, labels))
+
+    def lookup_automated_tuning_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, AutomatedTuningModel]:
+        return self._timed_many("lookup_automated_tuning_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_automated_tuning_many(client_id, table_id, labels))
+
+    def lookup_location_group_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, LocationGroupModel]:
+        return self._timed_many("lookup_location_group_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_location_group_many(client_id, table_id, labels))
+
+    def lookup_cost_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, CostAdjustmentModel]:
+        return self._timed_many("lookup_cost_adjustment_many", table_id, len({normalize_key(label) for label in labels}), lambda: self._lookup_service.lookup_cost_adjustment_many(client_id, table_id, labels))
+
+    def lookup_line_context(self, client_id: str, keys: LineContextKeysModel) -> LineContextModel:
+        started = time.perf_counter()
+        line_context = self._lookup_service.lookup_line_context(client_id, keys)
+        parts = [line_context.product, line_context.cost_adjustment, line_context.mill_to_plant_freight, line_context.ido, line_context.material_sales_office, line_context.packaging_cost]
+
+        # Every part of the context is one joined row
+        self.telemetry.record("lookup_line_context", "linecontexts", time.perf_counter() - started, len(parts), sum(part is not None for part in parts))
+
+        return line_context
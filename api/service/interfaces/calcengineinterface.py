@@ -1,9 +1,10 @@
 import abc
-from typing import Any
+from typing import Any, Optional
 
 from requests.structures import CaseInsensitiveDict
 
 from api.model.model import ModelModel
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
 
 
 class CalcEngineInterface(metaclass=abc.ABCMeta):
@@ -12,6 +13,6 @@ class CalcEngineInterface(metaclass=abc.ABCMeta):
         return hasattr(subclass, 'execute_model') and callable(subclass.execute_model)
 
     @abc.abstractmethod
-    def execute_model(self, request_client_id: str, client_id: str, mode: ModelModel, original_payload: CaseInsensitiveDict[str, Any], calculation_id: str, token: str) -> dict[str, Any]:
-        """Execute the model"""
+    def execute_model(self, request_client_id: str, client_id: str, mode: ModelModel, original_payload: CaseInsensitiveDict[str, Any], calculation_id: str, token: str, lookup_service: Optional[LookupServiceInterface] = None) -> dict[str, Any]:
+        """Execute the model, lookups go to lookup_service when it is set and to the engine's own service otherwise"""
         raise NotImplementedError('users must define execute_model to use this base class')
@@ -20,11 +20,17 @@ from api.model.clcode import ClCodeModel
 from api.model.ido import IdoModel
 from api.model.automatedtuning import AutomatedTuningModel
 from api.model.locationgroup import LocationGroupModel
+from api.model.linecontext import LineContextModel
+from api.model.linecontextkeys import LineContextKeysModel
 
 
 class LookupServiceInterface(metaclass=abc.ABCMeta):
     @classmethod
     def __subclasshook__(cls, subclass):
+        # Only the interface recognizes lookup services by their methods, its implementations are matched by inheritance
+        if cls is not LookupServiceInterface:
+            return NotImplemented
+
         return ((hasattr(subclass, 'lookup_customer') and callable(subclass.lookup_customer)) and
                 (hasattr(subclass, 'lookup_product') and callable(subclass.lookup_product)) and
                 (hasattr(subclass, 'lookup_packaging_cost') and callable(subclass.lookup_packaging_cost)) and
@@ -42,13 +48,33 @@ class LookupServiceInterface(metaclass=abc.ABCMeta):
                 (hasattr(subclass, 'lookup_cl_code') and callable(subclass.lookup_cl_code)) and
                 (hasattr(subclass, 'lookup_ido') and callable(subclass.lookup_ido)) and
                 (hasattr(subclass, 'bucketed_lookup') and callable(subclass.bucketed_lookup)) and
+                (hasattr(subclass, 'bucketed_lookup_many') and callable(subclass.bucketed_lookup_many)) and
                 (hasattr(subclass, 'get_customer_without_office') and callable(subclass.get_customer_without_office)) and
                 (hasattr(subclass, 'get_default_office') and callable(subclass.get_default_office)) and
                 (hasattr(subclass, 'lookup_automated_tuning') and callable(subclass.lookup_automated_tuning)) and
                 (hasattr(subclass, 'lookup_location_group') and callable(subclass.lookup_location_group)) and
                 (hasattr(subclass, 'lookup_op_code') and callable(subclass.lookup_op_code)) and
                 (hasattr(subclass, 'lookup_cost_adjustment') and callable(subclass.lookup_cost_adjustment)) and
-                (hasattr(subclass, 'lookup_exchange_rate') and callable(subclass.lookup_exchange_rate))
+                (hasattr(subclass, 'lookup_exchange_rate') and callable(subclass.lookup_exchange_rate)) and
+                (hasattr(subclass, 'lookup_product_many') and callable(subclass.lookup_product_many)) and
+                (hasattr(subclass, 'lookup_packaging_cost_many') and callable(subclass.lookup_packaging_cost_many)) and
+                (hasattr(subclass, 'lookup_mill_to_plant_freight_many') and callable(subclass.lookup_mill_to_plant_freight_many)) and
+                (hasattr(subclass, 'lookup_tm_adjustment_many') and callable(subclass.lookup_tm_adjustment_many)) and
+                (hasattr(subclass, 'lookup_material_sales_office_many') and callable(subclass.lookup_material_sales_office_many)) and
+                (hasattr(subclass, 'lookup_sap_freight_many') and callable(subclass.lookup_sap_freight_many)) and
+                (hasattr(subclass, 'lookup_south_skid_charge_many') and callable(subclass.lookup_south_skid_charge_many)) and
+                (hasattr(subclass, 'lookup_south_freight_many') and callable(subclass.lookup_south_freight_many)) and
+                (hasattr(subclass, 'lookup_ship_zone_many') and callable(subclass.lookup_ship_zone_many)) and
+                (hasattr(subclass, 'lookup_so_bw_floor_price_many') and callable(subclass.lookup_so_bw_floor_price_many)) and
+                (hasattr(subclass, 'lookup_bw_rating_many') and callable(subclass.lookup_bw_rating_many)) and
+                (hasattr(subclass, 'lookup_freight_default_many') and callable(subclass.lookup_freight_default_many)) and
+                (hasattr(subclass, 'lookup_target_margin_many') and callable(subclass.lookup_target_margin_many)) and
+                (hasattr(subclass, 'lookup_cl_code_many') and callable(subclass.lookup_cl_code_many)) and
+                (hasattr(subclass, 'lookup_ido_many') and callable(subclass.lookup_ido_many)) and
+                (hasattr(subclass, 'lookup_automated_tuning_many') and callable(subclass.lookup_automated_tuning_many)) and
+                (hasattr(subclass, 'lookup_location_group_many') and callable(subclass.lookup_location_group_many)) and
+                (hasattr(subclass, 'lookup_cost_adjustment_many') and callable(subclass.lookup_cost_adjustment_many)) and
+                (hasattr(subclass, 'lookup_line_context') and callable(subclass.lookup_line_context))
                 )
 
     @abc.abstractmethod
@@ -141,6 +167,11 @@ class LookupServiceInterface(metaclass=abc.ABCMeta):
         """Locate a row by the bucket it belongs to"""
         pass
 
+    @abc.abstractmethod
+    def bucketed_lookup_many(self, client_id: str, table_id: str, vals: list[float], column: str) -> list[str]:
+        """Locate the bucket of every value, in the order of the values"""
+        pass
+
     @abc.abstractmethod
     def get_customer_without_office(self, customer_number: str) -> CustomerModel:
         """Locate the customer by id"""
@@ -170,3 +201,98 @@ class LookupServiceInterface(metaclass=abc.ABCMeta):
     def lookup_exchange_rate(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
         """Locate the cost adjustment by id"""
         pass
+
+    @abc.abstractmethod
+    def lookup_product_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ProductModel]:
+        """Locate products for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_packaging_cost_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, PackagingCostModel]:
+        """Locate packaging costs for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_mill_to_plant_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MillToPlantFreightModel]:
+        """Locate mill to plant freight costs for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_tm_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, TmAdjustmentModel]:
+        """Locate tm adjustments for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_material_sales_office_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MaterialSalesOfficeModel]:
+        """Locate material sales offices for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_sap_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SapFreightModel]:
+        """Locate sap freights for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_south_skid_charge_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthSkidChargeModel]:
+        """Locate south skid charges for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_south_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthFreightModel]:
+        """Locate south freights for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_ship_zone_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ShipZoneModel]:
+        """Locate ship zones for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_so_bw_floor_price_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SoBwFloorPriceModel]:
+        """Locate sobw floor prices for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_bw_rating_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, BwRatingModel]:
+        """Locate bw ratings for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_freight_default_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, FreightDefaultModel]:
+        """Locate freight defaults for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_target_margin_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, float]:
+        """Locate target margins for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_cl_code_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ClCodeModel]:
+        """Locate cl codes for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_ido_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, IdoModel]:
+        """Locate idos for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_automated_tuning_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, AutomatedTuningModel]:
+        """Locate automated tuning records for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_location_group_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, LocationGroupModel]:
+        """Locate location groups for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_cost_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, CostAdjustmentModel]:
+        """Locate cost adjustments for many ids, keyed by the case-folded id"""
+        pass
+
+    @abc.abstractmethod
+    def lookup_line_context(self, client_id: str, keys: LineContextKeysModel) -> LineContextModel:
+        """Locate the product, cost adjustment, mill to plant freight, IDO, material sales office and packaging cost rows of one quote line"""
+        pass
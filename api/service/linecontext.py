@@ -0,0 +1,65 @@
+from typing import Any, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+from api.model.costadjustment import CostAdjustmentModel
+from api.model.linecontext import LineContextModel
+from api.model.linecontextkeys import LineContextKeysModel
+from api.model.product import ProductModel
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+
+
+def line_context_keys(inputs: CaseInsensitiveDict[str, Any]) -> LineContextKeysModel:
+    """Builds the lookup keys of a quote line the same way perform_calculations does, a key that can not be built is None"""
+    material = inputs.get("material")
+    ship_plant = inputs.get("shipplant")
+    stock_plant = inputs.get("stockplant")
+
+    try:
+        material_sales_office_key = f"{material.upper()}|{inputs.get('isroffice')}"
+    except (AttributeError, TypeError):
+        material_sales_office_key = None
+
+    try:
+        ogh_ship_plant = "9999" if inputs.get("rcmapping").casefold() == "SOUTH_SAP".casefold() else ship_plant
+        overhead_group_key = None if inputs.get("sapind").casefold() == "N".casefold() else f"{material.upper()}|{ogh_ship_plant}"
+    except (AttributeError, TypeError):
+        overhead_group_key = None
+
+    return LineContextKeysModel(
+        product_key=f"{inputs.get('rcmapping')}|{material}",
+        cost_adjustment_key=f"{material}|{stock_plant}",
+        ship_plant=f"{ship_plant}",
+        cost_plus_mtp_key=f"{material}|{ship_plant}",
+        ido_key=f"{stock_plant}|{ship_plant}",
+        material_sales_office_key=material_sales_office_key,
+        overhead_group_key=overhead_group_key
+    )
+
+
+def mill_to_plant_freight_key(keys: LineContextKeysModel, product: Optional[ProductModel], cost_adjustment: Optional[CostAdjustmentModel]) -> Optional[str]:
+    # Cost plus materials are their own bellwether
+    if cost_adjustment is not None and cost_adjustment.material_classification.casefold() == "cpl".casefold():
+        return keys.cost_plus_mtp_key
+
+    if product is None:
+        return None
+
+    return f"{product.bellwether_material}|{keys.ship_plant}"
+
+
+def compose_line_context(lookup_service: LookupServiceInterface, client_id: str, keys: LineContextKeysModel) -> LineContextModel:
+    """Puts the line context together from single lookups, for services that gain nothing from a joined query"""
+    product = lookup_service.lookup_product(client_id, "products", keys.product_key, None)
+    cost_adjustment = lookup_service.lookup_cost_adjustment(client_id, "cost_adjustment_test_materials", keys.cost_adjustment_key, None)
+    mtp_key = mill_to_plant_freight_key(keys, product, cost_adjustment)
+
+    return LineContextModel(
+        product=product,
+        cost_adjustment=cost_adjustment,
+        mill_to_plant_freight_key=mtp_key,
+        mill_to_plant_freight=None if mtp_key is None else lookup_service.lookup_mill_to_plant_freight(client_id, "mill_to_plant_freights", mtp_key, None),
+        ido=lookup_service.lookup_ido(client_id, "ido_lookup", keys.ido_key, None),
+        material_sales_office=None if keys.material_sales_office_key is None else lookup_service.lookup_material_sales_office(client_id, "MaterialSalesOfficeLookups", keys.material_sales_office_key, None),
+        packaging_cost=None if keys.overhead_group_key is None else lookup_service.lookup_packaging_cost(client_id, "packaging_cost_lookups", keys.overhead_group_key, None)
+    )
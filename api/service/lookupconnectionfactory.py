@@ -0,0 +1,65 @@
+import logging
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Lookup queries are bound, so the text repeats and sqlite3 reuses the prepared statement from this cache
+STATEMENT_CACHE_SIZE = 256
+
+
+def copy_to_directory(path: str, directory: str) -> str:
+    """Copies the database into directory, an existing copy with the same size and modification time is reused"""
+    target = os.path.join(directory, os.path.basename(path))
+    source_stat = os.stat(path)
+
+    if os.path.exists(target):
+        target_stat = os.stat(target)
+
+        if target_stat.st_size == source_stat.st_size and target_stat.st_mtime == source_stat.st_mtime:
+            return target
+
+    # Copy under a private name and rename, so other workers never open a partial file
+    temporary_target = f"{target}.{os.getpid()}.tmp"
+
+    shutil.copy2(path, temporary_target)
+    os.replace(temporary_target, target)
+
+    return target
+
+
+class LookupConnectionFactory:
+    """Opens lookup database connections, read only mode uses an immutable URI and the configured pragmas"""
+
+    def __init__(self, configuration: Config):
+        self._read_only = configuration.lookup_open_mode.casefold() == "readonly"
+        self._mmap_size = int(configuration.lookup_mmap_size)
+        self._cache_size = int(configuration.lookup_cache_size)
+        self._temp_store = configuration.lookup_temp_store
+        self.database_path = configuration.connection
+
+        if self._read_only and configuration.lookup_shm_copy:
+            if os.path.isdir(configuration.lookup_shm_directory):
+                self.database_path = copy_to_directory(configuration.connection, configuration.lookup_shm_directory)
+            else:
+                logger.warning(f"'{configuration.lookup_shm_directory}' not found, reading the lookup database from '{configuration.connection}'.")
+
+    def connect(self) -> sqlite3.Connection:
+        if not self._read_only:
+            return sqlite3.connect(self.database_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+
+        # immutable=1 skips file locking and change detection, the service never writes the lookup database
+        uri = f"{Path(self.database_path).absolute().as_uri()}?mode=ro&immutable=1"
+
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+
+        connection.execute(f"PRAGMA mmap_size = {self._mmap_size}")
+        connection.execute(f"PRAGMA cache_size = {self._cache_size}")
+        connection.execute(f"PRAGMA temp_store = {self._temp_store}")
+        connection.execute("PRAGMA query_only = ON")
+
+        return connection
@@ -0,0 +1,158 @@
+import logging
+import os
+import sqlite3
+import sys
+from typing import Union
+
+from api.exceptions.lookupindexerror import LookupIndexError
+from api.model.linecontextkeys import LineContextKeysModel
+from api.service.lookupconnectionfactory import LookupConnectionFactory
+from api.service.sqllitelookupservice import LOOKUP_TABLES, PACKAGING_COST_TABLE, UNIQUE_ID_QUERY, UNIQUE_ID_MANY_QUERY, PACKAGING_COST_QUERY, PACKAGING_COST_MANY_QUERY, EXCHANGE_RATE_QUERY, OP_CODE_QUERY, BUCKET_QUERY, CUSTOMER_BY_NUMBER_QUERY, CUSTOMER_BY_SALES_OFFICE_QUERY, LINE_CONTEXT_QUERY
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# (table, column, collation) for every column a lookup query filters or joins on
+LOOKUP_INDEXES = [(table_id, "uniqueid", "NOCASE") for table_id in LOOKUP_TABLES] + [
+    ("OverheadGroupLookups", "uniqueid", "NOCASE"),
+    (PACKAGING_COST_TABLE, "uniqueid", "BINARY"),
+    ("customers", "customernumber", "NOCASE"),
+    ("customers", "customersalesoffice", "NOCASE"),
+    ("products", "rcmapping", "NOCASE"),
+    ("opcodes", "opcode", "BINARY")
+]
+
+# The bucket query compares coalesce() expressions, which no index can serve, the table only holds a few rows
+SCAN_ALLOWED = {"bucketed_lookup"}
+
+# The line context query is driven by a one row subquery, scanning it reads no table
+ONE_ROW_SCANS = {"SCAN CONSTANT ROW", "SCAN line"}
+
+
+def lookup_query_templates() -> dict[str, tuple[str, Union[tuple, dict]]]:
+    """Every query SqlLiteLookupService issues, rendered with placeholder values so the plan can be explained"""
+    queries = dict()
+
+    for table_id in LOOKUP_TABLES:
+        queries[f"lookup {table_id}"] = (UNIQUE_ID_QUERY.format(table_id=table_id), ("",))
+        queries[f"lookup many {table_id}"] = (UNIQUE_ID_MANY_QUERY.format(table_id=table_id, placeholders="?, ?"), ("", ""))
+
+    queries["lookup_packaging_cost"] = (PACKAGING_COST_QUERY, ("",))
+    queries["lookup_packaging_cost_many"] = (PACKAGING_COST_MANY_QUERY.format(placeholders="?, ?"), ("", ""))
+    queries["lookup_exchange_rate"] = (EXCHANGE_RATE_QUERY.format(table_id="products"), ("",))
+    queries["lookup_op_code"] = (OP_CODE_QUERY, {"op_code": "", "adjusted_net_weight": 0.0, "net_weight": 0.0})
+    queries["bucketed_lookup"] = (BUCKET_QUERY.format(table_id="weight_class"), {"max_size": sys.maxsize, "val": 0.0})
+    queries["get_customer_without_office"] = (CUSTOMER_BY_NUMBER_QUERY, {"customer_number": ""})
+    queries["get_default_office"] = (CUSTOMER_BY_SALES_OFFICE_QUERY, {"customer_sales_office": ""})
+    queries["lookup_line_context"] = (LINE_CONTEXT_QUERY, {key: "" for key in LineContextKeysModel._fields})
+
+    return queries
+
+
+class LookupIndexProvisioner:
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def provision(self) -> list[str]:
+        """Creates the missing lookup indexes and returns the names of the ones created"""
+        existing = {row[0] for row in self._connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        tables = {row[0].casefold() for row in self._connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+        created = list()
+
+        for (table_id, column, collation) in LOOKUP_INDEXES:
+            index_name = f"ix_{table_id}_{column}_{collation}".lower()
+
+            if index_name in existing or table_id.casefold() not in tables:
+                continue
+
+            self._connection.execute(f"CREATE INDEX {index_name} ON {table_id} ({column} COLLATE {collation})")
+
+            created.append(index_name)
+
+        self._connection.commit()
+
+        return created
+
+    def find_table_scans(self) -> dict[str, list[str]]:
+        """Explains every lookup query and returns the plan steps of the ones that scan a whole table"""
+        scans = dict()
+
+        for (name, (query, params)) in lookup_query_templates().items():
+            if name in SCAN_ALLOWED:
+                continue
+
+            try:
+                plan = [row[3] for row in self._connection.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+            except sqlite3.OperationalError as ex:
+                scans[name] = [str(ex)]
+                continue
+
+            table_scans = [step for step in plan if step.startswith("SCAN") and "INDEX" not in step and step not in ONE_ROW_SCANS]
+
+            if len(table_scans) > 0:
+                scans[name] = table_scans
+
+        return scans
+
+
+def describe_table_scans(scans: dict[str, list[str]]) -> str:
+    return "; ".join(f"{name}: {', '.join(steps)}" for (name, steps) in scans.items())
+
+
+def check_lookup_indexes(configuration: Config):
+    """Runs the query plan check at startup, lookup_index_check is off, warn or strict"""
+    mode = configuration.lookup_index_check.casefold()
+
+    if mode == "off":
+        return
+
+    if not os.path.exists(configuration.connection):
+        message = f"Lookup database '{configuration.connection}' not found."
+    else:
+        connection = LookupConnectionFactory(configuration).connect()
+
+        try:
+            scans = LookupIndexProvisioner(connection).find_table_scans()
+        finally:
+            connection.close()
+
+        if len(scans) == 0:
+            return
+
+        message = f"Lookup queries scan whole tables, run 'python -m api.service.lookupindexprovisioner' to create the indexes. {describe_table_scans(scans)}"
+
+    if mode == "strict":
+        raise LookupIndexError(message)
+
+    logger.warning(message)
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Creates the lookup database indexes and checks every lookup query plan")
+    parser.add_argument('-d', '--database', default=Config.connection, help='path to the lookup database')
+    parser.add_argument('--check', action='store_true', help='only check the query plans, do not create indexes')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        sys.exit(f"Lookup database '{args.database}' not found.")
+
+    db_connection = sqlite3.connect(args.database)
+
+    try:
+        provisioner = LookupIndexProvisioner(db_connection)
+
+        if not args.check:
+            for created_index in provisioner.provision():
+                print(f"Created index {created_index}")
+
+        table_scans = provisioner.find_table_scans()
+    finally:
+        db_connection.close()
+
+    for (query_name, steps) in table_scans.items():
+        print(f"{query_name}: {', '.join(steps)}")
+
+    sys.exit(1 if len(table_scans) > 0 else 0)
@@ -0,0 +1,30 @@
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Optional
+
+
+class LookupPlan:
+    """Runs the lookups of a request on an executor, a lookup is submitted once the results it depends on are in, without an executor every lookup runs inline"""
+
+    def __init__(self, executor: Optional[Executor]):
+        self._executor = executor
+        self._futures = list()
+
+    def submit(self, lookup: Callable[..., Any], *args: Any) -> Future:
+        if self._executor is not None:
+            future = self._executor.submit(lookup, *args)
+        else:
+            future = Future()
+
+            try:
+                future.set_result(lookup(*args))
+            except Exception as ex:
+                future.set_exception(ex)
+
+        self._futures.append(future)
+
+        return future
+
+    def wait(self):
+        """Waits for every submitted lookup and raises the first error"""
+        for future in self._futures:
+            future.result()
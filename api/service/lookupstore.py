@@ -0,0 +1,355 @@
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from api.service.rowdecoder import RowDecoder
+from api.service.snapshotmanager import database_signature
+from api.service.sqllitelookupservice import LOOKUP_TABLES, PACKAGING_COST_TABLE, normalize_key
+from config import Config
+
+MAGIC = b"RYLSTORE"
+VERSION = 2
+HEADER = struct.Struct("<8sI")
+
+PACKAGING_COSTS = "packaging_costs"
+
+# Every table the store holds, with the query its rows are read from
+STORE_TABLES = {table_id: f"SELECT * FROM {table_id}" for table_id in LOOKUP_TABLES} | {
+    PACKAGING_COSTS: f"select ogl.uniqueid as lookupkey, pkl.* from {PACKAGING_COST_TABLE} pkl inner join OverheadGroupLookups ogl on pkl.uniqueid = ogl.overheadgroup",
+    "opcodes": "SELECT * FROM opcodes",
+    "weight_class": "SELECT * FROM weight_class"
+}
+
+# (table, column) of every key index, keys are normalized and the first row of a duplicated key wins.
+# An index is an open addressing hash table of (crc32, key offset, key length, row + 1) slots, an empty slot is all zero
+STORE_INDEXES = [(table_id, "uniqueid") for table_id in LOOKUP_TABLES] + [
+    (PACKAGING_COSTS, "lookupkey"),
+    ("customers", "customernumber"),
+    ("customers", "customersalesoffice"),
+    ("products", "rcmapping")
+]
+
+
+def _slot_count(key_count: int) -> int:
+    # A power of two at least twice the key count keeps probe sequences short
+    slot_count = 1
+
+    while slot_count < 2 * key_count:
+        slot_count *= 2
+
+    return slot_count
+
+
+def _column_kind(values: list[Any]) -> str:
+    """d packs doubles, q packs integers, s references a string, o references any other value as JSON"""
+    if len(values) > 0 and all(type(value) is float for value in values):
+        return "d"
+
+    if len(values) > 0 and all(type(value) is int for value in values):
+        return "q"
+
+    if len(values) > 0 and all(type(value) is str for value in values):
+        return "s"
+
+    return "o"
+
+
+class _StoreWriter:
+    def __init__(self):
+        self._sections = list()
+        self._size = 0
+        self._strings = bytearray()
+        self._string_refs = dict()
+
+    def add_section(self, data: bytes) -> int:
+        # Sections are 8 byte aligned so doubles and integers can be read in place
+        offset = self._size
+        padding = -len(data) % 8
+
+        self._sections.append(data + b"\0" * padding)
+        self._size += len(data) + padding
+
+        return offset
+
+    def string_ref(self, value: str) -> tuple[int, int]:
+        # Repeated strings, plant and product codes mostly, are stored once
+        ref = self._string_refs.get(value)
+
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = (len(self._strings), len(encoded))
+
+            self._strings += encoded
+            self._string_refs[value] = ref
+
+        return ref
+
+    def add_string_refs(self, values: list[str]) -> int:
+        refs = array("I")
+
+        for value in values:
+            refs.extend(self.string_ref(value))
+
+        return self.add_section(refs.tobytes())
+
+    def write(self, path: str, directory: dict[str, Any]):
+        directory["strings"] = {"offset": self.add_section(bytes(self._strings)), "length": len(self._strings)}
+
+        encoded_directory = json.dumps(directory).encode("utf-8")
+        data_start = HEADER.size + len(encoded_directory)
+        data_start += -data_start % 8
+
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, len(encoded_directory)))
+            file.write(encoded_directory)
+            file.write(b"\0" * (data_start - HEADER.size - len(encoded_directory)))
+
+            for section in self._sections:
+                file.write(section)
+
+
+def build_lookup_store(connection: sqlite3.Connection, path: str, signature: Optional[tuple] = None):
+    """Writes every store table of the lookup database to path as flat columns and hashed key indexes"""
+    writer = _StoreWriter()
+    tables = dict()
+
+    for (table_id, query) in STORE_TABLES.items():
+        cursor = connection.execute(query)
+        column_names = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+
+        columns = list()
+
+        for (position, column_name) in enumerate(column_names):
+            values = [row[position] for row in rows]
+            kind = _column_kind(values)
+
+            if kind == "d":
+                offset = writer.add_section(array("d", values).tobytes())
+            elif kind == "q":
+                offset = writer.add_section(array("q", values).tobytes())
+            elif kind == "s":
+                offset = writer.add_string_refs(values)
+            else:
+                offset = writer.add_string_refs([json.dumps(value) for value in values])
+
+            columns.append({"name": column_name, "kind": kind, "offset": offset})
+
+        tables[table_id] = {"rows": len(rows), "columns": columns, "indexes": dict()}
+
+        for (index_table_id, index_column) in STORE_INDEXES:
+            if index_table_id != table_id:
+                continue
+
+            position = [column_name.casefold() for column_name in column_names].index(index_column)
+            first_rows = dict()
+
+            for (row_number, row) in enumerate(rows):
+                first_rows.setdefault(normalize_key(row[position]), row_number)
+
+            slot_count = _slot_count(len(first_rows))
+            slots = array("I", bytes(16 * slot_count))
+
+            for (key, row_number) in first_rows.items():
+                encoded_key = key.encode("utf-8")
+                key_hash = zlib.crc32(encoded_key)
+                slot = key_hash & (slot_count - 1)
+
+                while slots[4 * slot + 3] != 0:
+                    slot = (slot + 1) & (slot_count - 1)
+
+                slots[4 * slot:4 * slot + 4] = array("I", (key_hash,) + writer.string_ref(key) + (row_number + 1,))
+
+            tables[table_id]["indexes"][index_column] = {"offset": writer.add_section(slots.tobytes()), "slots": slot_count}
+
+    writer.write(path, {"version": VERSION, "byteorder": sys.byteorder, "signature": None if signature is None else list(signature), "tables": tables})
+
+
+def read_directory(path: str) -> Optional[dict[str, Any]]:
+    try:
+        with open(path, "rb") as file:
+            (magic, directory_length) = HEADER.unpack(file.read(HEADER.size))
+
+            if magic != MAGIC:
+                return None
+
+            return json.loads(file.read(directory_length))
+    except (OSError, struct.error, ValueError):
+        return None
+
+
+def ensure_lookup_store(configuration: Config) -> str:
+    """Returns the store built from the lookup database, building it when it is missing or older than the database"""
+    directory = configuration.lookup_shm_directory if os.path.isdir(configuration.lookup_shm_directory) else os.path.dirname(os.path.abspath(configuration.connection))
+    path = os.path.join(directory, f"{os.path.basename(configuration.connection)}.store")
+    signature = database_signature(configuration.connection)
+
+    if signature is None:
+        raise FileNotFoundError(f"Lookup database '{configuration.connection}' not found.")
+
+    existing = read_directory(path)
+
+    if existing is not None and existing.get("version") == VERSION and existing.get("signature") == list(signature):
+        return path
+
+    compile_lookup_store(configuration.connection, path)
+
+    return path
+
+
+def compile_lookup_store(database: str, path: str):
+    signature = database_signature(database)
+
+    # Build under a private name and rename, so other workers never map a partial file
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    connection = sqlite3.connect(f"{Path(database).absolute().as_uri()}?mode=ro", uri=True)
+
+    try:
+        build_lookup_store(connection, temporary_path, signature)
+    finally:
+        connection.close()
+
+    os.replace(temporary_path, path)
+
+
+class MappedTable:
+    """Rows of one store table, read from the mapped file on access"""
+
+    def __init__(self, data: memoryview, strings: memoryview, definition: dict[str, Any]):
+        self._data = data
+        self._strings = strings
+        self.row_count = definition["rows"]
+        self.column_names = tuple(column["name"] for column in definition["columns"])
+        self._getters = [self._getter(column) for column in definition["columns"]]
+
+    def _getter(self, column: dict[str, Any]) -> Callable[[int], Any]:
+        kind = column["kind"]
+        offset = column["offset"]
+
+        if kind == "d":
+            values = self._data[offset:offset + 8 * self.row_count].cast("d")
+
+            return values.__getitem__
+
+        if kind == "q":
+            values = self._data[offset:offset + 8 * self.row_count].cast("q")
+
+            return values.__getitem__
+
+        refs = self._data[offset:offset + 8 * self.row_count].cast("I")
+        strings = self._strings
+
+        if kind == "s":
+            return lambda row_number: str(strings[refs[2 * row_number]:refs[2 * row_number] + refs[2 * row_number + 1]], "utf-8")
+
+        return lambda row_number: json.loads(str(strings[refs[2 * row_number]:refs[2 * row_number] + refs[2 * row_number + 1]], "utf-8"))
+
+    def row(self, row_number: int) -> tuple:
+        return tuple(getter(row_number) for getter in self._getters)
+
+    def rows(self) -> list[tuple]:
+        return [self.row(row_number) for row_number in range(self.row_count)]
+
+
+class MappedIndex:
+    """Dictionary-like view of a store key index, found rows are decoded into models"""
+
+    def __init__(self, table: MappedTable, slots: memoryview, strings: memoryview, slot_count: int, from_row: RowDecoder):
+        self._table = table
+        self._slots = slots
+        self._strings = strings
+        self._mask = slot_count - 1
+        self._decode = from_row.bind(table.column_names)
+
+    def find(self, key: str) -> Optional[int]:
+        encoded_key = key.encode("utf-8")
+        key_hash = zlib.crc32(encoded_key)
+        slots = self._slots
+        slot = key_hash & self._mask
+
+        while True:
+            row = slots[4 * slot + 3]
+
+            if row == 0:
+                return None
+
+            # Keys are compared in place, only a hash match reads the key bytes
+            if slots[4 * slot] == key_hash and slots[4 * slot + 2] == len(encoded_key):
+                key_offset = slots[4 * slot + 1]
+
+                if self._strings[key_offset:key_offset + len(encoded_key)] == encoded_key:
+                    return row - 1
+
+            slot = (slot + 1) & self._mask
+
+    def get(self, key: str) -> Any:
+        row_number = self.find(key)
+
+        return None if row_number is None else self._decode(self._table.row(row_number))
+
+
+class LookupStore:
+    """Read only view of a store file, mapped once and shared through the page cache by every process that maps it"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, directory_length) = HEADER.unpack_from(self._mmap)
+
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a lookup store.")
+
+        self.directory = json.loads(self._mmap[HEADER.size:HEADER.size + directory_length])
+
+        if self.directory["version"] != VERSION or self.directory["byteorder"] != sys.byteorder:
+            raise ValueError(f"'{path}' was built for another store version or byte order.")
+
+        data_start = HEADER.size + directory_length
+        data_start += -data_start % 8
+
+        self._data = memoryview(self._mmap)[data_start:]
+
+        strings = self.directory["strings"]
+
+        self._strings = self._data[strings["offset"]:strings["offset"] + strings["length"]]
+        self._tables = {table_id: MappedTable(self._data, self._strings, definition) for (table_id, definition) in self.directory["tables"].items()}
+
+    def table(self, table_id: str) -> MappedTable:
+        return self._tables[table_id]
+
+    def index(self, table_id: str, column: str, from_row: RowDecoder) -> MappedIndex:
+        definition = self.directory["tables"][table_id]["indexes"][column]
+        offset = definition["offset"]
+        slots = self._data[offset:offset + 16 * definition["slots"]].cast("I")
+
+        return MappedIndex(self._tables[table_id], slots, self._strings, definition["slots"], from_row)
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Compiles the lookup database into a lookup store file for lookupServiceType=mapped")
+    parser.add_argument('-d', '--database', default=Config.connection, help='path to the lookup database')
+    parser.add_argument('-o', '--output', help='path of the store file, the database path with a .store suffix by default')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        sys.exit(f"Lookup database '{args.database}' not found.")
+
+    output = args.output or f"{args.database}.store"
+
+    compile_lookup_store(args.database, output)
+
+    for (store_table_id, store_table) in read_directory(output)["tables"].items():
+        print(f"{store_table_id}: {store_table['rows']} rows")
+
+    print(f"Wrote {output} ({os.path.getsize(output)} bytes)")
@@ -0,0 +1,58 @@
+import bisect
+import threading
+from typing import Any
+
+# Upper bounds in milliseconds of the latency histogram buckets, the last bucket takes everything slower
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 100.0)
+
+
+class LookupTelemetry:
+    """Call counts, keys asked for, rows decoded and a latency histogram per lookup method and table, a key without a row is a miss"""
+
+    def __init__(self):
+        self._counters = dict()
+        self._lock = threading.Lock()
+
+    def record(self, method: str, table_id: str, seconds: float, keys: int, rows: int):
+        milliseconds = seconds * 1000.0
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, milliseconds)
+
+        with self._lock:
+            counter = self._counters.get((table_id, method))
+
+            if counter is None:
+                # calls, keys, rows, total milliseconds, max milliseconds, histogram
+                counter = self._counters[(table_id, method)] = [0, 0, 0, 0.0, 0.0, [0] * (len(LATENCY_BUCKETS) + 1)]
+
+            counter[0] += 1
+            counter[1] += keys
+            counter[2] += rows
+            counter[3] += milliseconds
+            counter[4] = max(counter[4], milliseconds)
+            counter[5][bucket] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+    def statistics(self) -> dict[str, dict[str, Any]]:
+        """Per table, the counters of every method called on it, slowest tables first"""
+        with self._lock:
+            counters = [(table_id, method, list(counter[:5]) + [list(counter[5])]) for ((table_id, method), counter) in self._counters.items()]
+
+        tables = dict()
+
+        for (table_id, method, (calls, keys, rows, total, slowest, histogram)) in counters:
+            tables.setdefault(table_id, dict())[method] = {
+                "calls": calls,
+                "keys": keys,
+                "misses": keys - rows,
+                "missRatio": (keys - rows) / keys if keys > 0 else 0.0,
+                "rowsDecoded": rows,
+                "totalMs": total,
+                "meanMs": total / calls,
+                "maxMs": slowest,
+                "latencyMs": {f"le{bound}": count for (bound, count) in zip(LATENCY_BUCKETS + ("Inf",), histogram)}
+            }
+
+        return dict(sorted(tables.items(), key=lambda item: -sum(method["totalMs"] for method in item[1].values())))
@@ -0,0 +1,34 @@
+import threading
+from abc import ABC
+
+from api.service.bucketindex import BucketIndex
+from api.service.inmemorylookupservice import InMemoryLookupService
+from api.service.lookupconnectionfactory import LookupConnectionFactory
+from api.service.lookupstore import LookupStore, PACKAGING_COSTS, ensure_lookup_store
+from api.service.opcodeindex import OpCodeIndex
+from api.service.sqllitelookupservice import LOOKUP_TABLES, customer_from_row, product_from_row, packaging_cost_from_row, op_code_from_row
+from config import Config
+
+
+class MappedLookupService(InMemoryLookupService, ABC):
+    """Serves lookups from a memory mapped store file, every worker process maps the same pages instead of holding its own copy"""
+
+    def __init__(self, configuration: Config):
+        self._connection_factory = LookupConnectionFactory(configuration)
+        self._lock = threading.Lock()
+
+        # A store compiled offline is mapped as is, otherwise one is built from the lookup database when it is out of date
+        self._store = LookupStore(configuration.lookup_store_path or ensure_lookup_store(configuration))
+
+        # The indexes are views over the mapped file, a found row is decoded when it is asked for
+        self._tables = {table_id: self._store.index(table_id, "uniqueid", from_row) for (table_id, from_row) in LOOKUP_TABLES.items()}
+        self._packaging_costs = self._store.index(PACKAGING_COSTS, "lookupkey", packaging_cost_from_row)
+        self._customers_by_number = self._store.index("customers", "customernumber", customer_from_row)
+        self._customers_by_sales_office = self._store.index("customers", "customersalesoffice", customer_from_row)
+        self._products_by_rc_mapping = self._store.index("products", "rcmapping", product_from_row)
+
+        op_codes = self._store.table("opcodes")
+        weight_classes = self._store.table("weight_class")
+
+        self._op_codes = OpCodeIndex.from_rows(op_codes.column_names, op_codes.rows(), op_code_from_row)
+        self._buckets = {"weight_class": BucketIndex([dict(zip(weight_classes.column_names, row)) for row in weight_classes.rows()])}
@@ -0,0 +1,69 @@
+import threading
+import weakref
+from typing import Any, Callable, Hashable, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from api.service.lrucache import LruCache, MISSING
+from api.service.requestlookupservice import RequestLookupService
+
+
+class MaterialCostCache:
+    """Material costs of quote lines, shared by every customer that quotes the same material. Entries belong to the lookup service of the
+    snapshot they were calculated from, so a new snapshot starts empty and the entries of the previous one are dropped with it"""
+
+    def __init__(self, key: Callable[[CaseInsensitiveDict[str, Any], str], Hashable], calculate: Callable[[CaseInsensitiveDict[str, Any], str, LookupServiceInterface], Any], max_entries: int):
+        self._key = key
+        self._calculate = calculate
+        self._max_entries = max_entries
+        self._caches = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _source(lookup_service: LookupServiceInterface) -> LookupServiceInterface:
+        return lookup_service.source if isinstance(lookup_service, RequestLookupService) else lookup_service
+
+    def _cache(self, lookup_service: LookupServiceInterface) -> Optional[LruCache]:
+        source = self._source(lookup_service)
+
+        with self._lock:
+            try:
+                cache = self._caches.get(source)
+
+                if cache is None:
+                    cache = self._caches[source] = LruCache(self._max_entries)
+            except TypeError:
+                # Lookup services that can not be weakly referenced are not cached
+                return None
+
+        return cache
+
+    def get(self, inputs: CaseInsensitiveDict[str, Any], client_id: str, lookup_service: LookupServiceInterface) -> Any:
+        if self._max_entries <= 0:
+            return self._calculate(inputs, client_id, lookup_service)
+
+        key = self._key(inputs, client_id)
+        cache = self._cache(lookup_service)
+
+        try:
+            value = MISSING if cache is None else cache.get(key)
+        except TypeError:
+            # Inputs that can not be hashed are calculated every time
+            return self._calculate(inputs, client_id, lookup_service)
+
+        if value is MISSING:
+            value = self._calculate(inputs, client_id, lookup_service)
+
+            if cache is not None:
+                cache.put(key, value)
+
+        return value
+
+    def statistics(self, lookup_service: LookupServiceInterface) -> dict[str, int]:
+        try:
+            cache = self._caches.get(self._source(lookup_service))
+        except TypeError:
+            cache = None
+
+        return {} if cache is None else cache.statistics()
@@ -0,0 +1,265 @@
+import ast
+import hashlib
+import logging
+import marshal
+import os
+import re
+import sys
+import threading
+from types import CodeType
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from api.exceptions.breakerror import BreakError
+from api.service.calculationgraph import CalculationGraph, break_when
+
+logger = logging.getLogger(__name__)
+
+# Changes whenever the generated code changes shape, so code cached by another compiler is not loaded
+COMPILER_VERSION = 1
+
+# Methods of a string constant that are folded into their result
+FOLDED_METHODS = frozenset(["casefold", "upper", "lower"])
+
+# A condition made only of these can be dropped without changing what a calculation raises
+PURE_NODES = (ast.Name, ast.Constant, ast.Compare, ast.BoolOp, ast.UnaryOp, ast.cmpop, ast.boolop, ast.unaryop, ast.expr_context)
+
+# Types a folded expression may produce
+CONSTANT_TYPES = (str, float, int, bool, type(None), tuple)
+
+
+class _Statement(NamedTuple):
+    name: Optional[str]
+    expression: ast.expr
+    message: Optional[ast.expr]
+    check: bool
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """Replaces the specialized expressions and the names bound to constants or other names, then folds what became constant"""
+
+    def __init__(self, specialization: dict[str, ast.expr], bindings: dict[str, ast.expr]):
+        self._specialization = specialization
+        self._bindings = bindings
+
+    def visit(self, node: ast.AST) -> ast.AST:
+        if isinstance(node, ast.expr):
+            value = self._specialization.get(ast.dump(node))
+
+            if value is not None:
+                return ast.Constant(value.value)
+
+        return super().visit(node)
+
+    def visit_Name(self, node: ast.Name) -> ast.expr:
+        binding = self._bindings.get(node.id)
+
+        if binding is None or not isinstance(node.ctx, ast.Load):
+            return node
+
+        return ast.Constant(binding.value) if isinstance(binding, ast.Constant) else ast.Name(binding.id, ast.Load())
+
+    def visit_Call(self, node: ast.Call) -> ast.expr:
+        self.generic_visit(node)
+
+        if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Constant) and type(node.func.value.value) is str and node.func.attr in FOLDED_METHODS and len(node.args) == 0 and len(node.keywords) == 0:
+            return ast.Constant(getattr(node.func.value.value, node.func.attr)())
+
+        return node
+
+    def _fold(self, node: ast.expr, operands: list[ast.expr]) -> ast.expr:
+        if not all(isinstance(operand, ast.Constant) for operand in operands):
+            return node
+
+        try:
+            value = eval(compile(ast.fix_missing_locations(ast.Expression(node)), "<fold>", "eval"), {"__builtins__": {}})
+        except Exception:
+            # Left for the calculation to raise
+            return node
+
+        return ast.Constant(value) if isinstance(value, CONSTANT_TYPES) else node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.expr:
+        self.generic_visit(node)
+
+        return self._fold(node, [node.left] + node.comparators)
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        self.generic_visit(node)
+
+        return self._fold(node, [node.left, node.right])
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.expr:
+        self.generic_visit(node)
+
+        return self._fold(node, [node.operand])
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.expr:
+        self.generic_visit(node)
+
+        values = node.values
+
+        # Leading constants either decide the operation or drop out of it
+        while len(values) > 1 and isinstance(values[0], ast.Constant):
+            if bool(values[0].value) != isinstance(node.op, ast.And):
+                return values[0]
+
+            values = values[1:]
+
+        if len(values) == 1:
+            return values[0]
+
+        node.values = values
+
+        return node
+
+    def visit_IfExp(self, node: ast.IfExp) -> ast.expr:
+        self.generic_visit(node)
+
+        if isinstance(node.test, ast.Constant):
+            return node.body if node.test.value else node.orelse
+
+        if isinstance(node.body, ast.Constant) and isinstance(node.orelse, ast.Constant) and type(node.body.value) is type(node.orelse.value) and node.body.value == node.orelse.value and all(isinstance(element, PURE_NODES) for element in ast.walk(node.test)):
+            return node.body
+
+        return node
+
+
+class ModelCompiler:
+    """Generates one flat Python function per target set and specialization of a calculation graph. A specialization fixes the value of
+    expressions, such as the casefolded sapind of the SAP and non SAP paths, which are then folded with the constants they decide and the
+    branches they rule out. Generated code is cached on disk per model version and Python version"""
+
+    def __init__(self, graph: CalculationGraph, name: str, version: int, cache_path: str = ""):
+        for node_name in graph.nodes:
+            # Nodes become locals of the generated function
+            if node_name in graph.namespace or node_name == BreakError.__name__:
+                raise ValueError(f"Calculation '{node_name}' hides a name of the model namespace.")
+
+        self._graph = graph
+        self._name = name
+        self._version = version
+        self._cache_path = cache_path
+        self._functions = dict()
+        self._lock = threading.Lock()
+
+    def compile(self, targets: Iterable[str], specialization: Optional[dict[str, Any]] = None) -> Callable[..., dict[str, Any]]:
+        """Function of the graph sources that returns the value of every target, specialization maps expressions to the constant they are known to be"""
+        target_names = set(targets)
+        ordered_targets = tuple(name for name in self._graph.nodes if name in target_names)
+        specialization = dict() if specialization is None else specialization
+        key = self.key(ordered_targets, specialization)
+        function = self._functions.get(key)
+
+        if function is not None:
+            return function
+
+        path = self._path(key)
+        code = self._load(path)
+
+        if code is None:
+            source = self.generate(ordered_targets, specialization)
+            code = compile(source, path or f"<{self._name} {self._version}>", "exec")
+
+            self._save(path, source, code)
+
+        namespace = dict(self._graph.namespace)
+        namespace[BreakError.__name__] = BreakError
+
+        exec(code, namespace)
+
+        with self._lock:
+            function = self._functions.setdefault(key, namespace["calculate"])
+
+        return function
+
+    def key(self, targets: tuple[str, ...], specialization: dict[str, Any]) -> str:
+        nodes = [(node.name, node.formula, node.check) for node in self._graph.nodes.values()]
+        fingerprint = repr((COMPILER_VERSION, self._name, self._version, sys.implementation.cache_tag, self._graph.sources, nodes, targets, sorted(specialization.items())))
+
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def generate(self, targets: tuple[str, ...], specialization: dict[str, Any]) -> str:
+        """Source of the calculate function, checks raise inline and nodes nothing reads after folding are left out"""
+        specialized = {ast.dump(ast.parse(expression, mode="eval").body): ast.Constant(value) for (expression, value) in specialization.items()}
+        bindings = dict()
+        statements = list()
+
+        for step in self._graph.plan(targets):
+            node = self._graph.nodes[step.name]
+            expression = _ConstantFolder(specialized, bindings).visit(ast.parse(node.formula, mode="eval").body)
+
+            if node.check and isinstance(expression, ast.Call) and isinstance(expression.func, ast.Name) and expression.func.id == break_when.__name__ and len(expression.args) == 2:
+                (condition, message) = expression.args
+
+                if not isinstance(condition, ast.Constant) or condition.value:
+                    statements.append(_Statement(None, condition, message, True))
+            elif isinstance(expression, (ast.Constant, ast.Name)):
+                # Constants and plain names are substituted into the nodes that read them
+                bindings[node.name] = expression
+            else:
+                statements.append(_Statement(node.name, expression, None, node.check))
+
+        # Walked backwards, a node is kept when a check, a kept node or a target reads it
+        needed = set(name for name in targets if name not in bindings)
+        kept = list()
+
+        for statement in reversed(statements):
+            if statement.check or statement.name in needed:
+                kept.append(statement)
+                needed.update(element.id for part in [statement.expression, statement.message] if part is not None for element in ast.walk(part) if isinstance(element, ast.Name))
+
+        lines = [f"def calculate({', '.join(self._graph.sources)}):"]
+
+        for statement in reversed(kept):
+            if statement.message is None:
+                lines.append(f"    {statement.name} = {ast.unparse(statement.expression)}")
+            else:
+                lines.append(f"    if {ast.unparse(statement.expression)}:")
+                lines.append(f"        raise {BreakError.__name__}({ast.unparse(statement.message)})")
+
+        values = ", ".join(f"{name!r}: {ast.unparse(bindings[name]) if name in bindings else name}" for name in targets)
+        lines.append(f"    return {{{values}}}")
+
+        return "\n".join(lines) + "\n"
+
+    def _path(self, key: str) -> str:
+        if self._cache_path == "":
+            return ""
+
+        return os.path.join(self._cache_path, f"{re.sub(r'[^A-Za-z0-9]+', '_', self._name)}-{self._version}-{sys.implementation.cache_tag}-{key[:16]}.py")
+
+    def _load(self, path: str) -> Optional[CodeType]:
+        if path == "":
+            return None
+
+        try:
+            with open(f"{path}c", "rb") as file:
+                code = marshal.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError) as ex:
+            logger.warning(f"Compiled model '{path}c' could not be read, compiling it again: {ex}")
+
+            return None
+
+        return code if isinstance(code, CodeType) else None
+
+    def _save(self, path: str, source: str, code: CodeType):
+        if path == "":
+            return
+
+        temporary_path = f"{path}c.{os.getpid()}.{threading.get_ident()}"
+
+        try:
+            os.makedirs(self._cache_path, exist_ok=True)
+
+            # The source is kept next to the code for tracebacks and for reading what was generated
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(source)
+
+            with open(temporary_path, "wb") as file:
+                marshal.dump(code, file)
+
+            os.replace(temporary_path, f"{path}c")
+        except OSError as ex:
+            logger.warning(f"Compiled model could not be cached in '{self._cache_path}': {ex}")
@@ -0,0 +1,50 @@
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from marshmallow import Schema
+from marshmallow.fields import Inferred
+
+# Types an inferred field dumps as they are
+PLAIN_TYPES = frozenset([str, float, int, bool, type(None)])
+
+
+class ModelSerializer:
+    """Dumps a model as its marshmallow schema does. The schema is built once, and a schema listing its fields in Meta has tuple models of plain values read straight into a dict"""
+
+    def __init__(self, schema: type[Schema]):
+        self.schema = schema()
+        self._names = tuple(self.schema.dump_fields)
+        self._readers = dict()
+
+        # Declared fields, renamed fields, dump hooks and an overridden dump are left to the schema
+        self._readable = schema.dump is Schema.dump and not any(self.schema._hooks.values()) and all(type(field) is Inferred and field.data_key is None and field.attribute is None for field in self.schema.dump_fields.values())
+
+    def _reader(self, model_type: type) -> Optional[Callable[[tuple], dict[str, Any]]]:
+        if not self._readable or not issubclass(model_type, tuple) or not hasattr(model_type, "_fields"):
+            return None
+
+        # The schema leaves out the fields a model does not have
+        positions = [(name, model_type._fields.index(name)) for name in self._names if name in model_type._fields]
+
+        def read(model: tuple) -> Optional[dict[str, Any]]:
+            values = {name: model[position] for (name, position) in positions}
+
+            return values if all(type(value) in PLAIN_TYPES for value in values.values()) else None
+
+        return read
+
+    def __call__(self, model: Any) -> dict[str, Any]:
+        model_type = type(model)
+
+        if model_type not in self._readers:
+            self._readers[model_type] = self._reader(model_type)
+
+        reader = self._readers[model_type]
+        values = None if reader is None else reader(model)
+
+        return self.schema.dump(model) if values is None else values
+
+
+@lru_cache(maxsize=None)
+def model_serializer(schema: type[Schema]) -> ModelSerializer:
+    return ModelSerializer(schema)
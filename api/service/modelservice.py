@@ -1,5 +1,6 @@
 from api.model.model import ModelModel
 from api.model.parameter import ParameterModel
+from api.service.quotelinesapgraph import quote_line_sap_calculations
 
 
 class ModelService:
@@ -25,7 +26,7 @@ class ModelService:
             model.model_inputs.append(ParameterModel("automatedTuningFlagOverride", "string", False, ""))
         else:
             model.name = "quoteLineSAP"
-            model.calculations = []
+            model.calculations = list(quote_line_sap_calculations())
             model.debug_mode = debug_mode
             model.model_inputs = []
             model.version = 40
@@ -0,0 +1,70 @@
+import sqlite3
+from bisect import bisect_right
+from typing import Optional
+
+from api.model.opcode import OpCodeModel
+from api.service.rowdecoder import RowDecoder
+
+
+class OpCodeGrid:
+    """Net weight by piece weight grid of one op code, each cell holds the first row whose ranges contain it"""
+
+    def __init__(self, rows: list[OpCodeModel]):
+        self._rows = rows
+        self._net_weights = sorted({weight for row in rows for weight in (row.net_weight_low, row.net_weight_high)})
+        self._piece_weights = sorted({weight for row in rows for weight in (row.pieces_weight_low, row.pieces_weight_high)})
+
+        # Ranges are low inclusive and high exclusive, so a cell is represented by its lower corner
+        self._cells = [[self._first_row(net_weight, piece_weight) for piece_weight in self._piece_weights[:-1]] for net_weight in self._net_weights[:-1]]
+
+    def _first_row(self, net_weight: float, piece_weight: float) -> Optional[OpCodeModel]:
+        for row in self._rows:
+            if row.net_weight_low <= net_weight < row.net_weight_high and row.pieces_weight_low <= piece_weight < row.pieces_weight_high:
+                return row
+
+        return None
+
+    def find(self, adjusted_net_weight_of_sales_item: float, net_weight_of_sales_item: float) -> Optional[OpCodeModel]:
+        net_weight_cell = bisect_right(self._net_weights, adjusted_net_weight_of_sales_item) - 1
+        piece_weight_cell = bisect_right(self._piece_weights, net_weight_of_sales_item) - 1
+
+        # Values below the lowest or at or above the highest boundary are outside every row
+        if not 0 <= net_weight_cell < len(self._cells) or not 0 <= piece_weight_cell < len(self._piece_weights) - 1:
+            return None
+
+        return self._cells[net_weight_cell][piece_weight_cell]
+
+
+class OpCodeIndex:
+    """Answers the op code range lookup with two binary searches instead of four range predicates"""
+
+    def __init__(self, rows: list[OpCodeModel]):
+        rows_by_op_code = dict()
+
+        for row in rows:
+            rows_by_op_code.setdefault(row.op_code_value, []).append(row)
+
+        self._grids = {op_code: OpCodeGrid(op_code_rows) for (op_code, op_code_rows) in rows_by_op_code.items()}
+
+    @classmethod
+    def from_rows(cls, column_names: tuple[str, ...], rows: list[tuple], from_row: RowDecoder) -> "OpCodeIndex":
+        # A null bound never satisfies the range predicates, so those rows can not match
+        names = [column_name.casefold() for column_name in column_names]
+        bound_positions = [names.index(column) for column in ["netweightlow", "netweighthigh", "pieceweightlow", "pieceweighthigh"]]
+        decode = from_row.bind(column_names)
+
+        return cls([decode(row) for row in rows if all(row[position] is not None for position in bound_positions)])
+
+    @classmethod
+    def load(cls, connection: sqlite3.Connection, from_row: RowDecoder) -> "OpCodeIndex":
+        cursor = connection.execute("SELECT * FROM opcodes")
+
+        return cls.from_rows(tuple(column[0] for column in cursor.description), cursor.fetchall(), from_row)
+
+    def find(self, op_code: str, adjusted_net_weight_of_sales_item: float, net_weight_of_sales_item: float) -> Optional[OpCodeModel]:
+        grid = self._grids.get(op_code)
+
+        if grid is None:
+            return None
+
+        return grid.find(adjusted_net_weight_of_sales_item, net_weight_of_sales_item)
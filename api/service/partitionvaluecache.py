@@ -0,0 +1,33 @@
+from api.service.miscoperations import MiscOperations
+
+
+class PartitionValueCache:
+    """Partition values by the string they are hashed from. The automated tuning hash values carry the monday date, so the entries
+    are dropped when the week changes and when the cache is full"""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._week = None
+        self._values = dict()
+
+    def get(self, value: str, week: str) -> float:
+        # A partition value depends only on its string, so threads racing on a reset at worst hash a string again
+        if week != self._week:
+            self._week = week
+            self._values = dict()
+
+        values = self._values
+        partition_value = values.get(value)
+
+        if partition_value is None:
+            partition_value = MiscOperations.get_partition_value(value)
+
+            if len(values) >= self._max_entries:
+                values.clear()
+
+            values[value] = partition_value
+
+        return partition_value
+
+    def __len__(self) -> int:
+        return len(self._values)
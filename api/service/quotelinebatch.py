@@ -0,0 +1,74 @@
+import json
+from typing import Any, Iterable
+
+
+class QuoteLineBatch:
+    """Quote lines priced together by QuoteLineSap.execute_batch, each line kept as it came in"""
+
+    def __init__(self):
+        self._lines = list()
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[dict[str, Any]]) -> "QuoteLineBatch":
+        batch = cls()
+
+        for line in lines:
+            batch.append(line)
+
+        return batch
+
+    @classmethod
+    def from_file(cls, path: str) -> "QuoteLineBatch":
+        """Reads a JSON array of quote lines, or JSON lines with one quote line per line"""
+        with open(path, encoding="utf-8") as file:
+            text = file.read()
+
+        if text.lstrip().startswith("["):
+            return cls.from_lines(json.loads(text))
+
+        return cls.from_lines(json.loads(line) for line in text.splitlines() if line.strip() != "")
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def append(self, line: dict[str, Any]):
+        self._lines.append(line)
+
+    def line(self, position: int) -> dict[str, Any]:
+        return self._lines[position]
+
+    def lines(self) -> list[dict[str, Any]]:
+        return list(self._lines)
+
+
+if __name__ == '__main__':
+    import sys
+    from argparse import ArgumentParser
+
+    from api.service.modelservice import ModelService
+    from api.service.queuedlogger import QueuedLogger
+    from api.service.quotelinesap import QuoteLineSap
+    from api.service.serviceregistry import create_lookup_service
+    from config import Config
+
+    parser = ArgumentParser(description="Prices a file of quoteLineSAP inputs as one batch, for repricing outside of a request")
+    parser.add_argument('-i', '--input', required=True, help='JSON array or JSON lines of quote lines, with the customer inputs recommendedPrice adds to every line')
+    parser.add_argument('-o', '--output', help='file the priced lines are written to as a JSON array, standard output by default')
+    parser.add_argument('-c', '--client', default="batch", help='client id the lines are priced for')
+    parser.add_argument('--debug', action='store_true', help='include the inputs and intermediate calculations of every line')
+    args = parser.parse_args()
+
+    # Lines are priced in this process, never fanned out to the calculation service
+    configuration = type("BatchConfig", (Config,), {"fan_out": "False"})
+
+    lookup_service = create_lookup_service(configuration)
+    quote_line_sap = QuoteLineSap(lambda: lookup_service, QueuedLogger(), configuration)
+    model = ModelService().get_model("quotelinesap", args.debug)
+
+    priced_lines = quote_line_sap.execute_batch(args.client, args.client, model, QuoteLineBatch.from_file(args.input), "", "", lookup_service)
+
+    if args.output is None:
+        json.dump(priced_lines, sys.stdout, default=str)
+    else:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(priced_lines, output, default=str)
@@ -0,0 +1,587 @@
+import copy
+import math
+from functools import lru_cache
+from typing import Any, Hashable
+
+from requests.structures import CaseInsensitiveDict
+
+from api.model.calcuation import CalculationModel
+from api.model.calculationnode import CalculationNodeModel as Node
+from api.model.materialcost import MaterialCostModel
+from api.schema.automatedtuning import AutomatedTuningSchema
+from api.schema.bwrating import BwRatingSchema
+from api.schema.clcode import ClCodeSchema
+from api.schema.costadjustment import CostAdjustmentSchema
+from api.schema.freight import FreightSchema
+from api.schema.freightdefault import FreightDefaultSchema
+from api.schema.ido import IdoSchema
+from api.schema.locationgroup import LocationGroupSchema
+from api.schema.materialsalesoffice import MaterialSalesOfficeSchema
+from api.schema.milltoplantfreight import MillToPlantFreightSchema
+from api.schema.packagingcost import PackagingCostSchema
+from api.schema.product import ProductSchema
+from api.schema.sapfreight import SapFreightSchema
+from api.schema.sobwfloorprice import SoBwFloorPriceSchema
+from api.schema.southfreight import SouthFreightSchema
+from api.schema.southskidcharge import SouthSkidChargeSchema
+from api.schema.tmadjustment import TmAdjustmentSchema
+from api.service.calculationgraph import CalculationGraph, CalculationStep, break_when
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from api.service.linecontext import line_context_keys
+from api.service.partitionvaluecache import PartitionValueCache
+from api.service.weightclassladder import WEIGHT_CLASSES, WEIGHT_CLASS_NAMES, WEIGHT_CLASS_POSITIONS, weight_class_columns, cust_price_weight_class, order_cost_weight_class, non_mat_cost_weight_class, recommended_price_ladder
+
+# Values every quote line is calculated from
+QUOTE_LINE_SAP_SOURCES = ("inputs", "client_id", "lookup_service", "material_cost_cache", "clock")
+
+# Values the material cost block is calculated from
+MATERIAL_COST_SOURCES = ("inputs", "client_id", "lookup_service")
+
+# Errors a formula raises on the values it reads, they are kept with the material cost block. Errors of the lookup service are raised as they happen
+CALCULATION_ERRORS = (ArithmeticError, AttributeError, LookupError, TypeError, ValueError)
+
+MATERIAL_COST_FIELDS = tuple(name for name in MaterialCostModel._fields if name != "errors")
+
+# Lines that share a customer, ISR office and bellwether material hash the same strings
+PARTITION_VALUE_CACHE_ENTRIES = 65536
+
+PARTITION_VALUES = PartitionValueCache(PARTITION_VALUE_CACHE_ENTRIES)
+
+
+def material_cost_value(material_costs: MaterialCostModel, name: str) -> Any:
+    """A field of the material cost block, a field that failed raises its error where the quote line reads it"""
+    for (failed_name, error) in material_costs.errors:
+        if failed_name == name:
+            # Every line that reads the field raises its own copy
+            raise copy.copy(error)
+
+    return getattr(material_costs, name)
+
+
+QUOTE_LINE_SAP_NAMESPACE = {
+    "math": math,
+    "partition_values": PARTITION_VALUES,
+    "line_context_keys": line_context_keys,
+    "break_when": break_when,
+    "material_cost_value": material_cost_value,
+    "WEIGHT_CLASSES": WEIGHT_CLASSES,
+    "WEIGHT_CLASS_POSITIONS": WEIGHT_CLASS_POSITIONS,
+    "weight_class_columns": weight_class_columns,
+    "cust_price_weight_class": cust_price_weight_class,
+    "order_cost_weight_class": order_cost_weight_class,
+    "non_mat_cost_weight_class": non_mat_cost_weight_class,
+    "recommended_price_ladder": recommended_price_ladder
+}
+
+# The calculations of a quote line that depend only on its client, rcmapping, material, stock plant, ship plant and sapind, in the order
+# the quote line makes them. They are calculated once per material and shared by every customer that quotes it, the material sales office
+# is left out of the line context because it depends on the ISR office
+MATERIAL_COST_NODES = [
+    Node("material", 'inputs.get("material")'),
+    Node("ship_plant", 'inputs.get("shipplant")'),
+    Node("stock_plant", 'inputs.get("stockplant")'),
+    Node("sap_ind", 'inputs.get("sapind")'),
+    Node("line_context", 'lookup_service.lookup_line_context(client_id, line_context_keys(inputs)._replace(material_sales_office_key=None))'),
+    Node("product_info", 'line_context.product', "productInfo", ProductSchema, row=True),
+    Node("cost_adjustment_test_info", 'line_context.cost_adjustment', "costAdjustmentTestInfo", CostAdjustmentSchema, row=True),
+    Node("material_classification", '"STD" if cost_adjustment_test_info is None or cost_adjustment_test_info.material_classification == "" else cost_adjustment_test_info.material_classification', "materialClassification"),
+    Node("cost_plus", 'material_classification.casefold() == "cpl".casefold()'),
+    Node("bell_wether_material", 'inputs.get("material") if cost_plus else product_info.bellwether_material', "bellWetherMaterial"),
+    Node("bell_wether_base_cost", 'cost_adjustment_test_info.cost if cost_plus else product_info.bellwether_base_cost', "bellwetherBaseCost"),
+    Node("index", 'material_classification.upper() if cost_plus else product_info.index', "index"),
+    Node("exchange_rate_info", 'lookup_service.lookup_exchange_rate(client_id, "products", inputs.get("rcmapping"), None) if cost_plus else None', "exchangeRateInfo", ProductSchema, row=True),
+    Node("exchange_rate_value", '(exchange_rate_info.exchange_rate if exchange_rate_info is not None else 0.0) if cost_plus else product_info.exchange_rate if product_info is not None else 0.0'),
+    Node("material_description", 'cost_adjustment_test_info.material_description if cost_plus else product_info.material_description', "materialDescription"),
+    Node("product", 'cost_adjustment_test_info.product.upper() if cost_plus else product_info.product_name.upper()', "product"),
+    Node("form", 'cost_adjustment_test_info.form.upper() if cost_plus else product_info.form.upper()', "form"),
+    Node("market_movement_adder", '0.0 if cost_plus else product_info.market_movement_adder', "marketMovementAdder"),
+    Node("percent_adjustment", '1.0 if cost_plus else product_info.percent_adjustment', "percentAdjustment"),
+    Node("dollar_adjustment", '0.0 if cost_plus else product_info.dollar_adjustment', "dollarAdjustment"),
+    Node("modeled_cost_raw", 'cost_adjustment_test_info.cost if cost_plus else product_info.modeled_cost', "modeledCostRaw"),
+    Node("mtp_key", 'f"{bell_wether_material}|{ship_plant}"'),
+    Node("mtp_ship_plant_info", 'line_context.mill_to_plant_freight if line_context.mill_to_plant_freight_key == mtp_key else lookup_service.lookup_mill_to_plant_freight(client_id, "mill_to_plant_freights", mtp_key, None)', "mtpShipPlantInfo", MillToPlantFreightSchema, row=True),
+    Node("mill_to_plant_freight", '0.0 if mtp_ship_plant_info is None else mtp_ship_plant_info.mill_to_plant_freight_value', "millToPlantFreight"),
+    Node("ido_info", 'line_context.ido', "idoInfo", IdoSchema, row=True),
+    Node("ido_per_pound", '0 if ido_info is None else ido_info.ido_per_pound / 100', "idoPerPound"),
+    Node("ido_min", '0.00 if ido_info is None else ido_info.ido_min', "idoMin"),
+    Node("ido_max", '10000.0 if ido_info is None else ido_info.ido_max', "idoMax"),
+    Node("packaging_cost_info", 'None if sap_ind.casefold() == "N".casefold() else line_context.packaging_cost', "packagingCostInfo", PackagingCostSchema, row=True),
+    Node("packaging_cost_info_final", 'product_info if packaging_cost_info is None else packaging_cost_info', "packagingCostInfoFinal", PackagingCostSchema, row=True),
+    Node("unit_handling_cost", 'packaging_cost_info_final.unit_handling_cost if sap_ind.casefold() == "Y".casefold() and packaging_cost_info_final is not None else 0.0', "unitHandlingCost"),
+    Node("product_form_key", 'f"{product}|{form}"'),
+    Node("south_skid_charge_info", 'lookup_service.lookup_south_skid_charge(client_id, "south_skid_charge_lookup", product_form_key, None) if sap_ind.casefold() == "N".casefold() else None', "southSkidChargeInfo", SouthSkidChargeSchema, row=True),
+    Node("south_skid_charge_weight", 'south_skid_charge_info.weight_per_skid if sap_ind.casefold() == "N".casefold() and south_skid_charge_info is not None else 0.0', "southSkidChargeWeight"),
+    Node("south_skid_charge", 'south_skid_charge_info.skid_charge if sap_ind.casefold() == "N".casefold() and south_skid_charge_info is not None else 0.0', "southSkidCharge"),
+    Node("per_ton_packaging_cost", 'packaging_cost_info_final.per_ton_packaging_cost if sap_ind.casefold() == "Y".casefold() and packaging_cost_info_final is not None else 0.0', "perTonPackagingCost"),
+    Node("per_ton_stocking_cost", 'packaging_cost_info_final.per_ton_stocking_cost if sap_ind.casefold() == "Y".casefold() and packaging_cost_info_final is not None else 0.0', "perTonStockingCost"),
+    Node("stocking_cost_per_pound", 'round(per_ton_stocking_cost / 2000.0, 4)', "stockingCostPerPound")
+]
+
+MATERIAL_COST_GRAPH = CalculationGraph(MATERIAL_COST_NODES, MATERIAL_COST_SOURCES, QUOTE_LINE_SAP_NAMESPACE)
+
+MATERIAL_COST_PLAN = MATERIAL_COST_GRAPH.plan(MATERIAL_COST_FIELDS)
+
+
+def material_cost_key(inputs: CaseInsensitiveDict[str, Any], client_id: str) -> Hashable:
+    values = (inputs.get("rcmapping"), inputs.get("material"), inputs.get("stockplant"), inputs.get("shipplant"), inputs.get("sapind"))
+
+    # Equal values of different types, such as 1 and 1.0, are formatted differently into the lookup keys
+    return (client_id,) + values + tuple(type(value) for value in values)
+
+
+def material_costs(inputs: CaseInsensitiveDict[str, Any], client_id: str, lookup_service: LookupServiceInterface) -> MaterialCostModel:
+    """Evaluates every node of the material cost block, a node that fails, or reads a node that failed, is kept with the error instead of a value"""
+    values = {"inputs": inputs, "client_id": client_id, "lookup_service": lookup_service}
+    errors = dict()
+
+    for step in MATERIAL_COST_PLAN:
+        dependencies = MATERIAL_COST_GRAPH.dependencies[step.name]
+
+        # The node that failed first is the one the quote line would have raised on
+        error = next((error for (name, error) in errors.items() if name in dependencies), None)
+
+        if error is None:
+            try:
+                values[step.name] = step.function(*step.arguments(values))
+
+                continue
+            except CALCULATION_ERRORS as ex:
+                # The traceback would keep the lookup service the entry is cached under alive
+                error = ex.with_traceback(None)
+
+        errors[step.name] = error
+
+    return MaterialCostModel(**{name: values.get(name) for name in MATERIAL_COST_FIELDS}, errors=tuple((name, error) for (name, error) in errors.items() if name in MATERIAL_COST_FIELDS))
+
+
+def material_cost_node(name: str) -> Node:
+    """The node of the quote line that reads name from the material cost block"""
+    node = MATERIAL_COST_GRAPH.nodes[name]
+
+    return Node(name, f'material_cost_value(material_costs, "{name}")', node.trace, node.schema, node.row)
+
+
+# The calculations of a quote line in the order they are made, a node reads the nodes declared before it.
+# A check node stops the calculation, trace is the intermediate calculation a node is kept as and a row is only kept when it is found
+QUOTE_LINE_SAP_NODES = [
+    Node("net_weight_of_sales_item", 'float(inputs.get("netweightofsalesitem"))', "netWeightOfSalesItem", check=True),
+    Node("weight", 'float(inputs.get("weight"))', "weight", check=True),
+    Node("bundles", 'int(inputs.get("bundles"))', "bundles", check=True),
+    Node("customer_id", 'inputs.get("customerid")', "customerId"),
+    Node("material", 'inputs.get("material")', "material"),
+    Node("ship_plant", 'inputs.get("shipplant")', "shipPlant"),
+    Node("stock_plant", 'inputs.get("stockplant")', "stockPlant"),
+    Node("independent_calculation_flag", 'bool(inputs.get("independentcalculationflag"))', "independentCalculationFlag"),
+    Node("ship_to_state", 'inputs.get("shiptostate")', "shipToState"),
+    Node("ship_to_zip_code", 'inputs.get("shiptozipcode")', "shipToZipCode"),
+    Node("op_code", 'inputs.get("opcode")', "opCode"),
+    Node("sap_ind", 'inputs.get("sapind")'),
+    Node("net_weight_per_finished_piece", 'float(inputs.get("netweightperfinishedpiece"))', "netWeightPerFinishedPiece", check=True),
+    Node("isr_name", 'inputs.get("isrname")', "isrName"),
+    Node("is_test_customer", '"CL2 PRICE MASTER" in inputs.get("customername")', "isTestCustomer", check=True),
+    Node("item_number", 'inputs.get("itemnumber")'),
+    Node("rc_mapping", 'inputs.get("rcmapping")'),
+    Node("multi_market", 'inputs.get("multimarket")'),
+    Node("customer_sales_office", 'inputs.get("customersalesoffice")'),
+    Node("isr_office", 'inputs.get("isroffice")'),
+    Node("dso_adder", 'inputs.get("dsoadder")'),
+    Node("total_quote_pounds", 'inputs.get("totalquotepounds")'),
+    Node("adjusted_net_weight_of_sales_item", 'weight if net_weight_of_sales_item == -1 else net_weight_of_sales_item', "adjustedNetWeightOfSalesItem"),
+    Node("adjusted_bundles", 'math.ceil(weight / 2000) if bundles == -1 else bundles', "adjustedBundles"),
+    Node("product_key", '''f"{inputs.get('rcmapping')}|{material}"''', "productKey"),
+    # Calculated once per material and shared by the quote lines of every customer
+    Node("material_costs", 'material_cost_cache.get(inputs, client_id, lookup_service)'),
+    material_cost_node("product_info"),
+    Node("cost_adjustment_lookup_key", 'f"{material}|{stock_plant}"', "costAdjustmentTestLookupKey"),
+    material_cost_node("cost_adjustment_test_info"),
+    material_cost_node("material_classification"),
+    material_cost_node("cost_plus"),
+    Node("material_found", 'break_when(product_info is None and not cost_plus, "Material not found.")', check=True),
+    material_cost_node("bell_wether_material"),
+    Node("bell_wether_material_found", 'break_when(bell_wether_material.casefold() == "na".casefold(), "bellWetherMaterial not found.")', check=True),
+    material_cost_node("bell_wether_base_cost"),
+    material_cost_node("index"),
+    Node("index_found", 'break_when(index == "", "Index not found.")', check=True),
+    material_cost_node("exchange_rate_info"),
+    material_cost_node("exchange_rate_value"),
+    Node("exchange_rate_found", 'break_when(exchange_rate_value == 0.0, "exchangeRate not found.")', check=True),
+    Node("exchange_rate", 'exchange_rate_value', "exchangeRate"),
+    material_cost_node("material_description"),
+    material_cost_node("product"),
+    material_cost_node("form"),
+    material_cost_node("market_movement_adder"),
+    material_cost_node("percent_adjustment"),
+    material_cost_node("dollar_adjustment"),
+    material_cost_node("modeled_cost_raw"),
+    Node("cost_adjustment_salt_value", '"IE_COST_ADJUSTMENT_TEST"', "costAdjustmentSaltValue"),
+    Node("cost_adjustment_hash_fields", '"CustomerId" + "|" + "isrOffice" + "|" + "material" + "|" + "costAdjustmentSaltValue"', "costAdjustmentHashFields"),
+    Node("cost_adjustment_hash_values", '''f"{customer_id}|{inputs.get('isroffice')}|{inputs.get('material')}|{cost_adjustment_salt_value}"''', "costAdjustmentHashValues"),
+    Node("cost_adj_partition_value", 'partition_values.get(cost_adjustment_hash_values, clock.monday_date)', "costAdjPartitionValue"),
+    Node("cost_adjustment_test_group_num", 'int(math.ceil(cost_adj_partition_value/(1.0/7.0)))', "costAdjustmentTestGroupNum"),
+    Node("cost_adjustment_test_group", '["A", "B", "C", "D", "E", "F", "G"][cost_adjustment_test_group_num - 1]', "costAdjustmentTestGroup"),
+    Node("cost_adjustment_percent_raw", '[0.0, 0.05, -0.05, 0.10, -0.10, 0.20, -0.20][cost_adjustment_test_group_num - 1]', "costAdjustmentPercentRaw"),
+    Node("cost_adjustment_percent", 'cost_adjustment_percent_raw if (cost_plus or material_classification.casefold() == "lm".casefold()) and 25 <= float(inputs.get("weight")) <= 5000 and not is_test_customer else 0.00', "costAdjustmentPercent"),
+    Node("modeled_cost", 'modeled_cost_raw * (1 + cost_adjustment_percent)', "modeledCost"),
+    Node("modeled_cost_found", 'break_when(modeled_cost == 0.0, "Modeled cost not found.")', check=True),
+    Node("replacement_cost", 'modeled_cost / 100', "replacementCost"),
+    Node("mtp_key", 'f"{bell_wether_material}|{ship_plant}"', "mtpKey"),
+    material_cost_node("mtp_ship_plant_info"),
+    material_cost_node("mill_to_plant_freight"),
+    Node("replacement_cost_with_mtp", 'replacement_cost + mill_to_plant_freight', "replacementCostWithMTP"),
+    Node("ido_key", 'f"{stock_plant}|{ship_plant}"', "idoKey"),
+    material_cost_node("ido_info"),
+    material_cost_node("ido_per_pound"),
+    material_cost_node("ido_min"),
+    material_cost_node("ido_max"),
+    Node("ido_per_pound_min_constrained", 'ido_min / weight if ido_per_pound * weight < ido_min else ido_per_pound', "idoPerPoundMinConstrained"),
+    Node("ido_per_pound_max_constrained", 'ido_max / weight if ido_per_pound_min_constrained * weight > ido_max else ido_per_pound_min_constrained', "idoPerPoundMaxConstrained"),
+    Node("calculation_quote_pounds", 'weight if independent_calculation_flag else inputs.get("totalquotepounds")', "calculationQuotePounds"),
+    Node("weight_class", 'str(lookup_service.bucketed_lookup(client_id, "weight_class", calculation_quote_pounds, "totalquotepounds"))', "weightClass"),
+    Node("target_margin_key", '''f"{inputs.get('isroffice')}|{bell_wether_material}"''', "targetMarginKey"),
+    Node("base_target_margin_raw", 'lookup_service.lookup_target_margin(client_id, "target_margin_lookups", target_margin_key, None)', "baseTargetMarginRaw"),
+    Node("base_target_margin", 'base_target_margin_raw if not cost_plus else 0.0 if cost_adjustment_test_info is None else cost_adjustment_test_info.target_margin', "baseTargetMargin"),
+    Node("base_target_margin_found", 'break_when(base_target_margin == 0, "baseTargetMargin not found.")', check=True),
+    Node("target_margin_adjustment_key", '''f"{inputs.get('multimarket')}|{product}|{form}"''', "targetMarginAdjustmentKey"),
+    Node("target_margin_adjustment_info", 'lookup_service.lookup_tm_adjustment(client_id, "tm_adjustments", target_margin_adjustment_key, None)', "targetMarginAdjustmentInfo", TmAdjustmentSchema, row=True),
+    Node("target_margin_adjustment_found", '''break_when(target_margin_adjustment_info is None, f"Target margin adjustment '{target_margin_adjustment_key}' not found.")''', check=True),
+    Node("target_margin_adjustments", 'weight_class_columns(target_margin_adjustment_info)'),
+    Node("target_margin_adjustment", 'target_margin_adjustments[WEIGHT_CLASS_POSITIONS[weight_class]] if weight_class in WEIGHT_CLASS_POSITIONS else 0.0', "targetMarginAdjustment"),
+    Node("raw_target_margin", 'round(base_target_margin + target_margin_adjustment, 4)', "rawTargetMargin"),
+    Node("target_margin", 'max(min(raw_target_margin, 0.85), -0.20)', "targetMargin"),
+    Node("base_price_per_pound", '(replacement_cost_with_mtp / (1 - target_margin)) + ido_per_pound_max_constrained', "basePricePerPound"),
+    Node("cl_code_key", '''f"{customer_id}|{inputs.get('customersalesoffice')}|{product}|{form}"''', "clCodeKey"),
+    Node("cl_code_info", 'lookup_service.lookup_cl_code(client_id, "cl_codes", cl_code_key, None)', "clCodeInfo", ClCodeSchema, row=True),
+    Node("cl_code", '"2" if is_test_customer else "3" if cl_code_info is None or cl_code_info.cl_code_value == "" else cl_code_info.cl_code_value', "clCode"),
+    Node("cl_discount", '0.0 if is_test_customer else cl_code_info.cl_discount if cl_code_info is not None else 0.05 if inputs.get("sapind").casefold() == "N".casefold() else 0.03', "clDiscount"),
+    Node("customer_price_per_pound", 'base_price_per_pound * (1 + cl_discount + inputs.get("dsoadder"))', "customerPricePerPound")
+] + [
+    Node(f"cust_price_weight_class_{name}", f'cust_price_weight_class(replacement_cost_with_mtp, base_target_margin, target_margin_adjustments[{position}], ido_per_pound_max_constrained, cl_discount)', f"custPriceWeightClass{name}")
+    for (position, name) in enumerate(WEIGHT_CLASS_NAMES)
+] + [
+    Node("ogh_ship_plant", '"9999" if inputs.get("rcmapping").casefold() == "SOUTH_SAP".casefold() else ship_plant', "oghShipPlant"),
+    Node("overhead_group_key", 'f"{material.upper()}|{ogh_ship_plant}"', "overheadGroupKey"),
+    Node("material_sales_office_key", '''f"{material.upper()}|{inputs.get('isroffice')}"''', "materialSalesOfficeKey"),
+    Node("material_sales_office_lookup_items", 'lookup_service.lookup_material_sales_office(client_id, "MaterialSalesOfficeLookups", material_sales_office_key, None)', "materialSalesOfficeLookupItems", MaterialSalesOfficeSchema, row=True),
+    Node("price_adjustment_value", '0 if material_sales_office_lookup_items is None else material_sales_office_lookup_items.price_adjustment', "priceAdjustmentValue"),
+    Node("red_margin_threshold", '0.35 if material_sales_office_lookup_items is None else material_sales_office_lookup_items.red_margin_threshold', "redMarginThreshold"),
+    Node("yellow_margin_threshold", '0.85 if material_sales_office_lookup_items is None else material_sales_office_lookup_items.yellow_margin_threshold', "yellowMarginThreshold"),
+    Node("start_effective_date", 'clock.year_from_now if material_sales_office_lookup_items is None else material_sales_office_lookup_items.start_effective_date', "startEffectiveDate"),
+    Node("end_effective_date", 'clock.year_from_now if material_sales_office_lookup_items is None else material_sales_office_lookup_items.end_effective_date', "endEffectiveDate"),
+    Node("price_adjustment", 'price_adjustment_value if start_effective_date <= clock.now <= end_effective_date else 0.0', "priceAdjustment"),
+    material_cost_node("packaging_cost_info"),
+    material_cost_node("packaging_cost_info_final"),
+    material_cost_node("unit_handling_cost"),
+    Node("handling_cost_per_pound", 'unit_handling_cost / (weight / adjusted_bundles)', "handlingCostPerPound"),
+    Node("handling_cost_per_pound_wc", 'unit_handling_cost / 2000.0', "handlingCostPerPoundWC"),
+    Node("total_tons", 'weight / 2000.0', "totalTons"),
+    Node("product_form_key", 'f"{product}|{form}"', "productFormKey"),
+    material_cost_node("south_skid_charge_info"),
+    material_cost_node("south_skid_charge_weight"),
+    material_cost_node("south_skid_charge"),
+    material_cost_node("per_ton_packaging_cost"),
+    Node("waive_skid", 'inputs.get("waiveskid")', "waiveSkid"),
+    Node("packaging_cost_per_pound", '(per_ton_packaging_cost / 2000.0 if sap_ind.casefold() == "Y".casefold() else ((math.ceil(weight / south_skid_charge_weight) if south_skid_charge_info is not None else 0.0) * south_skid_charge) / weight) if waive_skid.casefold() == "N".casefold() else 0.0', "packagingCostPerPound"),
+    material_cost_node("per_ton_stocking_cost"),
+    material_cost_node("stocking_cost_per_pound"),
+    Node("order_cost_per_pound", 'handling_cost_per_pound + packaging_cost_per_pound + stocking_cost_per_pound', "orderCostPerPound"),
+    Node("order_cost_per_pound_wc", 'handling_cost_per_pound_wc + packaging_cost_per_pound + stocking_cost_per_pound', "orderCostPerPoundWC")
+] + [
+    Node(f"order_cost_weight_class_{name}", f'order_cost_weight_class({weight_class}, unit_handling_cost, waive_skid, packaging_cost_per_pound, sap_ind, south_skid_charge_info, south_skid_charge_weight, south_skid_charge, stocking_cost_per_pound)', f"orderCostWeightClass{name}")
+    for (weight_class, name) in zip(WEIGHT_CLASSES, WEIGHT_CLASS_NAMES)
+] + [
+    Node("sap_freight_key", 'f"{ship_plant}|{ship_to_zip_code}"', "sapFreightKey"),
+    Node("sap_freight_info", 'lookup_service.lookup_sap_freight(client_id, "sap_freight_lookups", sap_freight_key, None) if sap_ind.casefold() == "Y".casefold() else None', "sapFreightInfo", SapFreightSchema, row=True),
+    Node("ship_zone_key", 'f"{customer_id}|{ship_plant}"', "shipZoneKey"),
+    Node("ship_zone_info", 'lookup_service.lookup_ship_zone(client_id, "ship_zone_lookups", ship_zone_key, None) if sap_ind.casefold() == "N".casefold() else None', "shipZoneInfo", row=True),
+    Node("zone", '"" if sap_ind.casefold() == "Y".casefold() else ship_zone_info.zone if ship_zone_info is not None else "3"', "zone"),
+    Node("as400_freight_key", 'f"{ship_plant}|{zone}"', "as400FreightKey"),
+    Node("as400_freight_info", 'lookup_service.lookup_south_freight(client_id, "south_freight_lookups", as400_freight_key, None) if sap_ind.casefold() == "N".casefold() else None', "as400FreightInfo", SouthFreightSchema, row=True),
+    Node("freight_info", 'as400_freight_info if sap_freight_info is None else sap_freight_info', "freightInfo", FreightSchema, row=True),
+    Node("freight_defaults_key", 'f"{ship_plant}|{ship_to_state}"', "freightDefaultsKey"),
+    Node("freight_defaults_info", 'None if freight_info is not None else lookup_service.lookup_freight_default(client_id, "freight_defaults", freight_defaults_key, None) if sap_ind.casefold() == "Y".casefold() else None', "freightDefaultsInfo", FreightDefaultSchema, row=True),
+    Node("freight_escalation_level", '"Level1" if freight_info is not None else "Level3" if freight_defaults_info is None else "Level2"', "freightEscalationLevel"),
+    Node("minimum_freight_charge", 'freight_info.minimum_freight_charge if freight_escalation_level == "Level1" else freight_defaults_info.default_minimum_freight_charge if freight_escalation_level == "Level2" else 50.0', "minimumFreightCharge"),
+    Node("base_raw_freight_charge", '1.8'),
+    Node("freight_charges", '(0.0,) * len(WEIGHT_CLASSES) if freight_info is None else weight_class_columns(freight_info)'),
+    Node("raw_freight_charge", '(freight_info.weight_class_0 if weight_class == "0" else freight_charges[WEIGHT_CLASS_POSITIONS[weight_class]] if weight_class in WEIGHT_CLASS_POSITIONS else base_raw_freight_charge) / 100.0 if freight_escalation_level == "Level1" else freight_defaults_info.default_freight_charge_per_100_pounds / 100.0 if freight_escalation_level == "Level2" else base_raw_freight_charge / 100.0', "rawFreightCharge"),
+    Node("freight_charge_per_pound", 'max(raw_freight_charge, minimum_freight_charge / calculation_quote_pounds)', "freightChargePerPound"),
+    Node("labor_cost_per_pound", 'max(15.0 / weight, 0.01)', "laborCostPerPound"),
+    Node("total_non_material_cost", 'order_cost_per_pound + freight_charge_per_pound + labor_cost_per_pound', "totalNonMaterialCost")
+] + [
+    Node(f"non_mat_cost_weight_class_{name}", f'non_mat_cost_weight_class({weight_class}, order_cost_weight_class_{name}, freight_escalation_level, freight_charges[{position}], 0.0 if freight_defaults_info is None else freight_defaults_info.default_freight_charge_per_100_pounds, base_raw_freight_charge, minimum_freight_charge)', f"nonMatCostWeightClass{name}")
+    for (position, (weight_class, name)) in enumerate(zip(WEIGHT_CLASSES, WEIGHT_CLASS_NAMES))
+] + [
+    Node("total_cost_per_pound", 'round(replacement_cost_with_mtp + total_non_material_cost, 4)', "totalCostPerPound"),
+    Node("small_order_adder", '25.0 / calculation_quote_pounds if inputs.get("rcmapping").casefold() == "SOUTH".casefold() and calculation_quote_pounds <= 500.0 else 15.0 / calculation_quote_pounds if inputs.get("multimarket").casefold() == "NORTHEAST" and calculation_quote_pounds <= 1000.0 else 50.0 / calculation_quote_pounds if inputs.get("rcmapping").casefold() != "SOUTH" and inputs.get("multimarket").casefold() != "NORTHEAST" and calculation_quote_pounds <= 500 else 0.0', "smallOrderAdder"),
+    Node("rec_price_pp_with_order_adder", 'round(customer_price_per_pound + total_non_material_cost + small_order_adder, 4)', "recPricePPWithOrderAdder"),
+    Node("cust_service_dollar_adder", 'inputs.get("dollaradder")', "custServiceDollarAdder"),
+    Node("cust_service_dollar_adder_pp", 'cust_service_dollar_adder / weight', "custServiceDollarAdderPP"),
+    Node("cust_service_percent_adder", 'inputs.get("percentadder")', "custServicePercentAdder"),
+    Node("rec_price_pp_cust_service_adder", 'round(rec_price_pp_with_order_adder * (1 + cust_service_percent_adder) + cust_service_dollar_adder_pp, 4)', "recPricePPCustServiceAdder"),
+    Node("floor_price_key", '''f"{inputs.get('isroffice')}|{bell_wether_material}"''', "floorPriceKey"),
+    Node("floor_price_info", 'lookup_service.lookup_so_bw_floor_price(client_id, "so_bw_floor_price_lookup", floor_price_key, None)', "floorPriceInfo", SoBwFloorPriceSchema, row=True),
+    Node("floor_price", 'floor_price_info.floor_price if floor_price_info is not None else 0.0', "floorPrice"),
+    Node("rec_price_pp_with_price_floor", 'max(rec_price_pp_cust_service_adder, floor_price)', "recPricePPWithPriceFloor"),
+    Node("bw_rating_key", '''f"{inputs.get('multimarket')}|{bell_wether_material}"''', "bwRatingKey"),
+    Node("bw_rating_info", 'lookup_service.lookup_bw_rating(client_id, "bw_rating_lookup", bw_rating_key, None)', "bwRatingInfo", BwRatingSchema, row=True),
+    Node("bw_rating", 'bw_rating_info.bw_rating_value if bw_rating_info is not None else "EXCLUDED"', "bwRating"),
+    Node("bw_rating_adder", 'bw_rating_info.bw_ratting_adder if bw_rating_info is not None else 0.0', "bwRatingAdder"),
+    Node("rec_price_pp_with_bw_rating_adder", 'rec_price_pp_with_price_floor * (1 + bw_rating_adder)', "recommendedPricePerPoundValue"),
+    Node("location_group_lookup_key", 'inputs.get("rcmapping").upper()', "locationGroupLookupKey"),
+    Node("location_group_info", 'lookup_service.lookup_location_group(client_id, "location_group_lookup", location_group_lookup_key, None)', "locationGroupInfo", LocationGroupSchema, row=True),
+    Node("location_group", 'location_group_info.location_group_value if location_group_info is not None else "UNKNOWN"', "locationGroup"),
+    Node("condensed_form", '"FR" if form.casefold() == "FLAT".casefold() or form.casefold() == "FLAT".casefold() else form', "condensedForm"),
+    Node("automated_tuning_lookup_key", 'f"{location_group}|{product}|{condensed_form}"', "automatedTuningLookupKey"),
+    Node("automated_tuning_info", 'lookup_service.lookup_automated_tuning(client_id, "automated_tuning_lookup", automated_tuning_lookup_key, None)', "automatedTuningInfo", AutomatedTuningSchema, row=True),
+    Node("salt_value", 'automated_tuning_info.salt_value if automated_tuning_info is not None else "UNKNOWN"', "saltValue"),
+    Node("price_up_active_flag", 'automated_tuning_info.price_up_active_flag if automated_tuning_info is not None else "FALSE"', "priceUpActiveFlag"),
+    Node("price_up_measurement_level", 'automated_tuning_info.price_up_measurement_level if automated_tuning_info is not None else ""', "priceUpMeasurementLevel"),
+    Node("price_up_concentration", 'automated_tuning_info.price_up_concentration if automated_tuning_info is not None else 0.0', "priceUpConcentration"),
+    Node("price_up_magnitude", 'automated_tuning_info.price_up_magnitude if automated_tuning_info is not None else 0.0', "priceUpMagnitude"),
+    Node("price_up_realization", 'automated_tuning_info.price_up_realization if automated_tuning_info is not None else 0.0', "priceUpRealization"),
+    Node("price_up_win_rate_diff", 'automated_tuning_info.price_up_min_win_rate_diff if automated_tuning_info is not None else 0.0', "priceUpMinWinRateDiff"),
+    Node("price_up_sig_level", 'automated_tuning_info.price_up_sig_level if automated_tuning_info is not None else 0.0', "priceUpSigLevel"),
+    Node("price_up_power", 'automated_tuning_info.price_up_power if automated_tuning_info is not None else 0.0', "priceUpPower"),
+    Node("price_up_obs_req", 'automated_tuning_info.price_up_obs_req if automated_tuning_info is not None else 0.0', "priceUpObsReq"),
+    Node("price_down_active_flag", 'automated_tuning_info.price_down_active_flag if automated_tuning_info is not None else "FALSE"', "priceDownActiveFlag"),
+    Node("price_down_measurement_level", 'automated_tuning_info.price_down_measurement_level if automated_tuning_info is not None else ""', "priceDownMeasurementLevel"),
+    Node("price_down_concentration", 'automated_tuning_info.price_down_concentration if automated_tuning_info is not None else 0.0', "priceDownConcentration"),
+    Node("price_down_magnitude", 'automated_tuning_info.price_down_magnitude if automated_tuning_info is not None else 0.0', "priceDownMagnitude"),
+    Node("price_down_realization", 'automated_tuning_info.price_down_realization if automated_tuning_info is not None else 0.0', "priceDownRealization"),
+    Node("price_down_win_rate_diff", 'automated_tuning_info.price_down_min_win_rate_diff if automated_tuning_info is not None else 0.0', "priceDownMinWinRateDiff"),
+    Node("price_down_sig_level", 'automated_tuning_info.price_down_sig_level if automated_tuning_info is not None else 0.0', "priceDownSigLevel"),
+    Node("price_down_power", 'automated_tuning_info.price_down_power if automated_tuning_info is not None else 0.0', "priceDownPower"),
+    Node("price_down_obs_req", 'automated_tuning_info.price_down_obs_req if automated_tuning_info is not None else 0.0', "priceDownObsReq"),
+    Node("monday_date", 'clock.monday_date', "mondayDate"),
+    Node("automated_tuning_hash_values", '''f"{customer_id}|{inputs.get('isroffice')}|{bell_wether_material}|{monday_date}|{salt_value}"''', "automatedTuningHashValues"),
+    Node("partition_value", 'partition_values.get(automated_tuning_hash_values, monday_date)', "partitionValue"),
+    Node("control_group_concentration", '1 - (price_up_concentration + price_down_concentration)', "controlGroupConcentration"),
+    Node("automated_tuning_test_group_raw", '"A" if partition_value <= control_group_concentration else "B" if partition_value <= control_group_concentration + price_up_concentration else "C"', "automatedTuningTestGroupRaw"),
+    Node("automated_tuning_test_group", 'inputs.get("automatedtuninggroupoverride") if inputs.get("automatedtuninggroupoverride") != "" else "A" if is_test_customer else automated_tuning_test_group_raw', "automatedTuningTestGroup"),
+    Node("price_up_active_flag_final", 'price_up_active_flag if inputs.get("automatedtuninggroupoverride") == "" else inputs.get("automatedtuninggroupoverride").upper()', "priceUpActiveFlagFinal"),
+    Node("price_down_active_flag_final", 'price_down_active_flag if inputs.get("automatedtuninggroupoverride") == "" else inputs.get("automatedtuninggroupoverride").upper()', "priceDownActiveFlagFinal"),
+    Node("price_up_magnitude_with_flag", 'price_up_magnitude if price_up_active_flag_final.casefold() == "TRUE".casefold() else 0.0', "priceUpMagnitudeWithFlag"),
+    Node("price_down_magnitude_with_flag", 'price_down_magnitude if price_down_active_flag_final.casefold() == "TRUE".casefold() else 0.0', "priceDownMagnitudeWithFlag"),
+    Node("automated_tuning_magnitude", '0.0 if automated_tuning_test_group == "A" else price_up_magnitude_with_flag if automated_tuning_test_group == "B" else price_up_magnitude_with_flag', "automatedTuningMagnitude"),
+    Node("rec_price_with_automated_tuning", 'rec_price_pp_with_bw_rating_adder * (1 + automated_tuning_magnitude)', "recPriceWithAutomatedTuning"),
+    Node("recommended_price_per_pound_value", 'round(rec_price_with_automated_tuning + price_adjustment, 4)', "recommendedPricePerPoundValue"),
+    Node("recommended_price_per_pound", 'str(recommended_price_per_pound_value)', "recommendedPricePerPound"),
+    # Every class is priced off the 200 pound class customer price and non material cost
+    Node("rec_price_wcs", 'recommended_price_ladder(inputs.get("rcmapping"), inputs.get("multimarket"), cust_price_weight_class_200, non_mat_cost_weight_class_200, cust_service_percent_adder, cust_service_dollar_adder, floor_price, automated_tuning_magnitude, bw_rating_adder, price_adjustment)')
+] + [
+    Node(f"rec_price_wc_{name}", f'rec_price_wcs[{position}]', f"recPriceWC{name}")
+    for (position, name) in enumerate(WEIGHT_CLASS_NAMES)
+] + [
+    Node("margin", 'recommended_price_per_pound_value - total_cost_per_pound', "margin"),
+    Node("margin_percent", 'margin / recommended_price_per_pound_value', "marginPercent", check=True)
+]
+
+# Output name and the node it is read from, a node with a schema is dumped with it
+QUOTE_LINE_SAP_OUTPUTS = [
+    ("recommendedPricePerPound", "recommended_price_per_pound"),
+    ("totalCostPerPound", "total_cost_per_pound"),
+    ("redMarginThreshold", "red_margin_threshold"),
+    ("yellowMarginThreshold", "yellow_margin_threshold"),
+    ("exchangeRate", "exchange_rate"),
+    ("freightChargePerPound", "freight_charge_per_pound")
+] + [(f"recPriceWC{name}", f"rec_price_wc_{name}") for name in WEIGHT_CLASS_NAMES] + [
+    ("itemNumber", "item_number")
+]
+
+# Outputs added in debug mode
+QUOTE_LINE_SAP_DEBUG_OUTPUTS = [
+    ("adjustedNetWeightOfSalesItem", "adjusted_net_weight_of_sales_item"),
+    ("adjustedBundles", "adjusted_bundles"),
+    ("productInfo", "product_info"),
+    ("costAdjustmentTestLookupKey", "cost_adjustment_lookup_key"),
+    ("costAdjustmentTestInfo", "cost_adjustment_test_info"),
+    ("materialClassification", "material_classification"),
+    ("rcMapping", "rc_mapping"),
+    ("multiMarket", "multi_market"),
+    ("customerSalesOffice", "customer_sales_office"),
+    ("sapInd", "sap_ind"),
+    ("isrOffice", "isr_office"),
+    ("dsoadder", "dso_adder"),
+    ("productKey", "product_key"),
+    ("bellWetherMaterial", "bell_wether_material"),
+    ("bellwetherBaseCost", "bell_wether_base_cost"),
+    ("index", "index"),
+    ("exchangeRateInfo", "exchange_rate_info"),
+    ("product", "product"),
+    ("form", "form"),
+    ("marketMovementAdder", "market_movement_adder"),
+    ("percentAdjustment", "percent_adjustment"),
+    ("dollarAdjustment", "dollar_adjustment"),
+    ("modeledCostRaw", "modeled_cost_raw"),
+    ("costAdjustmentSaltValue", "cost_adjustment_salt_value"),
+    ("costAdjustmentHashFields", "cost_adjustment_hash_fields"),
+    ("costAdjustmentHashValues", "cost_adjustment_hash_values"),
+    ("costAdjPartitionValue", "cost_adj_partition_value"),
+    ("costAdjustmentTestGroupNum", "cost_adjustment_test_group_num"),
+    ("costAdjustmentTestGroup", "cost_adjustment_test_group"),
+    ("costAdjustmentPercentRaw", "cost_adjustment_percent_raw"),
+    ("costAdjustmentPercent", "cost_adjustment_percent"),
+    ("modeledCost", "modeled_cost"),
+    ("replacementCost", "replacement_cost"),
+    ("mtpKey", "mtp_key"),
+    ("millToPlantFreight", "mill_to_plant_freight"),
+    ("replacementCostWithMTP", "replacement_cost_with_mtp"),
+    ("idoKey", "ido_key"),
+    ("idoPerPound", "ido_per_pound"),
+    ("idoMin", "ido_min"),
+    ("idoMax", "ido_max"),
+    ("idoPerPoundMinConstrained", "ido_per_pound_min_constrained"),
+    ("idoPerPoundMaxConstrained", "ido_per_pound_max_constrained"),
+    ("calculationQuotePounds", "calculation_quote_pounds"),
+    ("weightClass", "weight_class"),
+    ("targetMarginKey", "target_margin_key"),
+    ("baseTargetMarginRaw", "base_target_margin_raw"),
+    ("baseTargetMargin", "base_target_margin"),
+    ("targetMarginAdjustmentKey", "target_margin_adjustment_key"),
+    ("targetMarginAdjustment", "target_margin_adjustment"),
+    ("rawTargetMargin", "raw_target_margin"),
+    ("targetMargin", "target_margin"),
+    ("basePricePerPound", "base_price_per_pound"),
+    ("clCodeKey", "cl_code_key"),
+    ("clCode", "cl_code"),
+    ("clDiscount", "cl_discount"),
+    ("customerPricePerPound", "customer_price_per_pound")
+] + [(f"custPriceWeightClass{name}", f"cust_price_weight_class_{name}") for name in WEIGHT_CLASS_NAMES] + [
+    ("oghShipPlan", "ogh_ship_plant"),
+    ("overheadGroupKey", "overhead_group_key"),
+    ("materialSalesOfficeKey", "material_sales_office_key"),
+    ("priceAdjustmentValue", "price_adjustment_value"),
+    ("priceAdjustment", "price_adjustment"),
+    ("totalTons", "total_tons"),
+    ("sapFreightKey", "sap_freight_key"),
+    ("shipZoneKey", "ship_zone_key"),
+    ("zone", "zone"),
+    ("as400FreightKey", "as400_freight_key"),
+    ("freightDefaultsKey", "freight_defaults_key"),
+    ("freightEscalationLevel", "freight_escalation_level"),
+    ("minimumFreightCharge", "minimum_freight_charge"),
+    ("rawFreightCharge", "raw_freight_charge"),
+    ("freightChargePerPound ", "freight_charge_per_pound"),
+    ("laborCostPerPound", "labor_cost_per_pound"),
+    ("smallOrderAdder", "small_order_adder"),
+    ("floorPriceKey", "floor_price_key"),
+    ("floorPrice", "floor_price"),
+    ("bwRatingKey", "bw_rating_key"),
+    ("bwRating", "bw_rating"),
+    ("bwRatingAdder", "bw_rating_adder"),
+    ("unitHandlingCost", "unit_handling_cost"),
+    ("handlingCostPerPound", "handling_cost_per_pound"),
+    ("handlingCostPerPoundWC", "handling_cost_per_pound_wc"),
+    ("perTonPackagingCost", "per_ton_packaging_cost"),
+    ("packagingCostPerPound", "packaging_cost_per_pound"),
+    ("perTonStockingCost", "per_ton_stocking_cost"),
+    ("stockingCostPerPound", "stocking_cost_per_pound"),
+    ("orderCostPerPound", "order_cost_per_pound"),
+    ("orderCostPerPoundWC", "order_cost_per_pound_wc")
+] + [(f"orderCostWeightClass{name}", f"order_cost_weight_class_{name}") for name in WEIGHT_CLASS_NAMES] + [
+    ("totalNonMaterialCost", "total_non_material_cost")
+] + [(f"nonMatCostWeightClass{name}", f"non_mat_cost_weight_class_{name}") for name in WEIGHT_CLASS_NAMES] + [
+    ("recPricePPWithOrderAdder", "rec_price_pp_with_order_adder"),
+    ("custServiceDollarAdder", "cust_service_dollar_adder"),
+    ("custServiceDollarAdderPP", "cust_service_dollar_adder_pp"),
+    ("custServicePercentAdder", "cust_service_percent_adder"),
+    ("recPricePPCustServiceAdder", "rec_price_pp_cust_service_adder"),
+    ("recPricePPWithPriceFloor", "rec_price_pp_with_price_floor"),
+    ("recPricePPWithBwRatingAdder", "rec_price_pp_with_bw_rating_adder"),
+    ("condensedForm", "condensed_form"),
+    ("automatedTuningLookupKey", "automated_tuning_lookup_key"),
+    ("automatedTuningInfo", "automated_tuning_info"),
+    ("locationGroupLookupKey", "location_group_lookup_key"),
+    ("locationGroupInfo", "location_group_info"),
+    ("locationGroup", "location_group"),
+    ("saltValue", "salt_value"),
+    ("priceUpActiveFlag", "price_up_active_flag"),
+    ("priceUpMeasurementLevel", "price_up_measurement_level"),
+    ("priceUpConcentration", "price_up_concentration"),
+    ("priceUpMagnitude", "price_up_magnitude"),
+    ("priceUpRealization", "price_up_realization"),
+    ("priceUpMinWinRateDiff", "price_up_win_rate_diff"),
+    ("priceUpSigLevel", "price_up_sig_level"),
+    ("priceUpPower", "price_up_power"),
+    ("priceUpObsReq", "price_up_obs_req"),
+    ("priceDownActiveFlag", "price_down_active_flag"),
+    ("priceDownMeasurementLevel", "price_down_measurement_level"),
+    ("priceDownConcentration", "price_down_concentration"),
+    ("priceDownMagnitude", "price_down_magnitude"),
+    ("priceDownRealization", "price_down_realization"),
+    ("priceDownMinWinRateDiff", "price_down_win_rate_diff"),
+    ("priceDownSigLevel", "price_down_sig_level"),
+    ("priceDownPower", "price_down_power"),
+    ("priceDownObsReq", "price_down_obs_req"),
+    ("mondayDate", "monday_date"),
+    ("automatedTuningHashValues", "automated_tuning_hash_values"),
+    ("partitionValue", "partition_value"),
+    ("controlGroupConcentration", "control_group_concentration"),
+    ("automatedTuningTestGroupRaw", "automated_tuning_test_group_raw"),
+    ("automatedTuningTestGroup", "automated_tuning_test_group"),
+    ("priceUpActiveFlagFinal", "price_up_active_flag_final"),
+    ("priceDownActiveFlagFinal", "price_down_active_flag_final"),
+    ("priceUpMagnitudeWithFlag", "price_up_magnitude_with_flag"),
+    ("priceDownMagnitudeWithFlag", "price_down_magnitude_with_flag"),
+    ("automatedTuningMagnitude", "automated_tuning_magnitude"),
+    ("recPriceWithAutomatedTuning", "rec_price_with_automated_tuning"),
+    ("recommendedPricePerPoundValue", "recommended_price_per_pound_value"),
+    ("margin", "margin"),
+    ("marginPercent", "margin_percent"),
+    ("material", "material"),
+    ("shipPlant", "ship_plant"),
+    ("stockPlant", "stock_plant"),
+    ("weight", "weight"),
+    ("netWeightOfSalesItem", "net_weight_of_sales_item"),
+    ("opCode", "op_code"),
+    ("netWeightPerFinishedPiece", "net_weight_per_finished_piece"),
+    ("bundles", "bundles"),
+    ("customerid", "customer_id"),
+    ("isrname", "isr_name"),
+    ("isTestCustomer", "is_test_customer"),
+    ("shiptostate", "ship_to_state"),
+    ("shiptozipcode", "ship_to_zip_code"),
+    ("independentcalculationflag", "independent_calculation_flag"),
+    ("totalQuotePounds", "total_quote_pounds"),
+    ("southSkidChargeWeight", "south_skid_charge_weight"),
+    ("southSkidCharge ", "south_skid_charge"),
+    ("materialDescription ", "material_description")
+]
+
+# Nodes the outputs are read from
+QUOTE_LINE_SAP_TARGETS = [name for (output_name, name) in QUOTE_LINE_SAP_OUTPUTS]
+
+# The SAP and non SAP paths are compiled apart, each for its casefolded sapind
+QUOTE_LINE_SAP_VARIANTS = {sap_ind: {'sap_ind.casefold()': sap_ind, 'inputs.get("sapind").casefold()': sap_ind} for sap_ind in ["y", "n"]}
+
+QUOTE_LINE_SAP_GRAPH = CalculationGraph(QUOTE_LINE_SAP_NODES, QUOTE_LINE_SAP_SOURCES, QUOTE_LINE_SAP_NAMESPACE)
+
+
+@lru_cache(maxsize=None)
+def quote_line_sap_plan(debug_mode: bool, traced: bool) -> tuple[CalculationStep, ...]:
+    """Steps of a quote line that reads the outputs, the debug outputs in debug mode and every traced node when traced"""
+    targets = list(QUOTE_LINE_SAP_TARGETS)
+
+    if debug_mode:
+        targets.extend(name for (output_name, name) in QUOTE_LINE_SAP_DEBUG_OUTPUTS)
+
+    if traced:
+        targets.extend(QUOTE_LINE_SAP_GRAPH.traced())
+
+    return QUOTE_LINE_SAP_GRAPH.plan(targets)
+
+
+@lru_cache(maxsize=None)
+def quote_line_sap_calculations() -> tuple[CalculationModel, ...]:
+    """The nodes as the calculations of the quoteLineSAP model, a calculation an output reads is included in the results"""
+    calculations = list()
+
+    for node in QUOTE_LINE_SAP_NODES:
+        calculation = CalculationModel()
+        calculation.output_name = node.name
+        calculation.function = node.formula
+        calculation.include_in_results = node.name in QUOTE_LINE_SAP_TARGETS
+        calculation.parameters = list(QUOTE_LINE_SAP_GRAPH.dependencies[node.name])
+        calculations.append(calculation)
+
+    return tuple(calculations)
@@ -1,7 +1,7 @@
 import datetime
 import json
 from http import HTTPStatus
-from typing import Any
+from typing import Any, Callable, Optional
 from uuid import uuid4
 
 import requests as requests
@@ -12,8 +12,10 @@ from api.exceptions.breakerror import BreakError
 from api.exceptions.dividebyzeroerror import DivideByZeroError
 from api.exceptions.maskederror import MaskedError
 from api.service.calculationhelper import CalculationHelper
+from api.service.calculationtrace import CalculationTrace, trace_level
 from api.service.modelservice import ModelService
 from api.service.quotelinesap import QuoteLineSap
+from api.service.quotelinebatch import QuoteLineBatch
 from config import Config
 from api.exceptions.symbolnotfounderror import SymbolNotFoundError
 from api.service.interfaces.calcengineinterface import CalcEngineInterface
@@ -24,8 +26,8 @@ from api.model.loginformation import LogInformationModel
 
 
 class RecommendedPrice(CalcEngineInterface):
-    def __init__(self, lookup_service: LookupServiceInterface, queued_logger: QueuedLoggerInterface, configuration: Config, quote_line_sap: CalcEngineInterface):
-        self._lookup_service = lookup_service
+    def __init__(self, current_lookup_service: Callable[[], LookupServiceInterface], queued_logger: QueuedLoggerInterface, configuration: Config, quote_line_sap: QuoteLineSap):
+        self._current_lookup_service = current_lookup_service
         self._config = configuration
         self._quote_line_sap = quote_line_sap
         self._disable_logging = configuration.disable_Logging
@@ -33,6 +35,8 @@ class RecommendedPrice(CalcEngineInterface):
         self._base_calculation_endpoint = configuration.base_calculation_endpoint
         self._fan_out = eval(configuration.fan_out)
         self._queued_logger = queued_logger
+        self._calculation_trace = trace_level(configuration.calculation_trace)
+        self._model_service = ModelService()
 
         if self._base_calculation_endpoint == "":
             self._base_calculation_endpoint = f"http://ccs.{self._namespace}.svc.cluster.local"
@@ -76,17 +80,18 @@ class RecommendedPrice(CalcEngineInterface):
 
             raise MaskedError(error_info, json_response.get("error").get("description"))
 
-    def perform_calculations(self, log_information: LogInformationModel, request_client_id: str, client_id: str, inputs: CaseInsensitiveDict[str, Any], calculation_inputs_to_return_in_output: set, calculation_id: str, debug_mode: bool, original_payload: CaseInsensitiveDict, token: str) -> dict[str, Any]:
+    def perform_calculations(self, log_information: LogInformationModel, request_client_id: str, client_id: str, inputs: CaseInsensitiveDict[str, Any], calculation_inputs_to_return_in_output: set, calculation_id: str, debug_mode: bool, original_payload: CaseInsensitiveDict, token: str, lookup_service: Optional[LookupServiceInterface] = None) -> dict[str, Any]:
+        if lookup_service is None:
+            lookup_service = self._current_lookup_service()
+
         error_message = "errorMessage"
         calculation_results = {}
-        intermediate_calcs = {}
+        intermediate_calcs = CalculationTrace("full" if debug_mode else self._calculation_trace)
         json_output = {}
 
         columns_to_return = ["quoteLines"]
 
         try:
-            model_service = ModelService()
-
             total_quote_pounds = sum(map(lambda ql: float(ql["weight"]), inputs["quotelines"]))
             intermediate_calcs["totalQuotePounds"] = total_quote_pounds
 
@@ -96,15 +101,15 @@ class RecommendedPrice(CalcEngineInterface):
             customer_with_office_key = f"{customer_id}|{sales_office}"
             intermediate_calcs["customerWithOfficeKey"] = customer_with_office_key
 
-            customer_with_office_info = None if sales_office == "NA" else self._lookup_service.lookup_customer(client_id, "customers", customer_with_office_key, None)
+            customer_with_office_info = None if sales_office == "NA" else lookup_service.lookup_customer(client_id, "customers", customer_with_office_key, None)
             if customer_with_office_info is not None:
                 intermediate_calcs["customerWithOfficeInfo"] = customer_with_office_info
 
-            customer_without_office_info = self._lookup_service.get_customer_without_office(customer_id) if sales_office == "NA" else None
+            customer_without_office_info = lookup_service.get_customer_without_office(customer_id) if sales_office == "NA" else None
             if customer_without_office_info is not None:
                 intermediate_calcs["customerWithoutOfficeInfo"] = customer_without_office_info
 
-            default_office_info = self._lookup_service.get_default_office(sales_office) if customer_with_office_info is None and customer_without_office_info is None else None
+            default_office_info = lookup_service.get_default_office(sales_office) if customer_with_office_info is None and customer_without_office_info is None else None
             if default_office_info is not None:
                 intermediate_calcs["defaultOfficeInfo"] = default_office_info
 
@@ -173,7 +178,7 @@ class RecommendedPrice(CalcEngineInterface):
 
                 quote_line_input.append(quote_line)
 
-            quote_line_sap_model = model_service.get_model("quotelinesap", debug_mode)
+            quote_line_sap_model = self._model_service.get_model("quotelinesap", debug_mode)
 
             quote_lines = list()
 
@@ -183,12 +188,8 @@ class RecommendedPrice(CalcEngineInterface):
 
                     quote_lines.append(output)
             else:
-                quote_line_sap = QuoteLineSap(self._lookup_service, None, self._config)
-
-                for line_input in quote_line_input:
-                    output = quote_line_sap.execute_model(request_client_id, client_id, quote_line_sap_model, line_input, calculation_id, token)
-
-                    quote_lines.append(output)
+                # The quote is priced as one batch, every line reads its lookups from rows fetched once for the whole quote
+                quote_lines = self._quote_line_sap.execute_batch(request_client_id, client_id, quote_line_sap_model, QuoteLineBatch.from_lines(quote_line_input), calculation_id, token, lookup_service)
 
             intermediate_calcs["quoteLines"] = quote_lines
             calculation_results["quoteLines"] = quote_lines
@@ -217,7 +218,7 @@ class RecommendedPrice(CalcEngineInterface):
 
         return json_output
 
-    def execute_model(self, request_client_id: str, client_id: str, model: ModelModel, original_payload: CaseInsensitiveDict[str, Any], calculation_id: str, token: str) -> dict[str, Any]:
+    def execute_model(self, request_client_id: str, client_id: str, model: ModelModel, original_payload: CaseInsensitiveDict[str, Any], calculation_id: str, token: str, lookup_service: Optional[LookupServiceInterface] = None) -> dict[str, Any]:
         json_output = {}
 
         log_information = LogInformationModel()
@@ -285,7 +286,7 @@ class RecommendedPrice(CalcEngineInterface):
 
             log_information.calculation_inputs = dict(inputs)
 
-            calculation_output = self.perform_calculations(log_information, request_client_id, client_id, inputs, calculation_inputs_to_return_in_output, calculation_id, model.debug_mode, original_payload, token)
+            calculation_output = self.perform_calculations(log_information, request_client_id, client_id, inputs, calculation_inputs_to_return_in_output, calculation_id, model.debug_mode, original_payload, token, lookup_service)
 
             json_output = json_output | calculation_output
 
@@ -0,0 +1,227 @@
+import threading
+from abc import ABC
+from typing import Optional, Any, Callable
+
+from api.model.automatedtuning import AutomatedTuningModel
+from api.model.bwrating import BwRatingModel
+from api.model.clcode import ClCodeModel
+from api.model.costadjustment import CostAdjustmentModel
+from api.model.customer import CustomerModel
+from api.model.freightdefault import FreightDefaultModel
+from api.model.ido import IdoModel
+from api.model.linecontext import LineContextModel
+from api.model.linecontextkeys import LineContextKeysModel
+from api.model.locationgroup import LocationGroupModel
+from api.model.materialsalesoffice import MaterialSalesOfficeModel
+from api.model.milltoplantfreight import MillToPlantFreightModel
+from api.model.opcode import OpCodeModel
+from api.model.packagingcost import PackagingCostModel
+from api.model.product import ProductModel
+from api.model.sapfreight import SapFreightModel
+from api.model.shipzone import ShipZoneModel
+from api.model.sobwfloorprice import SoBwFloorPriceModel
+from api.model.southfreight import SouthFreightModel
+from api.model.southskidcharge import SouthSkidChargeModel
+from api.model.tmadjustment import TmAdjustmentModel
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from api.service.linecontext import compose_line_context
+from api.service.sqllitelookupservice import normalize_key
+
+
+class RequestLookupService(LookupServiceInterface, ABC):
+    """Memoizes every lookup of one request, misses included, rows can also be fetched up front by the *_many methods"""
+
+    def __init__(self, lookup_service: LookupServiceInterface):
+        self._lookup_service = lookup_service
+        self._results = dict()
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.saved_queries = 0
+
+    @property
+    def source(self) -> LookupServiceInterface:
+        """The lookup service the lookups are memoized from"""
+        return self._lookup_service
+
+    def _memoized(self, store_id: str, key: Any, lookup: Callable[[], Any]) -> Any:
+        store = self._results.setdefault(store_id, dict())
+
+        if key in store:
+            self.saved_queries += 1
+
+            return store[key]
+
+        value = lookup()
+
+        self.queries += 1
+        store[key] = value
+
+        return value
+
+    def _lookup(self, table_id: str, label: str, lookup: Callable[[], Any]) -> Any:
+        return self._memoized(table_id, normalize_key(label), lookup)
+
+    def _lookup_many(self, table_id: str, labels: list[str], lookup_many: Callable[[list[str]], dict[str, Any]]) -> dict[str, Any]:
+        table = self._results.setdefault(table_id, dict())
+        missing_labels = [label for label in labels if normalize_key(label) not in table]
+
+        if len(missing_labels) > 0:
+            found = lookup_many(missing_labels)
+
+            # The *_many methods of different tables may run on several threads at once
+            with self._lock:
+                self.queries += 1
+
+            # Keys that were not found are stored as None so the single lookup does not query them again
+            for label in missing_labels:
+                key = normalize_key(label)
+                table[key] = found.get(key)
+
+        results = dict()
+
+        for label in labels:
+            key = normalize_key(label)
+
+            if table[key] is not None:
+                results[key] = table[key]
+
+        return results
+
+    def lookup_customer(self, client_id: str, table_id: str, label: str, default_value: Optional[CustomerModel]) -> CustomerModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_customer(client_id, table_id, label, default_value))
+
+    def lookup_product(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_product(client_id, table_id, label, default_value))
+
+    def lookup_packaging_cost(self, client_id: str, table_id: str, label: str, default_value: Optional[PackagingCostModel]) -> PackagingCostModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_packaging_cost(client_id, table_id, label, default_value))
+
+    def lookup_mill_to_plant_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[MillToPlantFreightModel]) -> MillToPlantFreightModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_mill_to_plant_freight(client_id, table_id, label, default_value))
+
+    def lookup_tm_adjustment(self, client_id: str, table_id: str, label: str, default_value: Optional[TmAdjustmentModel]) -> TmAdjustmentModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_tm_adjustment(client_id, table_id, label, default_value))
+
+    def lookup_material_sales_office(self, client_id: str, table_id: str, label: str, default_value: Optional[MaterialSalesOfficeModel]) -> MaterialSalesOfficeModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_material_sales_office(client_id, table_id, label, default_value))
+
+    def lookup_sap_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[SapFreightModel]) -> SapFreightModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_sap_freight(client_id, table_id, label, default_value))
+
+    def lookup_south_skid_charge(self, client_id: str, table_id: str, label: str, default_value: Optional[SouthSkidChargeModel]) -> SouthSkidChargeModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_south_skid_charge(client_id, table_id, label, default_value))
+
+    def lookup_south_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[SouthFreightModel]) -> SouthFreightModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_south_freight(client_id, table_id, label, default_value))
+
+    def lookup_ship_zone(self, client_id: str, table_id: str, label: str, default_value: Optional[ShipZoneModel]) -> ShipZoneModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_ship_zone(client_id, table_id, label, default_value))
+
+    def lookup_so_bw_floor_price(self, client_id: str, table_id: str, label: str, default_value: Optional[SoBwFloorPriceModel]) -> SoBwFloorPriceModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_so_bw_floor_price(client_id, table_id, label, default_value))
+
+    def lookup_bw_rating(self, client_id: str, table_id: str, label: str, default_value: Optional[BwRatingModel]) -> BwRatingModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_bw_rating(client_id, table_id, label, default_value))
+
+    def lookup_freight_default(self, client_id: str, table_id: str, label: str, default_value: Optional[FreightDefaultModel]) -> FreightDefaultModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_freight_default(client_id, table_id, label, default_value))
+
+    def lookup_target_margin(self, client_id: str, table_id: str, label: str, default_value: Optional[float]) -> float:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_target_margin(client_id, table_id, label, default_value))
+
+    def lookup_cl_code(self, client_id: str, table_id: str, label: str, default_value: Optional[ClCodeModel]) -> ClCodeModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_cl_code(client_id, table_id, label, default_value))
+
+    def lookup_ido(self, client_id: str, table_id: str, label: str, default_value: Optional[IdoModel]) -> IdoModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_ido(client_id, table_id, label, default_value))
+
+    def lookup_automated_tuning(self, client_id: str, table_id: str, label: str, default_value: Optional[AutomatedTuningModel]) -> AutomatedTuningModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_automated_tuning(client_id, table_id, label, default_value))
+
+    def lookup_location_group(self, client_id: str, table_id: str, label: str, default_value: Optional[LocationGroupModel]) -> LocationGroupModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_location_group(client_id, table_id, label, default_value))
+
+    def lookup_cost_adjustment(self, client_id: str, table_id: str, label: str, default_value: Optional[CostAdjustmentModel]) -> CostAdjustmentModel:
+        return self._lookup(table_id, label, lambda: self._lookup_service.lookup_cost_adjustment(client_id, table_id, label, default_value))
+
+    def lookup_op_code(self, op_code: str, adjusted_net_weight_of_sales_item: float, net_weight_of_sales_item: float) -> OpCodeModel:
+        key = (op_code, adjusted_net_weight_of_sales_item, net_weight_of_sales_item)
+
+        return self._memoized("opcodes", key, lambda: self._lookup_service.lookup_op_code(op_code, adjusted_net_weight_of_sales_item, net_weight_of_sales_item))
+
+    def bucketed_lookup(self, client_id: str, table_id: str, val: float, column: str) -> str:
+        return self._memoized(f"{table_id}.{column}", val, lambda: self._lookup_service.bucketed_lookup(client_id, table_id, val, column))
+
+    def bucketed_lookup_many(self, client_id: str, table_id: str, vals: list[float], column: str) -> list[str]:
+        return self._lookup_service.bucketed_lookup_many(client_id, table_id, vals, column)
+
+    def get_customer_without_office(self, customer_number: str) -> CustomerModel:
+        return self._lookup("customers.customernumber", customer_number, lambda: self._lookup_service.get_customer_without_office(customer_number))
+
+    def get_default_office(self, customer_sales_office: str) -> CustomerModel:
+        return self._lookup("customers.customersalesoffice", customer_sales_office, lambda: self._lookup_service.get_default_office(customer_sales_office))
+
+    def lookup_exchange_rate(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
+        # Matched on rcMapping rather than uniqueid, so it is kept apart from the products
+        return self._lookup(f"{table_id}.rcmapping", label, lambda: self._lookup_service.lookup_exchange_rate(client_id, table_id, label, default_value))
+
+    def lookup_product_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ProductModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_product_many(client_id, table_id, missing_labels))
+
+    def lookup_packaging_cost_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, PackagingCostModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_packaging_cost_many(client_id, table_id, missing_labels))
+
+    def lookup_mill_to_plant_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MillToPlantFreightModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_mill_to_plant_freight_many(client_id, table_id, missing_labels))
+
+    def lookup_tm_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, TmAdjustmentModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_tm_adjustment_many(client_id, table_id, missing_labels))
+
+    def lookup_material_sales_office_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MaterialSalesOfficeModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_material_sales_office_many(client_id, table_id, missing_labels))
+
+    def lookup_sap_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SapFreightModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_sap_freight_many(client_id, table_id, missing_labels))
+
+    def lookup_south_skid_charge_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthSkidChargeModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_south_skid_charge_many(client_id, table_id, missing_labels))
+
+    def lookup_south_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthFreightModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_south_freight_many(client_id, table_id, missing_labels))
+
+    def lookup_ship_zone_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ShipZoneModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_ship_zone_many(client_id, table_id, missing_labels))
+
+    def lookup_so_bw_floor_price_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SoBwFloorPriceModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_so_bw_floor_price_many(client_id, table_id, missing_labels))
+
+    def lookup_bw_rating_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, BwRatingModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_bw_rating_many(client_id, table_id, missing_labels))
+
+    def lookup_freight_default_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, FreightDefaultModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_freight_default_many(client_id, table_id, missing_labels))
+
+    def lookup_target_margin_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, float]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_target_margin_many(client_id, table_id, missing_labels))
+
+    def lookup_cl_code_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ClCodeModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_cl_code_many(client_id, table_id, missing_labels))
+
+    def lookup_ido_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, IdoModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_ido_many(client_id, table_id, missing_labels))
+
+    def lookup_automated_tuning_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, AutomatedTuningModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_automated_tuning_many(client_id, table_id, missing_labels))
+
+    def lookup_location_group_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, LocationGroupModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_location_group_many(client_id, table_id, missing_labels))
+
+    def lookup_cost_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, CostAdjustmentModel]:
+        return self._lookup_many(table_id, labels, lambda missing_labels: self._lookup_service.lookup_cost_adjustment_many(client_id, table_id, missing_labels))
+
+    def lookup_line_context(self, client_id: str, keys: LineContextKeysModel) -> LineContextModel:
+        # Lines fetched up front by prefetch_lookups are put together from the memoized rows instead of another query
+        if normalize_key(keys.product_key) in self._results.get("products", dict()) and normalize_key(keys.cost_adjustment_key) in self._results.get("cost_adjustment_test_materials", dict()):
+            return compose_line_context(self, client_id, keys)
+
+        return self._memoized("linecontexts", keys, lambda: self._lookup_service.lookup_line_context(client_id, keys))
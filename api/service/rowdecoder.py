@@ -0,0 +1,59 @@
+import sqlite3
+from operator import itemgetter
+from typing import Any, Callable, Optional, NamedTuple
+
+
+def _converted(position: int, convert: Callable[[Any], Any]) -> Callable[[tuple], Any]:
+    return lambda row: convert(row[position])
+
+
+def _constant(value: Any) -> Callable[[tuple], Any]:
+    return lambda row: value
+
+
+class RowDecoder:
+    """Builds a tuple backed model from a row, column positions are resolved once per query shape instead of by name per row"""
+
+    def __init__(self, model: type[NamedTuple], columns: dict[str, tuple[str, Optional[Callable[[Any], Any]]]]):
+        self._model = model
+        self._columns = columns
+        self._decoders = dict()
+
+    def bind(self, column_names: tuple[str, ...]) -> Callable[[tuple], Any]:
+        decoder = self._decoders.get(column_names)
+
+        if decoder is None:
+            decoder = self._compile(column_names)
+
+            self._decoders[column_names] = decoder
+
+        return decoder
+
+    def for_cursor(self, cursor: sqlite3.Cursor) -> Callable[[tuple], Any]:
+        return self.bind(tuple(column[0] for column in cursor.description))
+
+    def _compile(self, column_names: tuple[str, ...]) -> Callable[[tuple], Any]:
+        # Like sqlite3.Row, names match case insensitively and the first column with a name wins
+        positions = dict()
+
+        for (position, column_name) in enumerate(column_names):
+            positions.setdefault(column_name.casefold(), position)
+
+        getters = list()
+
+        for field in self._model._fields:
+            if field not in self._columns:
+                getters.append(_constant(self._model._field_defaults[field]))
+                continue
+
+            (column_name, convert) = self._columns[field]
+            position = positions[column_name.casefold()]
+
+            getters.append(itemgetter(position) if convert is None else _converted(position, convert))
+
+        make = self._model._make
+
+        return lambda row: make([getter(row) for getter in getters])
+
+    def __call__(self, row: sqlite3.Row) -> Any:
+        return self.bind(tuple(row.keys()))(row)
@@ -0,0 +1,78 @@
+from typing import Any, Optional
+
+from api.service.cachinglookupservice import CachingLookupService
+from api.service.inmemorylookupservice import InMemoryLookupService
+from api.service.instrumentedlookupservice import InstrumentedLookupService
+from api.service.interfaces.calcengineinterface import CalcEngineInterface
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from api.service.lookupindexprovisioner import check_lookup_indexes
+from api.service.lookuptelemetry import LookupTelemetry
+from api.service.mappedlookupservice import MappedLookupService
+from api.service.modelservice import ModelService
+from api.service.queuedlogger import QueuedLogger
+from api.service.quotelinesap import QuoteLineSap
+from api.service.recommendedprice import RecommendedPrice
+from api.service.snapshotmanager import SnapshotManager
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from config import Config
+
+
+def create_lookup_service(configuration: Config, telemetry: Optional[LookupTelemetry] = None) -> LookupServiceInterface:
+    lookup_service_type = configuration.lookup_service_type.casefold()
+
+    if lookup_service_type == "memory":
+        lookup_service = InMemoryLookupService(configuration)
+    elif lookup_service_type == "mapped":
+        lookup_service = MappedLookupService(configuration)
+    else:
+        check_lookup_indexes(configuration)
+
+        lookup_service = SqlLiteLookupService(configuration)
+
+    # Telemetry sits under the result cache, so it records the work the tables do rather than cache hits
+    if telemetry is not None and configuration.lookup_telemetry:
+        lookup_service = InstrumentedLookupService(lookup_service, telemetry)
+
+    if lookup_service_type == "memory":
+        return lookup_service
+
+    max_entries = int(configuration.lookup_result_cache_entries)
+
+    if max_entries > 0:
+        return CachingLookupService(lookup_service, max_entries, float(configuration.lookup_result_cache_ttl))
+
+    return lookup_service
+
+
+class ServiceRegistry:
+    """Holds the services shared by every request, built once when the application starts"""
+
+    def __init__(self, configuration: Config):
+        self.configuration = configuration
+        self.lookup_telemetry = LookupTelemetry()
+        self.snapshots = SnapshotManager(configuration, lambda snapshot_configuration: create_lookup_service(snapshot_configuration, self.lookup_telemetry))
+        self.queued_logger = QueuedLogger()
+        self.model_service = ModelService()
+        # Engines ask for the active snapshot on every call, holding its service would keep the startup snapshot alive
+        self.quote_line_sap = QuoteLineSap(lambda: self.lookup_service, self.queued_logger, configuration)
+        self.recommended_price = RecommendedPrice(lambda: self.lookup_service, self.queued_logger, configuration, self.quote_line_sap)
+
+    @property
+    def lookup_service(self) -> LookupServiceInterface:
+        return self.snapshots.current.lookup_service
+
+    def lookup_statistics(self) -> dict[str, Any]:
+        """Telemetry of the lookup tables, kept across snapshots, and the result and material cost cache statistics of the active snapshot"""
+        lookup_service = self.lookup_service
+
+        return {
+            "tables": self.lookup_telemetry.statistics(),
+            "caches": lookup_service.statistics() if isinstance(lookup_service, CachingLookupService) else {},
+            "materialCosts": self.quote_line_sap.material_cost_statistics(lookup_service)
+        }
+
+    def get_engine(self, model_id: str) -> CalcEngineInterface:
+        if model_id.casefold() == "recommendedPrice".casefold():
+            return self.recommended_price
+
+        return self.quote_line_sap
@@ -0,0 +1,107 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+from api.model.lookupsnapshot import LookupSnapshotModel
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def database_signature(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def snapshot_version(generation: int, signature: Optional[tuple]) -> str:
+    """Generation of the snapshot in this process with the full signature of its file, so two refreshes within a second differ"""
+    if signature is None:
+        return f"{generation}.unknown"
+
+    (mtime_ns, size) = signature
+
+    return f"{generation}.{mtime_ns}.{size}"
+
+
+class SnapshotManager:
+    """Holds the active lookup snapshot and replaces it when the lookup database changes or a reload is requested"""
+
+    def __init__(self, configuration: Config, create_lookup_service: Callable[[Config], LookupServiceInterface]):
+        self._configuration = configuration
+        self._create_lookup_service = create_lookup_service
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        self._generation = 0
+
+        self._current = self._build()
+
+        reload_interval = float(configuration.lookup_reload_interval)
+
+        if reload_interval > 0:
+            self._watcher = threading.Thread(target=self._watch, args=(reload_interval,), name="lookup-snapshot-watcher", daemon=True)
+            self._watcher.start()
+
+    @property
+    def current(self) -> LookupSnapshotModel:
+        # Requests read the snapshot once and keep it, so a swap never changes the data under a running calculation
+        return self._current
+
+    def _build(self) -> LookupSnapshotModel:
+        signature = database_signature(self._configuration.connection)
+        lookup_service = self._create_lookup_service(self._configuration)
+
+        # Only counts snapshots that were built, a failed reload keeps the version it had
+        self._generation += 1
+
+        return LookupSnapshotModel(snapshot_version(self._generation, signature), lookup_service, signature)
+
+    def reload(self, force: bool = True, wait: bool = True) -> Optional[LookupSnapshotModel]:
+        """Builds a snapshot from the lookup database and swaps it in, without force it is skipped when the file is unchanged.
+        Without wait it returns None instead of waiting for a reload that is in progress"""
+        if not self._reload_lock.acquire(blocking=wait):
+            return None
+
+        try:
+            if not force and database_signature(self._configuration.connection) == self._current.signature:
+                return self._current
+
+            snapshot = self._build()
+
+            # Rebinding the attribute is atomic, the previous snapshot is released once its last request finishes
+            self._current = snapshot
+        finally:
+            self._reload_lock.release()
+
+        logger.info(f"Lookup snapshot {snapshot.version} is active.")
+
+        return snapshot
+
+    def _watch(self, reload_interval: float):
+        pending_signature = None
+
+        while not self._stop.wait(reload_interval):
+            signature = database_signature(self._configuration.connection)
+
+            if signature is None or signature == self._current.signature:
+                pending_signature = None
+                continue
+
+            # Wait until the file stays the same for a whole interval, so a copy in progress is not loaded
+            if signature != pending_signature:
+                pending_signature = signature
+                continue
+
+            try:
+                self.reload(force=False)
+            except Exception as ex:
+                logger.warning(f"Lookup snapshot reload failed, keeping version {self._current.version}. {ex}")
+
+    def stop(self):
+        self._stop.set()
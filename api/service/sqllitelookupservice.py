@@ -1,7 +1,7 @@
 import sqlite3
-import sys
+import threading
 from abc import ABC
-from typing import Optional, Any
+from typing import Optional, Any, Callable
 
 from api.model.automatedtuning import AutomatedTuningModel
 from api.model.bwrating import BwRatingModel
@@ -10,6 +10,8 @@ from api.model.costadjustment import CostAdjustmentModel
 from api.model.customer import CustomerModel
 from api.model.freightdefault import FreightDefaultModel
 from api.model.ido import IdoModel
+from api.model.linecontext import LineContextModel
+from api.model.linecontextkeys import LineContextKeysModel
 from api.model.locationgroup import LocationGroupModel
 from api.model.materialsalesoffice import MaterialSalesOfficeModel
 from api.model.milltoplantfreight import MillToPlantFreightModel
@@ -23,339 +25,404 @@ from api.model.southfreight import SouthFreightModel
 from api.model.southskidcharge import SouthSkidChargeModel
 from api.model.tartgetmargin import TargetMarginModel
 from api.model.tmadjustment import TmAdjustmentModel
+from api.service.bucketindex import BucketIndex
 from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from api.service.lookupconnectionfactory import LookupConnectionFactory
+from api.service.opcodeindex import OpCodeIndex
+from api.service.rowdecoder import RowDecoder
 from config import Config
 
 
-def customer_from_row(row: Any) -> CustomerModel:
-    customer = CustomerModel()
-
-    customer.percent_adder = float(row["percentadder"])
-    customer.customer_name = row["customername"]
-    customer.dollar_adder = float(row["dollaradder"])
-    customer.dso_adder = row["dsoadder"]
-    customer.sap_ind = row["sapind"]
-    customer.dso = float(row["dso"])
-    customer.waive_skid = row["waive_skid"]
-    customer.customer_sales_office = row["customersalesoffice"]
-    customer.isr_office = row["isroffice"]
-    customer.multi_market_name = row["multimarket_name"]
-    customer.rc_mapping = row["rcmapping"]
-    customer.customer_number = row["customernumber"]
-    customer.unique_id = row["uniqueid"]
-
-    return customer
-
-
-def product_from_row(row: Any) -> ProductModel:
-    product = ProductModel()
-
-    product.bellwether_material = row["bellwethermaterial"]
-    product.bellwether_base_cost = float(row["bellwetherbasecost"])
-    product.dollar_adjustment = float(row["dollaradjustment"])
-    product.exchange_rate = float(row["exchangerate"])
-    product.form = row["form"]
-    product.index = row["index"]
-    product.market_movement_adder = float(row["marketmovementadder"])
-    product.material = row["material"]
-    product.material_description = row["materialdescription"]
-    product.modeled_cost = float(row["modeledcost"])
-    product.product_name = row["product"]
-    product.percent_adjustment = float(row["percentadjustment"])
-    product.per_ton_packaging_cost = float(row["pertonpackagingcost"])
-    product.per_ton_stocking_cost = float(row["pertonstockingcost"])
-    product.rc_mapping = row["rcmapping"]
-    product.unique_id = row["uniqueid"]
-    product.unit_handling_cost = float(row["unithandlingcost"])
-
-    return product
-
-
-def packaging_cost_from_row(row: Any) -> PackagingCostModel:
-    packaging_cost = PackagingCostModel()
-
-    packaging_cost.overhead_group = row["overheadgroup"]
-    packaging_cost.overhead_group_name = row["overheadgroupname"]
-    packaging_cost.per_ton_packaging_cost = float(row["pertonpackagingcost"])
-    packaging_cost.per_ton_stocking_cost = float(row["pertonstockingcost"])
-    packaging_cost.unique_id = row["uniqueid"]
-    packaging_cost.unit_handling_cost = float(row["unithandlingcost"])
-
-    return packaging_cost
-
-
-def tm_adjustment_from_row(row: Any) -> TmAdjustmentModel:
-    tm_adjustment = TmAdjustmentModel()
-
-    tm_adjustment.unique_id = row["uniqueid"]
-    tm_adjustment.multi_market_name = row["multimarket_name"]
-    tm_adjustment.product = row["product"]
-    tm_adjustment.form = row["form"]
-    tm_adjustment.weight_class_1 = float(row["weightclass1"])
-    tm_adjustment.weight_class_200 = float(row["weightclass200"])
-    tm_adjustment.weight_class_500 = float(row["weightclass500"])
-    tm_adjustment.weight_class_1000 = float(row["weightclass1000"])
-    tm_adjustment.weight_class_2000 = float(row["weightclass2000"])
-    tm_adjustment.weight_class_5000 = float(row["weightclass5000"])
-    tm_adjustment.weight_class_6500 = float(row["weightclass6500"])
-    tm_adjustment.weight_class_10000 = float(row["weightclass10000"])
-    tm_adjustment.weight_class_20000 = float(row["weightclass20000"])
-    tm_adjustment.weight_class_24000 = float(row["weightclass24000"])
-    tm_adjustment.weight_class_40000 = float(row["weightclass40000"])
-
-    return tm_adjustment
-
-
-def material_sales_office_from_row(row: Any) -> MaterialSalesOfficeModel:
-    material_sales_office = MaterialSalesOfficeModel()
-
-    material_sales_office.unique_id = row["uniqueid"]
-    material_sales_office.material = row["material"]
-    material_sales_office.isr_office = row["isroffice"]
-    material_sales_office.start_effective_date = row["starteffectivedate"]
-    material_sales_office.end_effective_date = row["endeffectivedate"]
-    material_sales_office.red_margin_threshold = float(row["redmarginthreshold"])
-    material_sales_office.yellow_margin_threshold = float(row["yellowmarginthreshold"])
-    material_sales_office.price_adjustment = float(row["priceadjustment"])
-
-    return material_sales_office
-
-
-def sap_freight_from_row(row: Any) -> SapFreightModel:
-    sap_freight = SapFreightModel()
-
-    sap_freight.unique_id = row["uniqueid"]
-    sap_freight.ship_plant = row["shipplant"]
-    sap_freight.zip_code = row["zipcode"]
-    sap_freight.weight_class_0 = float(row["weightclass0"])
-    sap_freight.weight_class_1 = float(row["weightclass1"])
-    sap_freight.weight_class_200 = float(row["weightclass200"])
-    sap_freight.weight_class_500 = float(row["weightclass500"])
-    sap_freight.weight_class_1000 = float(row["weightclass1000"])
-    sap_freight.weight_class_2000 = float(row["weightclass2000"])
-    sap_freight.weight_class_5000 = float(row["weightclass5000"])
-    sap_freight.weight_class_6500 = float(row["weightclass6500"])
-    sap_freight.weight_class_10000 = float( row["weightclass10000"])
-    sap_freight.weight_class_20000 = float(row["weightclass20000"])
-    sap_freight.weight_class_24000 = float(row["weightclass24000"])
-    sap_freight.weight_class_40000 = float(row["weightclass40000"])
-    sap_freight.minimum_freight_charge = float(row["minimumfreightcharge"])
+customer_from_row = RowDecoder(CustomerModel, {
+    "percent_adder": ("percentadder", float),
+    "customer_name": ("customername", None),
+    "dollar_adder": ("dollaradder", float),
+    "dso_adder": ("dsoadder", None),
+    "sap_ind": ("sapind", None),
+    "dso": ("dso", float),
+    "waive_skid": ("waive_skid", None),
+    "customer_sales_office": ("customersalesoffice", None),
+    "isr_office": ("isroffice", None),
+    "multi_market_name": ("multimarket_name", None),
+    "rc_mapping": ("rcmapping", None),
+    "customer_number": ("customernumber", None),
+    "unique_id": ("uniqueid", None)
+})
+
+
+product_from_row = RowDecoder(ProductModel, {
+    "bellwether_material": ("bellwethermaterial", None),
+    "bellwether_base_cost": ("bellwetherbasecost", float),
+    "dollar_adjustment": ("dollaradjustment", float),
+    "exchange_rate": ("exchangerate", float),
+    "form": ("form", None),
+    "index": ("index", None),
+    "market_movement_adder": ("marketmovementadder", float),
+    "material": ("material", None),
+    "material_description": ("materialdescription", None),
+    "modeled_cost": ("modeledcost", float),
+    "product_name": ("product", None),
+    "percent_adjustment": ("percentadjustment", float),
+    "per_ton_packaging_cost": ("pertonpackagingcost", float),
+    "per_ton_stocking_cost": ("pertonstockingcost", float),
+    "rc_mapping": ("rcmapping", None),
+    "unique_id": ("uniqueid", None),
+    "unit_handling_cost": ("unithandlingcost", float)
+})
+
+
+packaging_cost_from_row = RowDecoder(PackagingCostModel, {
+    "overhead_group": ("overheadgroup", None),
+    "overhead_group_name": ("overheadgroupname", None),
+    "per_ton_packaging_cost": ("pertonpackagingcost", float),
+    "per_ton_stocking_cost": ("pertonstockingcost", float),
+    "unique_id": ("uniqueid", None),
+    "unit_handling_cost": ("unithandlingcost", float)
+})
+
+
+tm_adjustment_from_row = RowDecoder(TmAdjustmentModel, {
+    "unique_id": ("uniqueid", None),
+    "multi_market_name": ("multimarket_name", None),
+    "product": ("product", None),
+    "form": ("form", None),
+    "weight_class_1": ("weightclass1", float),
+    "weight_class_200": ("weightclass200", float),
+    "weight_class_500": ("weightclass500", float),
+    "weight_class_1000": ("weightclass1000", float),
+    "weight_class_2000": ("weightclass2000", float),
+    "weight_class_5000": ("weightclass5000", float),
+    "weight_class_6500": ("weightclass6500", float),
+    "weight_class_10000": ("weightclass10000", float),
+    "weight_class_20000": ("weightclass20000", float),
+    "weight_class_24000": ("weightclass24000", float),
+    "weight_class_40000": ("weightclass40000", float)
+})
+
+
+material_sales_office_from_row = RowDecoder(MaterialSalesOfficeModel, {
+    "unique_id": ("uniqueid", None),
+    "material": ("material", None),
+    "isr_office": ("isroffice", None),
+    "start_effective_date": ("starteffectivedate", None),
+    "end_effective_date": ("endeffectivedate", None),
+    "red_margin_threshold": ("redmarginthreshold", float),
+    "yellow_margin_threshold": ("yellowmarginthreshold", float),
+    "price_adjustment": ("priceadjustment", float)
+})
+
+
+sap_freight_from_row = RowDecoder(SapFreightModel, {
+    "unique_id": ("uniqueid", None),
+    "ship_plant": ("shipplant", None),
+    "zip_code": ("zipcode", None),
+    "weight_class_0": ("weightclass0", float),
+    "weight_class_1": ("weightclass1", float),
+    "weight_class_200": ("weightclass200", float),
+    "weight_class_500": ("weightclass500", float),
+    "weight_class_1000": ("weightclass1000", float),
+    "weight_class_2000": ("weightclass2000", float),
+    "weight_class_5000": ("weightclass5000", float),
+    "weight_class_6500": ("weightclass6500", float),
+    "weight_class_10000": ("weightclass10000", float),
+    "weight_class_20000": ("weightclass20000", float),
+    "weight_class_24000": ("weightclass24000", float),
+    "weight_class_40000": ("weightclass40000", float),
+    "minimum_freight_charge": ("minimumfreightcharge", float)
+})
+
+
+south_skid_charge_from_row = RowDecoder(SouthSkidChargeModel, {
+    "unique_id": ("uniqueid", None),
+    "product": ("product", None),
+    "form": ("form", None),
+    "weight_per_skid": ("weightperskid", float),
+    "skid_charge": ("skidcharge", float)
+})
+
+
+op_code_from_row = RowDecoder(OpCodeModel, {
+    "unique_id": ("uniqueid", None),
+    "op_code_value": ("opcode", None),
+    "cutting_operation": ("cuttingoperation", None),
+    "fab_indicator": ("fabindicator", None),
+    "net_weight_low": ("netweightlow", float),
+    "net_weight_high": ("netweighthigh", float),
+    "pieces_weight_low": ("pieceweightlow", float),
+    "pieces_weight_high": ("pieceweighthigh", float),
+    "long_base_pull_time": ("longbasepulltime", float),
+    "op_code_type": ("opcodetype", None)
+})
+
+
+south_freight_from_row = RowDecoder(SouthFreightModel, {
+    "unique_id": ("uniqueid", None),
+    "ship_plant": ("shipplant", None),
+    "zone": ("zone", None),
+    "weight_class_0": ("weightclass0", None),
+    "weight_class_1": ("weightclass1", None),
+    "weight_class_200": ("weightclass200", None),
+    "weight_class_500": ("weightclass500", None),
+    "weight_class_1000": ("weightclass1000", None),
+    "weight_class_2000": ("weightclass2000", None),
+    "weight_class_5000": ("weightclass5000", None),
+    "weight_class_6500": ("weightclass6500", None),
+    "weight_class_10000": ("weightclass10000", None),
+    "weight_class_20000": ("weightclass20000", None),
+    "weight_class_24000": ("weightclass24000", None),
+    "weight_class_40000": ("weightclass40000", None),
+    "minimum_freight_charge": ("minimumfreightcharge", None)
+})
+
+
+ship_zone_from_row = RowDecoder(ShipZoneModel, {
+    "unique_id": ("uniqueid", None),
+    "customer_id": ("customerid", None),
+    "ship_plant": ("shipplant", None),
+    "zone": ("zone", None)
+})
+
+
+so_bw_floor_price_from_row = RowDecoder(SoBwFloorPriceModel, {
+    "unique_id": ("uniqueid", None),
+    "isr_office": ("isroffice", None),
+    "bellwether_material": ("bellwethermaterial", None),
+    "floor_price": ("floorprice", float)
+})
+
+
+bw_rating_from_row = RowDecoder(BwRatingModel, {
+    "unique_id": ("uniqueid", None),
+    "multi_market_name": ("multimarketname", None),
+    "bellwether_material": ("bellwethermaterial", None),
+    "bw_rating_value": ("bwrating", None),
+    "bw_ratting_adder": ("bwratingadder", float)
+})
+
+
+freight_default_from_row = RowDecoder(FreightDefaultModel, {
+    "unique_id": ("uniqueid", None),
+    "ship_plant": ("shipplant", None),
+    "state": ("state", None),
+    "default_freight_charge_per_100_pounds": ("defaultfreightchargeper100pounds", float),
+    "default_minimum_freight_charge": ("defaultminimumfreightcharge", float)
+})
+
+
+target_margin_from_row = RowDecoder(TargetMarginModel, {
+    "unique_id": ("uniqueid", None),
+    "isr_office": ("isroffice", None),
+    "bell_wether_material": ("bellwethermaterial", None),
+    "target_margin_value": ("targetmargin", float)
+})
+
+
+cl_code_from_row = RowDecoder(ClCodeModel, {
+    "unique_id": ("uniqueid", None),
+    "customer_number": ("customernumber", None),
+    "customer_sales_office": ("customersalesoffice", None),
+    "product": ("product", None),
+    "cl_code_value": ("clcode", None),
+    "form": ("form", None),
+    "cl_discount": ("cldiscount", float)
+})
+
+
+ido_from_row = RowDecoder(IdoModel, {
+    "unique_id": ("uniqueid", None),
+    "stock_plant": ("stockplant", None),
+    "ship_plant": ("shipplant", None),
+    "ido_per_pound": ("idoperpound", None),
+    "ido_max": ("idomax", float),
+    "ido_min": ("idomin", float)
+})
+
+
+automated_tuning_from_row = RowDecoder(AutomatedTuningModel, {
+    "unique_id": ("uniqueid", None),
+    "condensed_form": ("condensedform", None),
+    "location_group": ("locationgroup", None),
+    "price_down_active_flag": ("pricedownactiveflag", None),
+    "price_down_measurement_level": ("pricedownmeasurementlevel", None),
+    "price_down_concentration": ("pricedownconcentration", float),
+    "price_down_magnitude": ("pricedownmagnitude", float),
+    "price_down_min_win_rate_diff": ("pricedownminwinratediff", float),
+    "price_down_obs_req": ("pricedownobsreq", int),
+    "price_down_power": ("pricedownpower", float),
+    "price_down_realization": ("pricedownrealization", float),
+    "price_down_sig_level": ("pricedownsiglevel", float),
+    "price_up_active_flag": ("priceupactiveflag", None),
+    "price_up_measurement_level": ("priceupmeasurementlevel", None),
+    "price_up_concentration": ("priceupconcentration", float),
+    "price_up_magnitude": ("priceupmagnitude", float),
+    "price_up_min_win_rate_diff": ("priceupminwinratediff", float),
+    "price_up_obs_req": ("priceupobsreq", int),
+    "price_up_power": ("priceuppower", float),
+    "price_up_realization": ("priceuprealization", float),
+    "price_up_sig_level": ("priceupsiglevel", float),
+    "product": ("product", None),
+    "salt_value": ("saltvalue", None)
+})
+
+
+cost_adjustment_from_row = RowDecoder(CostAdjustmentModel, {
+    "product": ("product", None),
+    "cost": ("cost", float),
+    "form": ("form", None),
+    "material": ("material", None),
+    "material_classification": ("materialclassification", None),
+    "material_description": ("materialdescription", None),
+    "stock_plant": ("stockplant", None),
+    "target_margin": ("targetmargin", float),
+    "unique_id": ("uniqueid", None)
+})
+
+
+location_group_from_row = RowDecoder(LocationGroupModel, {
+    "unique_id": ("uniqueid", None),
+    "location_group_value": ("locationgroup", None),
+    "rc_mapping": ("rcmapping", None),
+    "region": ("region", None)
+})
+
+
+mill_to_plant_freight_from_row = RowDecoder(MillToPlantFreightModel, {
+    "unique_id": ("uniqueid", None),
+    "bellwether_material": ("bellwethermaterial", None),
+    "ship_plant": ("shipplant", None),
+    "mill_to_plant_freight_value": ("milltoplantfreight", float)
+})
+
+
+PACKAGING_COST_TABLE = "packaging_cost_lookups"
+
+# Query templates issued by SqlLiteLookupService, the index provisioner checks the plan of each one
+UNIQUE_ID_QUERY = "SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+UNIQUE_ID_MANY_QUERY = "SELECT uniqueid AS lookupkey, * FROM {table_id} WHERE uniqueid COLLATE NOCASE IN ({placeholders})"
+PACKAGING_COST_QUERY = f"select pkl.* from {PACKAGING_COST_TABLE} pkl inner join OverheadGroupLookups ogl on pkl.uniqueid = ogl.overheadgroup where ogl.uniqueid = :label COLLATE NOCASE"
+PACKAGING_COST_MANY_QUERY = f"select ogl.uniqueid as lookupkey, pkl.* from {PACKAGING_COST_TABLE} pkl inner join OverheadGroupLookups ogl on pkl.uniqueid = ogl.overheadgroup where ogl.uniqueid COLLATE NOCASE IN ({{placeholders}})"
+EXCHANGE_RATE_QUERY = "SELECT * FROM {table_id} WHERE rcMapping = :label COLLATE NOCASE limit 1"
+OP_CODE_QUERY = "SELECT * from opcodes WHERE opcode = :op_code and netweightlow <= :adjusted_net_weight and netweighthigh > :adjusted_net_weight and pieceweightlow <= :net_weight and pieceweighthigh > :net_weight"
+BUCKET_QUERY = "SELECT * FROM {table_id} WHERE coalesce(min, :max_size) <= :val and coalesce(max, :max_size) >= :val"
+CUSTOMER_BY_NUMBER_QUERY = "SELECT * FROM customers WHERE customernumber = :customer_number COLLATE NOCASE"
+CUSTOMER_BY_SALES_OFFICE_QUERY = "SELECT * FROM customers WHERE customersalesoffice = :customer_sales_office COLLATE NOCASE"
+
+# Mirrors mill_to_plant_freight_key(), cost plus materials are their own bellwether
+LINE_CONTEXT_MTP_KEY = "CASE WHEN lower(ca.materialclassification) = 'cpl' THEN :cost_plus_mtp_key WHEN p.uniqueid IS NOT NULL THEN p.bellwethermaterial || '|' || :ship_plant END"
+LINE_CONTEXT_QUERY = (
+    f"SELECT {LINE_CONTEXT_MTP_KEY} AS mtpkey, p.*, ca.*, mtp.*, ido.*, mso.*, pkl.* FROM (SELECT 1) line "
+    "LEFT JOIN products p ON p.uniqueid = :product_key COLLATE NOCASE "
+    "LEFT JOIN cost_adjustment_test_materials ca ON ca.uniqueid = :cost_adjustment_key COLLATE NOCASE "
+    f"LEFT JOIN mill_to_plant_freights mtp ON mtp.uniqueid = ({LINE_CONTEXT_MTP_KEY}) COLLATE NOCASE "
+    "LEFT JOIN ido_lookup ido ON ido.uniqueid = :ido_key COLLATE NOCASE "
+    "LEFT JOIN MaterialSalesOfficeLookups mso ON mso.uniqueid = :material_sales_office_key COLLATE NOCASE "
+    "LEFT JOIN OverheadGroupLookups ogl ON ogl.uniqueid = :overhead_group_key COLLATE NOCASE "
+    f"LEFT JOIN {PACKAGING_COST_TABLE} pkl ON pkl.uniqueid = ogl.overheadgroup "
+    "LIMIT 1"
+)
+
+# Stay below SQLITE_MAX_VARIABLE_NUMBER on older sqlite builds
+MAX_BATCH_PARAMETERS = 500
+
+# Every table looked up by uniqueid, with the decoder used for its rows
+LOOKUP_TABLES = {
+    "customers": customer_from_row,
+    "products": product_from_row,
+    "tm_adjustments": tm_adjustment_from_row,
+    "mill_to_plant_freights": mill_to_plant_freight_from_row,
+    "MaterialSalesOfficeLookups": material_sales_office_from_row,
+    "sap_freight_lookups": sap_freight_from_row,
+    "south_skid_charge_lookup": south_skid_charge_from_row,
+    "south_freight_lookups": south_freight_from_row,
+    "ship_zone_lookups": ship_zone_from_row,
+    "so_bw_floor_price_lookup": so_bw_floor_price_from_row,
+    "bw_rating_lookup": bw_rating_from_row,
+    "freight_defaults": freight_default_from_row,
+    "target_margin_lookups": target_margin_from_row,
+    "cl_codes": cl_code_from_row,
+    "ido_lookup": ido_from_row,
+    "automated_tuning_lookup": automated_tuning_from_row,
+    "location_group_lookup": location_group_from_row,
+    "cost_adjustment_test_materials": cost_adjustment_from_row
+}
+
+# Tables of LINE_CONTEXT_QUERY in the order their columns are selected, after mtpkey
+LINE_CONTEXT_TABLES = [
+    ("products", product_from_row),
+    ("cost_adjustment_test_materials", cost_adjustment_from_row),
+    ("mill_to_plant_freights", mill_to_plant_freight_from_row),
+    ("ido_lookup", ido_from_row),
+    ("MaterialSalesOfficeLookups", material_sales_office_from_row),
+    (PACKAGING_COST_TABLE, packaging_cost_from_row)
+]
+
+
+def normalize_key(label: Any) -> str:
+    return str(label).casefold()
 
-    return sap_freight
-
-
-def south_skid_charge_from_row(row: Any) -> SouthSkidChargeModel:
-    south_skid_charge = SouthSkidChargeModel()
-
-    south_skid_charge.unique_id = row["uniqueid"]
-    south_skid_charge.product = row["product"]
-    south_skid_charge.form = row["form"]
-    south_skid_charge.weight_per_skid = float(row["weightperskid"])
-    south_skid_charge.skid_charge = float(row["skidcharge"])
-
-    return south_skid_charge
-
-
-def op_code_from_row(row: Any) -> OpCodeModel:
-    op_code = OpCodeModel()
-
-    op_code.unique_id = row["uniqueid"]
-    op_code.op_code_value = row["opcode"]
-    op_code.cutting_operation = row["cuttingoperation"]
-    op_code.fab_indicator = row["fabindicator"]
-    op_code.net_weight_low = float(row["netweightlow"])
-    op_code.net_weight_high = float(row["netweighthigh"])
-    op_code.pieces_weight_low = float(row["pieceweightlow"])
-    op_code.pieces_weight_high = float(row["pieceweighthigh"])
-    op_code.long_base_pull_time = float(row["longbasepulltime"])
-    op_code.op_code_type = row["opcodetype"]
-
-    return op_code
-
-
-def south_freight_from_row(row: Any) -> SouthFreightModel:
-    south_freight = SouthFreightModel()
-
-    south_freight.unique_id = row["uniqueid"]
-    south_freight.ship_plant = row["shipplant"]
-    south_freight.zone = row["zone"]
-    south_freight.weight_class_0 = row["weightclass0"]
-    south_freight.weight_class_1 = row["weightclass1"]
-    south_freight.weight_class_200 = row["weightclass200"]
-    south_freight.weight_class_500 = row["weightclass500"]
-    south_freight.weight_class_1000 = row["weightclass1000"]
-    south_freight.weight_class_2000 = row["weightclass2000"]
-    south_freight.weight_class_5000 = row["weightclass5000"]
-    south_freight.weight_class_6500 = row["weightclass6500"]
-    south_freight.weight_class_10000 = row["weightclass10000"]
-    south_freight.weight_class_20000 = row["weightclass20000"]
-    south_freight.weight_class_24000 = row["weightclass24000"]
-    south_freight.weight_class_40000 = row["weightclass40000"]
-    south_freight.minimum_freight_charge = row["minimumfreightcharge"]
-
-    return south_freight
-
-
-def ship_zone_from_row(row: Any) -> ShipZoneModel:
-    ship_zone = ShipZoneModel()
-
-    ship_zone.unique_id = row["uniqueid"]
-    ship_zone.customer_id = row["customerid"]
-    ship_zone.ship_plant = row["shipplant"]
-    ship_zone.zone = row["zone"]
-
-    return ship_zone
-
-
-def so_bw_floor_price_from_row(row: Any) -> SoBwFloorPriceModel:
-    so_bw_floor_price = SoBwFloorPriceModel()
-
-    so_bw_floor_price.unique_id = row["uniqueid"]
-    so_bw_floor_price.isr_office = row["isroffice"]
-    so_bw_floor_price.bellwether_material = row["bellwethermaterial"]
-    so_bw_floor_price.floor_price = float(row["floorprice"])
-
-    return so_bw_floor_price
-
-
-def bw_rating_from_row(row: Any) -> BwRatingModel:
-    bw_rating = BwRatingModel()
-
-    bw_rating.unique_id = row["uniqueid"]
-    bw_rating.multi_market_name = row["multimarketname"]
-    bw_rating.bellwether_material = row["bellwethermaterial"]
-    bw_rating.bw_rating_value = row["bwrating"]
-    bw_rating.bw_ratting_adder = float(row["bwratingadder"])
-
-    return bw_rating
-
-
-def freight_default_from_row(row: Any) -> FreightDefaultModel:
-    freight_default = FreightDefaultModel()
-
-    freight_default.unique_id = row["uniqueid"]
-    freight_default.ship_plant = row["shipplant"]
-    freight_default.state = row["state"]
-    freight_default.default_freight_charge_per_100_pounds = float(row["defaultfreightchargeper100pounds"])
-    freight_default.default_minimum_freight_charge = float(row["defaultminimumfreightcharge"])
-
-    return freight_default
-
-
-def target_margin_from_row(row: Any) -> TargetMarginModel:
-    target_margin = TargetMarginModel()
-
-    target_margin.unique_id = row["uniqueid"]
-    target_margin.isr_office = row["isroffice"]
-    target_margin.bell_wether_material = row["bellwethermaterial"]
-    target_margin.target_margin_value = float(row["targetmargin"])
-
-    return target_margin
-
-
-def cl_code_from_row(row: Any) -> ClCodeModel:
-    cl_code = ClCodeModel()
-
-    cl_code.unique_id = row["uniqueid"]
-    cl_code.customer_number = row["customernumber"]
-    cl_code.customer_sales_office = row["customersalesoffice"]
-    cl_code.product = row["product"]
-    cl_code.cl_code_value = row["clcode"]
-    cl_code.form = row["form"]
-    cl_code.cl_discount = float(row["cldiscount"])
-
-    return cl_code
-
-
-def ido_from_row(row: Any) -> IdoModel:
-    ido = IdoModel()
-
-    ido.unique_id = row["uniqueid"]
-    ido.stock_plant = row["stockplant"]
-    ido.ship_plant = row["shipplant"]
-    ido.ido_per_pound = row["idoperpound"]
-    ido.ido_max = float(row["idomax"])
-    ido.ido_min = float(row["idomin"])
-
-    return ido
 
+class SqlLiteLookupService(LookupServiceInterface, ABC):
+    def __init__(self, configuration: Config):
+        self._connection_factory = LookupConnectionFactory(configuration)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._bucket_indexes = dict()
+        self._op_code_index = None
+        self._line_context_segments = None
 
-def automated_tuning_from_row(row: Any) -> AutomatedTuningModel:
-    automated_tuning = AutomatedTuningModel()
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shared between threads, so each worker thread opens its own once and reuses it
+        connection = getattr(self._local, "connection", None)
 
-    automated_tuning.unique_id = row["uniqueid"]
-    automated_tuning.condensed_form = row["condensedform"]
-    automated_tuning.location_group = row["locationgroup"]
-    automated_tuning.price_down_active_flag = row["pricedownactiveflag"]
-    automated_tuning.price_down_measurement_level = row["pricedownmeasurementlevel"]
-    automated_tuning.price_down_concentration = float(row["pricedownconcentration"])
-    automated_tuning.price_down_magnitude = float(row["pricedownmagnitude"])
-    automated_tuning.price_down_min_win_rate_diff = float(row["pricedownminwinratediff"])
-    automated_tuning.price_down_obs_req = int(row["pricedownobsreq"])
-    automated_tuning.price_down_power = float(row["pricedownpower"])
-    automated_tuning.price_down_realization = float(row["pricedownrealization"])
-    automated_tuning.price_down_sig_level = float(row["pricedownsiglevel"])
-    automated_tuning.price_up_active_flag = row["priceupactiveflag"]
-    automated_tuning.price_up_measurement_level = row["priceupmeasurementlevel"]
-    automated_tuning.price_up_concentration = float(row["priceupconcentration"])
-    automated_tuning.price_up_magnitude = float(row["priceupmagnitude"])
-    automated_tuning.price_up_min_win_rate_diff = float(row["priceupminwinratediff"])
-    automated_tuning.price_up_obs_req = int(row["priceupobsreq"])
-    automated_tuning.price_up_power = float(row["priceuppower"])
-    automated_tuning.price_up_realization = float(row["priceuprealization"])
-    automated_tuning.price_up_sig_level = float(row["priceupsiglevel"])
-    automated_tuning.product = row["product"]
-    automated_tuning.salt_value = row["saltvalue"]
+        if connection is None:
+            connection = self._connection_factory.connect()
 
-    return automated_tuning
+            self._local.connection = connection
 
+            with self._lock:
+                self._connections.append(connection)
 
-def cost_adjustment_from_row(row: Any) -> CostAdjustmentModel:
-    cost_adjustment = CostAdjustmentModel()
+        return connection
 
-    cost_adjustment.product = row["product"]
-    cost_adjustment.cost = float(row["cost"])
-    cost_adjustment.form = row["form"]
-    cost_adjustment.material = row["material"]
-    cost_adjustment.material_classification = row["materialclassification"]
-    cost_adjustment.material_description = row["materialdescription"]
-    cost_adjustment.stock_plant = row["stockplant"]
-    cost_adjustment.target_margin = float(row["targetmargin"])
-    cost_adjustment.unique_id = row["uniqueid"]
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
 
-    return cost_adjustment
+            self._connections.clear()
 
+        self._local = threading.local()
 
-def location_group_from_row(row: Any) -> LocationGroupModel:
-    location_group = LocationGroupModel()
+    def _lookup_many(self, query: str, labels: list[str], from_row: RowDecoder) -> dict[str, Any]:
+        # One query per chunk of distinct keys, the query must select the matched key first as lookupkey
+        distinct_labels = list({normalize_key(label): label for label in reversed(labels)}.values())
 
-    location_group.unique_id = row["uniqueid"]
-    location_group.location_group_value = row["locationgroup"]
-    location_group.rc_mapping = row["rcmapping"]
-    location_group.region = row["region"]
+        results = dict()
 
-    return location_group;
+        cursor = self._connection.cursor()
 
+        for start in range(0, len(distinct_labels), MAX_BATCH_PARAMETERS):
+            chunk = distinct_labels[start:start + MAX_BATCH_PARAMETERS]
+            placeholders = ", ".join("?" for _ in chunk)
 
-def mill_to_plant_freight_from_row(row: Any) -> PackagingCostModel:
-    mill_to_plant_freight = MillToPlantFreightModel()
+            cursor.execute(query.format(placeholders=placeholders), chunk)
 
-    mill_to_plant_freight.unique_id = row["uniqueid"]
-    mill_to_plant_freight.bellwether_material = row["bellwethermaterial"]
-    mill_to_plant_freight.ship_plant = row["shipplant"]
-    mill_to_plant_freight.mill_to_plant_freight_value = float(row["milltoplantfreight"])
+            decode = from_row.for_cursor(cursor)
 
-    return mill_to_plant_freight
+            for row in cursor.fetchall():
+                results.setdefault(normalize_key(row[0]), decode(row))
 
+        return results
 
-class SqlLiteLookupService(LookupServiceInterface, ABC):
-    def __init__(self, configuration: Config):
-        connection_string = configuration.connection
+    def _lookup_table_many(self, table_id: str, labels: list[str], from_row: RowDecoder) -> dict[str, Any]:
+        query = UNIQUE_ID_MANY_QUERY.format(table_id=table_id, placeholders="{placeholders}")
 
-        self._connection = sqlite3.connect(connection_string)
+        return self._lookup_many(query, labels, from_row)
 
     def lookup_customer(self, client_id: str, table_id: str, label: str, default_value: Optional[CustomerModel]) -> CustomerModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -363,17 +430,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return customer_from_row(row)
+        return customer_from_row.for_cursor(cursor)(row)
 
     def lookup_product(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -381,17 +446,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return product_from_row(row)
+        return product_from_row.for_cursor(cursor)(row)
 
     def lookup_packaging_cost(self, client_id: str, table_id: str, label: str, default_value: Optional[PackagingCostModel]) -> PackagingCostModel:
-        query = f"select pkl.* from packaging_cost_lookups pkl inner join OverheadGroupLookups ogl on pkl.uniqueid = ogl.overheadgroup where ogl.uniqueid = :label COLLATE NOCASE"
+        query = PACKAGING_COST_QUERY
 
         params = {"label": label}
 
@@ -399,17 +462,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return packaging_cost_from_row(row)
+        return packaging_cost_from_row.for_cursor(cursor)(row)
 
     def lookup_tm_adjustment(self, client_id: str, table_id: str, label: str, default_value: Optional[TmAdjustmentModel]) -> TmAdjustmentModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -417,17 +478,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return tm_adjustment_from_row(row)
+        return tm_adjustment_from_row.for_cursor(cursor)(row)
 
     def lookup_mill_to_plant_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[MillToPlantFreightModel]) -> MillToPlantFreightModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -435,17 +494,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return mill_to_plant_freight_from_row(row)
+        return mill_to_plant_freight_from_row.for_cursor(cursor)(row)
 
     def lookup_material_sales_office(self, client_id: str, table_id: str, label: str, default_value: Optional[MaterialSalesOfficeModel]) -> MaterialSalesOfficeModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -453,17 +510,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return material_sales_office_from_row(row)
+        return material_sales_office_from_row.for_cursor(cursor)(row)
 
     def lookup_sap_freight(self, client_id, table_id: str, label: str, default_value: Optional[SapFreightModel]) -> SapFreightModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -471,17 +526,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return sap_freight_from_row(row)
+        return sap_freight_from_row.for_cursor(cursor)(row)
 
     def lookup_south_skid_charge(self, client_id: str, table_id: str, label: str, default_value: Optional[SouthSkidChargeModel]) -> SouthSkidChargeModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -489,33 +542,26 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return south_skid_charge_from_row(row)
+        return south_skid_charge_from_row.for_cursor(cursor)(row)
 
     def lookup_op_code(self, op_code: str, adjusted_net_weight_of_sales_item: float, net_weight_of_sales_item: float) -> OpCodeModel:
-        query = f"SELECT * from opcodes WHERE opcode = '{op_code}' and netweightlow <= {adjusted_net_weight_of_sales_item} and netweighthigh > {adjusted_net_weight_of_sales_item} and pieceweightlow <= {net_weight_of_sales_item} and pieceweighthigh > {net_weight_of_sales_item} COLLATE NOCASE"
-
-        cursor = self._connection.cursor()
-
-        cursor.execute(query)
+        # The op codes are read once, OP_CODE_QUERY is kept for the index provisioner
+        if self._op_code_index is None:
+            connection = self._connection
 
-        cursor.row_factory = sqlite3.Row
+            with self._lock:
+                if self._op_code_index is None:
+                    self._op_code_index = OpCodeIndex.load(connection, op_code_from_row)
 
-        row = cursor.fetchone()
-
-        if row is None:
-            return None
-
-        return op_code_from_row(row)
+        return self._op_code_index.find(op_code, adjusted_net_weight_of_sales_item, net_weight_of_sales_item)
 
     def lookup_south_freight(self, client_id: str, table_id: str, label: str, default_value: Optional[SouthFreightModel]) -> SouthFreightModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -523,17 +569,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return south_freight_from_row(row)
+        return south_freight_from_row.for_cursor(cursor)(row)
 
     def lookup_ship_zone(self, client_id: str, table_id: str, label: str, default_value: Optional[ShipZoneModel]) -> ShipZoneModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -541,17 +585,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return ship_zone_from_row(row)
+        return ship_zone_from_row.for_cursor(cursor)(row)
 
     def lookup_so_bw_floor_price(self, client_id: str, table_id: str, label: str, default_value: Optional[SoBwFloorPriceModel]) -> SoBwFloorPriceModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -559,17 +601,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return so_bw_floor_price_from_row(row)
+        return so_bw_floor_price_from_row.for_cursor(cursor)(row)
 
     def lookup_bw_rating(self, client_id: str, table_id: str, label: str, default_value: Optional[BwRatingModel]) -> BwRatingModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -577,17 +617,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return bw_rating_from_row(row)
+        return bw_rating_from_row.for_cursor(cursor)(row)
 
     def lookup_freight_default(self, client_id: str, table_id: str, label: str, default_value: Optional[FreightDefaultModel]) -> FreightDefaultModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -595,17 +633,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return freight_default_from_row(row)
+        return freight_default_from_row.for_cursor(cursor)(row)
 
     def lookup_target_margin(self, client_id: str, table_id: str, label: str, default_value: Optional[float]) -> float:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -613,17 +649,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return target_margin_from_row(row).target_margin_value
+        return target_margin_from_row.for_cursor(cursor)(row).target_margin_value
 
     def lookup_cl_code(self, client_id: str, table_id: str, label: str, default_value: Optional[ClCodeModel]) -> ClCodeModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -631,17 +665,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return cl_code_from_row(row)
+        return cl_code_from_row.for_cursor(cursor)(row)
 
     def lookup_ido(self, client_id: str, table_id: str, label: str, default_value: Optional[IdoModel]) -> IdoModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -649,65 +681,66 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return ido_from_row(row)
+        return ido_from_row.for_cursor(cursor)(row)
 
-    def bucketed_lookup(self, client_id: str, table_id: str, val: float, column: str) -> str:
-        query = f"SELECT * FROM {table_id} WHERE coalesce(min, {sys.maxsize}) <= {val} and coalesce(max, {sys.maxsize}) >= {val} COLLATE NOCASE"
+    def _get_bucket_index(self, table_id: str) -> BucketIndex:
+        bucket_index = self._bucket_indexes.get(table_id)
 
-        cursor = self._connection.cursor()
+        if bucket_index is None:
+            connection = self._connection
 
-        cursor.execute(query)
+            with self._lock:
+                bucket_index = self._bucket_indexes.get(table_id)
 
-        cursor.row_factory = sqlite3.Row
+                if bucket_index is None:
+                    bucket_index = BucketIndex.load(connection, table_id)
 
-        row = cursor.fetchone()
+                    self._bucket_indexes = self._bucket_indexes | {table_id: bucket_index}
 
-        if row is None:
-            return None
+        return bucket_index
 
-        return row[column]
+    def bucketed_lookup(self, client_id: str, table_id: str, val: float, column: str) -> str:
+        # Bucket tables are read once, BUCKET_QUERY is kept for the index provisioner
+        return self._get_bucket_index(table_id).lookup(val, column)
+
+    def bucketed_lookup_many(self, client_id: str, table_id: str, vals: list[float], column: str) -> list[str]:
+        return self._get_bucket_index(table_id).lookup_many(vals, column)
 
     def get_customer_without_office(self, customer_number: str) -> CustomerModel:
-        query = f"SELECT * FROM customers WHERE customernumber = '{customer_number}' COLLATE NOCASE"
+        params = {"customer_number": customer_number}
 
         cursor = self._connection.cursor()
 
-        cursor.execute(query)
-
-        cursor.row_factory = sqlite3.Row
+        cursor.execute(CUSTOMER_BY_NUMBER_QUERY, params)
 
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return customer_from_row(row)
+        return customer_from_row.for_cursor(cursor)(row)
 
     def get_default_office(self, customer_sales_office: str) -> CustomerModel:
-        query = f"SELECT * FROM customers WHERE customersalesoffice = '{customer_sales_office}' COLLATE NOCASE"
+        params = {"customer_sales_office": customer_sales_office}
 
         cursor = self._connection.cursor()
 
-        cursor.execute(query)
-
-        cursor.row_factory = sqlite3.Row
+        cursor.execute(CUSTOMER_BY_SALES_OFFICE_QUERY, params)
 
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return customer_from_row(row)
+        return customer_from_row.for_cursor(cursor)(row)
 
     def lookup_automated_tuning(self, client_id: str, table_id: str, label: str, default_value: Optional[AutomatedTuningModel]) -> AutomatedTuningModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -715,17 +748,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return automated_tuning_from_row(row)
+        return automated_tuning_from_row.for_cursor(cursor)(row)
 
     def lookup_location_group(self, client_id: str, table_id: str, label: str, default_value: Optional[LocationGroupModel]) -> LocationGroupModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -733,17 +764,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return location_group_from_row(row)
+        return location_group_from_row.for_cursor(cursor)(row)
 
     def lookup_cost_adjustment(self, client_id: str, table_id: str, label: str, default_value: Optional[CostAdjustmentModel]) -> CostAdjustmentModel:
-        query = f"SELECT * FROM {table_id} WHERE uniqueid = :label COLLATE NOCASE"
+        query = UNIQUE_ID_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -751,17 +780,15 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return cost_adjustment_from_row(row)
+        return cost_adjustment_from_row.for_cursor(cursor)(row)
 
     def lookup_exchange_rate(self, client_id: str, table_id: str, label: str, default_value: Optional[ProductModel]) -> ProductModel:
-        query = f"SELECT * FROM {table_id} WHERE rcMapping = :label limit 1 COLLATE NOCASE"
+        query = EXCHANGE_RATE_QUERY.format(table_id=table_id)
 
         params = {"label": label}
 
@@ -769,11 +796,97 @@ class SqlLiteLookupService(LookupServiceInterface, ABC):
 
         cursor.execute(query, params)
 
-        cursor.row_factory = sqlite3.Row
-
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return product_from_row(row)
+        return product_from_row.for_cursor(cursor)(row)
+
+    def lookup_product_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ProductModel]:
+        return self._lookup_table_many(table_id, labels, product_from_row)
+
+    def lookup_packaging_cost_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, PackagingCostModel]:
+        return self._lookup_many(PACKAGING_COST_MANY_QUERY, labels, packaging_cost_from_row)
+
+    def lookup_mill_to_plant_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MillToPlantFreightModel]:
+        return self._lookup_table_many(table_id, labels, mill_to_plant_freight_from_row)
+
+    def lookup_tm_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, TmAdjustmentModel]:
+        return self._lookup_table_many(table_id, labels, tm_adjustment_from_row)
+
+    def lookup_material_sales_office_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, MaterialSalesOfficeModel]:
+        return self._lookup_table_many(table_id, labels, material_sales_office_from_row)
+
+    def lookup_sap_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SapFreightModel]:
+        return self._lookup_table_many(table_id, labels, sap_freight_from_row)
+
+    def lookup_south_skid_charge_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthSkidChargeModel]:
+        return self._lookup_table_many(table_id, labels, south_skid_charge_from_row)
+
+    def lookup_south_freight_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SouthFreightModel]:
+        return self._lookup_table_many(table_id, labels, south_freight_from_row)
+
+    def lookup_ship_zone_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ShipZoneModel]:
+        return self._lookup_table_many(table_id, labels, ship_zone_from_row)
+
+    def lookup_so_bw_floor_price_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, SoBwFloorPriceModel]:
+        return self._lookup_table_many(table_id, labels, so_bw_floor_price_from_row)
+
+    def lookup_bw_rating_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, BwRatingModel]:
+        return self._lookup_table_many(table_id, labels, bw_rating_from_row)
+
+    def lookup_freight_default_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, FreightDefaultModel]:
+        return self._lookup_table_many(table_id, labels, freight_default_from_row)
+
+    def lookup_target_margin_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, float]:
+        target_margins = self._lookup_table_many(table_id, labels, target_margin_from_row)
+
+        return {key: target_margin.target_margin_value for (key, target_margin) in target_margins.items()}
+
+    def lookup_cl_code_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, ClCodeModel]:
+        return self._lookup_table_many(table_id, labels, cl_code_from_row)
+
+    def lookup_ido_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, IdoModel]:
+        return self._lookup_table_many(table_id, labels, ido_from_row)
+
+    def lookup_automated_tuning_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, AutomatedTuningModel]:
+        return self._lookup_table_many(table_id, labels, automated_tuning_from_row)
+
+    def lookup_location_group_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, LocationGroupModel]:
+        return self._lookup_table_many(table_id, labels, location_group_from_row)
+
+    def lookup_cost_adjustment_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, CostAdjustmentModel]:
+        return self._lookup_table_many(table_id, labels, cost_adjustment_from_row)
+
+    def _get_line_context_segments(self) -> list[tuple[int, int, int, Callable[[tuple], Any]]]:
+        # (start, end, uniqueid position, decoder) of every table in a LINE_CONTEXT_QUERY row
+        if self._line_context_segments is None:
+            connection = self._connection
+
+            with self._lock:
+                if self._line_context_segments is None:
+                    segments = list()
+                    start = 1
+
+                    for (table_id, from_row) in LINE_CONTEXT_TABLES:
+                        column_names = tuple(column[0] for column in connection.execute(f"SELECT * FROM {table_id} LIMIT 0").description)
+                        uniqueid_position = [column_name.casefold() for column_name in column_names].index("uniqueid")
+
+                        segments.append((start, start + len(column_names), start + uniqueid_position, from_row.bind(column_names)))
+
+                        start += len(column_names)
+
+                    self._line_context_segments = segments
+
+        return self._line_context_segments
+
+    def lookup_line_context(self, client_id: str, keys: LineContextKeysModel) -> LineContextModel:
+        segments = self._get_line_context_segments()
+
+        # The query always returns one row, a table without a match has null columns
+        row = self._connection.execute(LINE_CONTEXT_QUERY, keys._asdict()).fetchone()
+
+        (product, cost_adjustment, mill_to_plant_freight, ido, material_sales_office, packaging_cost) = [None if row[uniqueid_position] is None else decode(row[start:end]) for (start, end, uniqueid_position, decode) in segments]
+
+        return LineContextModel(product, cost_adjustment, row[0], mill_to_plant_freight, ido, material_sales_office, packaging_cost)
@@ -0,0 +1,103 @@
+import math
+from functools import lru_cache
+from operator import attrgetter
+from typing import Optional
+
+from api.model.southskidcharge import SouthSkidChargeModel
+
+# The weight classes a quote line is priced at, every ladder below holds one value per class in this order
+WEIGHT_CLASSES = (1.0, 200.0, 500.0, 1000.0, 2000.0, 5000.0, 6500.0, 10000.0, 20000.0, 24000.0, 40000.0)
+WEIGHT_CLASS_NAMES = tuple(str(int(weight_class)) for weight_class in WEIGHT_CLASSES)
+WEIGHT_CLASS_POSITIONS = {name: position for (position, name) in enumerate(WEIGHT_CLASS_NAMES)}
+
+# Reads the weight_class_1 ... weight_class_40000 fields of a target margin adjustment or freight model in ladder order
+weight_class_columns = attrgetter(*(f"weight_class_{name}" for name in WEIGHT_CLASS_NAMES))
+
+
+def _small_order_charge(rc_mapping: str, multi_market: str, weight_class: float) -> float:
+    if rc_mapping.casefold() == "SOUTH".casefold() and weight_class <= 500.0:
+        return 25.0
+
+    if multi_market.casefold() == "NORTHEAST".casefold() and weight_class <= 1000:
+        return 15.0
+
+    if rc_mapping.casefold() != "SOUTH".casefold() and multi_market.casefold() != "NORTHEAST" and weight_class <= 500.0:
+        return 50.0
+
+    return 0.0
+
+
+@lru_cache(maxsize=64)
+def small_order_ladder(rc_mapping: str, multi_market: str) -> tuple:
+    """The small order charge of every class spread over the class weight, it only depends on the market"""
+    return tuple(_small_order_charge(rc_mapping, multi_market, weight_class) / weight_class for weight_class in WEIGHT_CLASSES)
+
+
+def cust_price_weight_class(replacement_cost_with_mtp: float, base_target_margin: float, target_margin_adjustment: float, ido_per_pound_max_constrained: float, cl_discount: float) -> float:
+    return (replacement_cost_with_mtp / (1 - round(max(min(base_target_margin + target_margin_adjustment, 0.98), -0.20), 4)) + ido_per_pound_max_constrained) * (1 + cl_discount)
+
+
+def cust_price_ladder(replacement_cost_with_mtp: float, base_target_margin: float, target_margin_adjustments: tuple, ido_per_pound_max_constrained: float, cl_discount: float) -> list[float]:
+    cl_factor = 1 + cl_discount
+
+    return [(replacement_cost_with_mtp / (1 - round(max(min(base_target_margin + adjustment, 0.98), -0.20), 4)) + ido_per_pound_max_constrained) * cl_factor for adjustment in target_margin_adjustments]
+
+
+def order_cost_weight_class(weight_class: float, unit_handling_cost: float, waive_skid: str, packaging_cost_per_pound: float, sap_ind: str, south_skid_charge_info: Optional[SouthSkidChargeModel], south_skid_charge_weight: float, south_skid_charge: float, stocking_cost_per_pound: float) -> float:
+    if waive_skid.casefold() != "N".casefold():
+        skid_charge = 0.0
+    elif sap_ind.casefold() == "Y".casefold():
+        skid_charge = packaging_cost_per_pound
+    elif south_skid_charge_info is None:
+        skid_charge = 0.0
+    else:
+        skid_charge = math.ceil(weight_class / south_skid_charge_weight) * south_skid_charge / 1.0
+
+    return unit_handling_cost / weight_class + skid_charge + stocking_cost_per_pound
+
+
+def order_cost_ladder(unit_handling_cost: float, waive_skid: str, packaging_cost_per_pound: float, sap_ind: str, south_skid_charge_info: Optional[SouthSkidChargeModel], south_skid_charge_weight: float, south_skid_charge: float, stocking_cost_per_pound: float) -> list[float]:
+    if waive_skid.casefold() != "N".casefold():
+        skid_charges = [0.0] * len(WEIGHT_CLASSES)
+    elif sap_ind.casefold() == "Y".casefold():
+        skid_charges = [packaging_cost_per_pound] * len(WEIGHT_CLASSES)
+    elif south_skid_charge_info is None:
+        skid_charges = [0.0] * len(WEIGHT_CLASSES)
+    else:
+        skid_charges = [math.ceil(weight_class / south_skid_charge_weight) * south_skid_charge / 1.0 for weight_class in WEIGHT_CLASSES]
+
+    return [unit_handling_cost / weight_class + skid_charge + stocking_cost_per_pound for (weight_class, skid_charge) in zip(WEIGHT_CLASSES, skid_charges)]
+
+
+def non_mat_cost_weight_class(weight_class: float, order_cost: float, freight_escalation_level: str, freight_charge: float, default_freight_charge: float, base_raw_freight_charge: float, minimum_freight_charge: float) -> float:
+    """freight_charge is the class charge per 100 pounds of the freight model, used at Level1"""
+    if freight_escalation_level.casefold() == "Level1".casefold():
+        charge = freight_charge / 100.0
+    elif freight_escalation_level.casefold() == "Level2".casefold():
+        charge = default_freight_charge / 100.0
+    else:
+        charge = base_raw_freight_charge / 100.0
+
+    return order_cost + max(charge, minimum_freight_charge / weight_class) + max(15 / weight_class, 0.01)
+
+
+def non_mat_cost_ladder(order_costs: list[float], freight_escalation_level: str, freight_charges: tuple, default_freight_charge: float, base_raw_freight_charge: float, minimum_freight_charge: float) -> list[float]:
+    """freight_charges are the weight class charges per 100 pounds of the freight model, used at Level1"""
+    if freight_escalation_level.casefold() == "Level1".casefold():
+        charges = [freight_charge / 100.0 for freight_charge in freight_charges]
+    elif freight_escalation_level.casefold() == "Level2".casefold():
+        charges = [default_freight_charge / 100.0] * len(WEIGHT_CLASSES)
+    else:
+        charges = [base_raw_freight_charge / 100.0] * len(WEIGHT_CLASSES)
+
+    return [order_cost + max(charge, minimum_freight_charge / weight_class) + max(15 / weight_class, 0.01) for (order_cost, charge, weight_class) in zip(order_costs, charges, WEIGHT_CLASSES)]
+
+
+def recommended_price_ladder(rc_mapping: str, multi_market: str, cust_price: float, non_mat_cost: float, cust_service_percent_adder: float, cust_service_dollar_adder: float, floor_price: float, automated_tuning_magnitude: float, bw_rating_adder: float, price_adjustment: float) -> list[str]:
+    """Every class is priced off the same customer price and non material cost, only the small order and dollar adders vary with the class"""
+    cost = cust_price + non_mat_cost
+    service_factor = 1 + cust_service_percent_adder
+    tuning_factor = 1.0 + automated_tuning_magnitude
+    bw_rating_factor = 1.0 + bw_rating_adder
+
+    return [str(round(max(round((cost + small_order_charge) * service_factor + cust_service_dollar_adder / weight_class, 4), floor_price) * tuning_factor * bw_rating_factor + price_adjustment, 4)) for (weight_class, small_order_charge) in zip(WEIGHT_CLASSES, small_order_ladder(rc_mapping, multi_market))]
@@ -2,6 +2,8 @@ from flask import Flask
 from flask_restful import Api
 from flasgger import Swagger
 from api.resources.routes import initialize_routes
+from api.service.serviceregistry import ServiceRegistry
+from config import Config
 
 
 def create_app():
@@ -17,7 +19,11 @@ def create_app():
     # Initialize Config
     flask_app.config.from_pyfile('config.py')
 
-    initialize_routes(api)
+    # Lookup service, logger and engines are shared by every request
+    registry = ServiceRegistry(Config)
+    flask_app.extensions["service_registry"] = registry
+
+    initialize_routes(api, registry)
 
     return flask_app
 
@@ -0,0 +1,66 @@
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import timeit
+
+from api.service.inmemorylookupservice import InMemoryLookupService
+from api.service.lookupindexprovisioner import LookupIndexProvisioner
+from api.service.lookupstore import compile_lookup_store
+from api.service.mappedlookupservice import MappedLookupService
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from config import Config
+from test.service.lookupdatabase import create_lookup_database_file
+
+
+def lookup_calls(lookup_service, labels: list[str]):
+    for label in labels:
+        lookup_service.lookup_product("client", "products", label, None)
+        lookup_service.lookup_target_margin("client", "target_margin_lookups", label, None)
+
+
+def run(materials: int, calls: int, repeat: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ryerson.db")
+        store_path = os.path.join(directory, "ryerson.db.store")
+        create_lookup_database_file(path, materials=materials, customers=50)
+
+        connection = sqlite3.connect(path)
+
+        try:
+            LookupIndexProvisioner(connection).provision()
+        finally:
+            connection.close()
+
+        started = time.perf_counter()
+        compile_lookup_store(path, store_path)
+        print(f"{'compile store':<16}{(time.perf_counter() - started) * 1e3:>10.1f} ms, {os.path.getsize(store_path)} bytes")
+
+        generator = random.Random(11)
+        labels = [f"{generator.choice(['CENTRAL', 'SOUTH'])}|M{generator.randrange(materials)}" for _ in range(calls)]
+
+        configuration = type("BenchmarkConfig", (Config,), {"connection": path, "lookup_store_path": store_path})
+
+        for (name, create) in [("sqlite", SqlLiteLookupService), ("in memory", InMemoryLookupService), ("mapped store", MappedLookupService)]:
+            started = time.perf_counter()
+            lookup_service = create(configuration)
+            startup = time.perf_counter() - started
+
+            lookup_calls(lookup_service, labels)
+
+            best = min(timeit.repeat(lambda: lookup_calls(lookup_service, labels), number=1, repeat=repeat))
+
+            print(f"{name:<16}{startup * 1e3:>10.1f} ms startup{best * 1e6 / (calls * 2):>10.2f} us per lookup")
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Startup and per lookup cost of the sqlite, in memory and mapped store lookup services")
+    parser.add_argument('-m', '--materials', default=20000, type=int, help='materials seeded into the lookup database')
+    parser.add_argument('-n', '--calls', default=20000, type=int, help='lookups per run')
+    parser.add_argument('-r', '--repeat', default=5, type=int, help='runs, the fastest is reported')
+    args = parser.parse_args()
+
+    run(args.materials, args.calls, args.repeat)
@@ -0,0 +1,101 @@
+import random
+import timeit
+
+from api.model.automatedtuning import AutomatedTuningModel
+from api.model.bwrating import BwRatingModel
+from api.model.clcode import ClCodeModel
+from api.model.costadjustment import CostAdjustmentModel
+from api.model.freightdefault import FreightDefaultModel
+from api.model.ido import IdoModel
+from api.model.locationgroup import LocationGroupModel
+from api.model.materialsalesoffice import MaterialSalesOfficeModel
+from api.model.milltoplantfreight import MillToPlantFreightModel
+from api.model.packagingcost import PackagingCostModel
+from api.model.product import ProductModel
+from api.model.sapfreight import SapFreightModel
+from api.model.sobwfloorprice import SoBwFloorPriceModel
+from api.model.southfreight import SouthFreightModel
+from api.model.southskidcharge import SouthSkidChargeModel
+from api.model.tmadjustment import TmAdjustmentModel
+from api.schema.automatedtuning import AutomatedTuningSchema
+from api.schema.bwrating import BwRatingSchema
+from api.schema.clcode import ClCodeSchema
+from api.schema.costadjustment import CostAdjustmentSchema
+from api.schema.freight import FreightSchema
+from api.schema.freightdefault import FreightDefaultSchema
+from api.schema.ido import IdoSchema
+from api.schema.locationgroup import LocationGroupSchema
+from api.schema.materialsalesoffice import MaterialSalesOfficeSchema
+from api.schema.milltoplantfreight import MillToPlantFreightSchema
+from api.schema.packagingcost import PackagingCostSchema
+from api.schema.product import ProductSchema
+from api.schema.responsewrapperwithmeta import ResponseWrapperWithMetaSchema
+from api.schema.sapfreight import SapFreightSchema
+from api.schema.sobwfloorprice import SoBwFloorPriceSchema
+from api.schema.southfreight import SouthFreightSchema
+from api.schema.southskidcharge import SouthSkidChargeSchema
+from api.schema.tmadjustment import TmAdjustmentSchema
+from api.service.modelserializer import ModelSerializer
+
+# Every schema quoteLineSAP dumps, with the model it dumps
+SCHEMA_MODELS = [
+    (ProductSchema, ProductModel), (CostAdjustmentSchema, CostAdjustmentModel), (MillToPlantFreightSchema, MillToPlantFreightModel), (IdoSchema, IdoModel),
+    (TmAdjustmentSchema, TmAdjustmentModel), (ClCodeSchema, ClCodeModel), (MaterialSalesOfficeSchema, MaterialSalesOfficeModel), (PackagingCostSchema, PackagingCostModel),
+    (SouthSkidChargeSchema, SouthSkidChargeModel), (SapFreightSchema, SapFreightModel), (SouthFreightSchema, SouthFreightModel), (FreightSchema, SapFreightModel),
+    (FreightDefaultSchema, FreightDefaultModel), (SoBwFloorPriceSchema, SoBwFloorPriceModel), (BwRatingSchema, BwRatingModel), (LocationGroupSchema, LocationGroupModel),
+    (AutomatedTuningSchema, AutomatedTuningModel)
+]
+
+
+def random_model(generator: random.Random, model: type) -> tuple:
+    values = list()
+
+    for field in model._fields:
+        default = model._field_defaults.get(field, "")
+
+        if isinstance(default, float):
+            values.append(generator.uniform(-10.0, 10.0))
+        elif isinstance(default, int):
+            values.append(generator.randint(0, 1000))
+        else:
+            values.append(f"{field[:3].upper()}{generator.randint(0, 999)}")
+
+    return model._make(values)
+
+
+def run(calls: int, repeat: int, seed: int):
+    generator = random.Random(seed)
+    cases = [(schema, [random_model(generator, model) for _ in range(calls)]) for (schema, model) in SCHEMA_MODELS]
+    cases.append((ResponseWrapperWithMetaSchema, [{"data": {"recPriceWC1": str(generator.random())}, "metadata": {"lookupversion": 1}} for _ in range(calls)]))
+
+    strategies = [
+        ("schema per call", lambda schema: lambda model: schema().dump(model)),
+        ("cached schema", lambda schema: schema().dump),
+        ("model serializer", ModelSerializer)
+    ]
+
+    print(f"{'schema':<32}" + "".join(f"{name:>20}" for (name, _) in strategies))
+
+    for (schema, models) in cases:
+        dumps = [dump(schema) for (_, dump) in strategies]
+        expected = [schema().dump(model) for model in models]
+
+        for ((name, _), dump) in zip(strategies, dumps):
+            if [dump(model) for model in models] != expected:
+                raise AssertionError(f"{name} dumps {schema.__name__} differently")
+
+        timings = [min(timeit.repeat(lambda: [dump(model) for model in models], number=1, repeat=repeat)) for dump in dumps]
+
+        print(f"{schema.__name__:<32}" + "".join(f"{timing * 1e6 / calls:>17.2f} us" for timing in timings))
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Checks that cached schemas and model serializers dump the real models as a new schema does, and times the three")
+    parser.add_argument('-n', '--calls', default=2000, type=int, help='models dumped per schema')
+    parser.add_argument('-r', '--repeat', default=5, type=int, help='runs, the fastest is reported')
+    parser.add_argument('-s', '--seed', default=7, type=int, help='seed of the random models')
+    args = parser.parse_args()
+
+    run(args.calls, args.repeat, args.seed)
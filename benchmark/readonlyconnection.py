@@ -0,0 +1,70 @@
+import os
+import random
+import sqlite3
+import tempfile
+import timeit
+
+from api.service.lookupindexprovisioner import LookupIndexProvisioner
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from config import Config
+from test.service.lookupdatabase import create_lookup_database_file
+
+
+def lookup_calls(lookup_service: SqlLiteLookupService, labels: list[str]):
+    for label in labels:
+        lookup_service.lookup_product("client", "products", label, None)
+        lookup_service.lookup_target_margin("client", "target_margin_lookups", label, None)
+
+
+def run(materials: int, calls: int, repeat: int, shm_directory: str):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ryerson.db")
+        create_lookup_database_file(path, materials=materials, customers=50)
+
+        connection = sqlite3.connect(path)
+
+        try:
+            LookupIndexProvisioner(connection).provision()
+        finally:
+            connection.close()
+
+        generator = random.Random(11)
+        labels = [f"{generator.choice(['CENTRAL', 'SOUTH'])}|M{generator.randrange(materials)}" for _ in range(calls)]
+
+        cases = [
+            ("default connection", {}),
+            ("read only, immutable", {"lookup_open_mode": "readonly"}),
+            ("read only, shm copy", {"lookup_open_mode": "readonly", "lookup_shm_copy": True, "lookup_shm_directory": shm_directory})
+        ]
+
+        for (name, settings) in cases:
+            configuration = type("BenchmarkConfig", (Config,), {"connection": path} | settings)
+            lookup_service = SqlLiteLookupService(configuration)
+
+            try:
+                # The first pass opens the connection and warms the page cache
+                lookup_calls(lookup_service, labels)
+
+                best = min(timeit.repeat(lambda: lookup_calls(lookup_service, labels), number=1, repeat=repeat))
+            finally:
+                lookup_service.close()
+
+            print(f"{name:<24}{best * 1e6 / (calls * 2):>10.2f} us per lookup")
+
+        shm_copy = os.path.join(shm_directory, "ryerson.db")
+
+        if os.path.exists(shm_copy):
+            os.remove(shm_copy)
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Per lookup cost of the default and the read only lookup database connections")
+    parser.add_argument('-m', '--materials', default=20000, type=int, help='materials seeded into the lookup database')
+    parser.add_argument('-n', '--calls', default=20000, type=int, help='lookups per run')
+    parser.add_argument('-r', '--repeat', default=5, type=int, help='runs, the fastest is reported')
+    parser.add_argument('--shm', default="/dev/shm", help='directory the database is copied to')
+    args = parser.parse_args()
+
+    run(args.materials, args.calls, args.repeat, args.shm)
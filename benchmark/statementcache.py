@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import timeit
+
+from api.service.lookupconnectionfactory import STATEMENT_CACHE_SIZE
+from api.service.sqllitelookupservice import OP_CODE_QUERY, BUCKET_QUERY, CUSTOMER_BY_NUMBER_QUERY
+from test.service.lookupdatabase import create_lookup_database_file
+
+# The queries as they were rendered before they were bound, every distinct value is a new statement to parse
+LITERAL_OP_CODE_QUERY = "SELECT * from opcodes WHERE opcode = '{op_code}' and netweightlow <= {adjusted_net_weight} and netweighthigh > {adjusted_net_weight} and pieceweightlow <= {net_weight} and pieceweighthigh > {net_weight} COLLATE NOCASE"
+LITERAL_BUCKET_QUERY = "SELECT * FROM weight_class WHERE coalesce(min, {max_size}) <= {val} and coalesce(max, {max_size}) >= {val} COLLATE NOCASE"
+LITERAL_CUSTOMER_QUERY = "SELECT * FROM customers WHERE customernumber = '{customer_number}' COLLATE NOCASE"
+
+
+def literal_calls(connection: sqlite3.Connection, calls: int):
+    for i in range(calls):
+        weight = 1.0 + i * 0.37
+
+        connection.execute(LITERAL_OP_CODE_QUERY.format(op_code="SAW", adjusted_net_weight=weight, net_weight=weight / 10)).fetchone()
+        connection.execute(LITERAL_BUCKET_QUERY.format(max_size=sys.maxsize, val=weight)).fetchone()
+        connection.execute(LITERAL_CUSTOMER_QUERY.format(customer_number=f"C{i % 50}")).fetchone()
+
+
+def bound_calls(connection: sqlite3.Connection, calls: int):
+    bucket_query = BUCKET_QUERY.format(table_id="weight_class")
+
+    for i in range(calls):
+        weight = 1.0 + i * 0.37
+
+        connection.execute(OP_CODE_QUERY, {"op_code": "SAW", "adjusted_net_weight": weight, "net_weight": weight / 10}).fetchone()
+        connection.execute(bucket_query, {"max_size": sys.maxsize, "val": weight}).fetchone()
+        connection.execute(CUSTOMER_BY_NUMBER_QUERY, {"customer_number": f"C{i % 50}"}).fetchone()
+
+
+def run(calls: int, repeat: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ryerson.db")
+        create_lookup_database_file(path, materials=200, customers=50)
+
+        cases = [
+            ("literal values", literal_calls, STATEMENT_CACHE_SIZE),
+            ("bound, no statement cache", bound_calls, 0),
+            ("bound, statement cache", bound_calls, STATEMENT_CACHE_SIZE)
+        ]
+
+        for (name, calls_function, cache_size) in cases:
+            connection = sqlite3.connect(path, cached_statements=cache_size)
+
+            try:
+                best = min(timeit.repeat(lambda: calls_function(connection, calls), number=1, repeat=repeat))
+            finally:
+                connection.close()
+
+            print(f"{name:<28}{best * 1e6 / (calls * 3):>10.2f} us per query")
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Per query cost of literal versus bound op code, bucket and customer lookups")
+    parser.add_argument('-n', '--calls', default=20000, type=int, help='lookups of each kind per run')
+    parser.add_argument('-r', '--repeat', default=5, type=int, help='runs, the fastest is reported')
+    args = parser.parse_args()
+
+    run(args.calls, args.repeat)
@@ -0,0 +1,138 @@
+import math
+import random
+import timeit
+
+from api.model.sapfreight import SapFreightModel
+from api.model.southskidcharge import SouthSkidChargeModel
+from api.model.tmadjustment import TmAdjustmentModel
+from api.service.weightclassladder import WEIGHT_CLASSES, weight_class_columns, cust_price_ladder, order_cost_ladder, non_mat_cost_ladder, recommended_price_ladder
+
+
+# The per class calculations as perform_calculations made them, one call per weight class
+def scalar_recommended_price(rc_mapping, multi_market, weight_class, cust_price_weight_class, non_mat_cost_weight_class, cust_service_percent_adder, cust_service_dollar_adder, floor_price, automated_tuning_magnitude, bw_rating_adder, price_adjustment):
+    if rc_mapping.casefold() == "SOUTH".casefold() and weight_class <= 500.0:
+        a = 25.0
+    else:
+        if multi_market.casefold() == "NORTHEAST".casefold() and weight_class <= 1000:
+            a = 15.0
+        else:
+            if rc_mapping.casefold() != "SOUTH".casefold() and multi_market.casefold() != "NORTHEAST" and weight_class <= 500.0:
+                a = 50.0
+            else:
+                a = 0.0
+
+    return str(round(((max(round(((((cust_price_weight_class + non_mat_cost_weight_class)) + (a) / weight_class) * (1 + cust_service_percent_adder)) + (cust_service_dollar_adder / weight_class), 4), floor_price) * (1.0 + automated_tuning_magnitude) * (1.0 + bw_rating_adder)) + price_adjustment), 4))
+
+
+def scalar_order_cost(unit_handling_cost, waive_skid, packaging_cost_per_pound, sap_ind, south_skid_charge_info, south_skid_charge_weight, south_skid_charge, stocking_cost_per_pound, weight_class):
+    if waive_skid.casefold() == "N".casefold():
+        if sap_ind.casefold() == "Y".casefold():
+            a = packaging_cost_per_pound
+        else:
+            a = (math.ceil(weight_class / south_skid_charge_weight) if south_skid_charge_info is not None else 0.0) * south_skid_charge / 1.0
+    else:
+        a = 0.0
+
+    return unit_handling_cost / weight_class + a + stocking_cost_per_pound
+
+
+def scalar_non_mat_cost(order_cost_weight_class, freight_escalation_level, freight_info_charge, default_freight_charge, base_raw_freight_charge, minimum_freight_charge, weight_class):
+    if freight_escalation_level.casefold() == "Level1".casefold():
+        freight_charge = freight_info_charge
+    elif freight_escalation_level.casefold() == "Level2".casefold():
+        freight_charge = default_freight_charge
+    else:
+        freight_charge = base_raw_freight_charge
+
+    return order_cost_weight_class + max(freight_charge / 100.0, minimum_freight_charge / weight_class) + max(15 / weight_class, 0.01)
+
+
+def random_line(generator: random.Random) -> dict:
+    sap_ind = generator.choice(["Y", "N"])
+
+    return {
+        "rc_mapping": generator.choice(["CENTRAL", "SOUTH", "south"]),
+        "multi_market": generator.choice(["MIDWEST", "NORTHEAST", "Northeast"]),
+        "sap_ind": sap_ind,
+        "waive_skid": generator.choice(["N", "Y"]),
+        "replacement_cost": generator.uniform(0.3, 4.0),
+        "base_target_margin": generator.uniform(0.05, 0.6),
+        "tm_adjustment": TmAdjustmentModel(*(["K", "MM", "P", "F"] + [generator.uniform(-0.3, 0.5) for _ in WEIGHT_CLASSES])),
+        "ido": generator.uniform(0.0, 0.2),
+        "cl_discount": generator.choice([0.0, 0.03, 0.05]),
+        "unit_handling_cost": generator.uniform(0.0, 40.0),
+        "packaging_cost_per_pound": generator.uniform(0.0, 0.05),
+        "south_skid_charge_info": SouthSkidChargeModel() if sap_ind == "N" and generator.random() < 0.7 else None,
+        "south_skid_charge_weight": generator.uniform(500.0, 4000.0),
+        "south_skid_charge": generator.uniform(5.0, 30.0),
+        "stocking_cost_per_pound": round(generator.uniform(0.0, 0.03), 4),
+        "freight_escalation_level": generator.choice(["Level1", "Level2", "Level3"]),
+        "freight_info": SapFreightModel(*(["K", "P", "Z", 9.0] + [generator.uniform(1.0, 12.0) for _ in WEIGHT_CLASSES])),
+        "default_freight_charge": generator.uniform(1.0, 6.0),
+        "minimum_freight_charge": generator.uniform(25.0, 90.0),
+        "cust_service_percent_adder": generator.uniform(0.0, 0.1),
+        "cust_service_dollar_adder": generator.uniform(0.0, 50.0),
+        "floor_price": generator.uniform(0.0, 3.0),
+        "automated_tuning_magnitude": generator.uniform(-0.05, 0.05),
+        "bw_rating_adder": generator.uniform(0.0, 0.05),
+        "price_adjustment": generator.uniform(-0.1, 0.1)
+    }
+
+
+def scalar_ladder(line: dict) -> tuple:
+    tm_adjustment = line["tm_adjustment"]
+    tm_adjustments = {
+        1.0: tm_adjustment.weight_class_1, 200.0: tm_adjustment.weight_class_200, 500.0: tm_adjustment.weight_class_500, 1000.0: tm_adjustment.weight_class_1000,
+        2000.0: tm_adjustment.weight_class_2000, 5000.0: tm_adjustment.weight_class_5000, 6500.0: tm_adjustment.weight_class_6500, 10000.0: tm_adjustment.weight_class_10000,
+        20000.0: tm_adjustment.weight_class_20000, 24000.0: tm_adjustment.weight_class_24000, 40000.0: tm_adjustment.weight_class_40000
+    }
+    freight_charges = dict(zip(WEIGHT_CLASSES, weight_class_columns(line["freight_info"])))
+
+    cust_prices = [(line["replacement_cost"] / (1 - round(max(min(line["base_target_margin"] + tm_adjustments[weight_class], 0.98), -0.20), 4)) + line["ido"]) * (1 + line["cl_discount"]) for weight_class in WEIGHT_CLASSES]
+    order_costs = [scalar_order_cost(line["unit_handling_cost"], line["waive_skid"], line["packaging_cost_per_pound"], line["sap_ind"], line["south_skid_charge_info"], line["south_skid_charge_weight"], line["south_skid_charge"], line["stocking_cost_per_pound"], weight_class) for weight_class in WEIGHT_CLASSES]
+    non_mat_costs = [scalar_non_mat_cost(order_cost, line["freight_escalation_level"], freight_charges[weight_class], line["default_freight_charge"], 1.8, line["minimum_freight_charge"], weight_class) for (order_cost, weight_class) in zip(order_costs, WEIGHT_CLASSES)]
+    rec_prices = [scalar_recommended_price(line["rc_mapping"], line["multi_market"], weight_class, cust_prices[1], non_mat_costs[1], line["cust_service_percent_adder"], line["cust_service_dollar_adder"], line["floor_price"], line["automated_tuning_magnitude"], line["bw_rating_adder"], line["price_adjustment"]) for weight_class in WEIGHT_CLASSES]
+
+    return cust_prices, order_costs, non_mat_costs, rec_prices
+
+
+def vector_ladder(line: dict) -> tuple:
+    cust_prices = cust_price_ladder(line["replacement_cost"], line["base_target_margin"], weight_class_columns(line["tm_adjustment"]), line["ido"], line["cl_discount"])
+    order_costs = order_cost_ladder(line["unit_handling_cost"], line["waive_skid"], line["packaging_cost_per_pound"], line["sap_ind"], line["south_skid_charge_info"], line["south_skid_charge_weight"], line["south_skid_charge"], line["stocking_cost_per_pound"])
+    non_mat_costs = non_mat_cost_ladder(order_costs, line["freight_escalation_level"], weight_class_columns(line["freight_info"]), line["default_freight_charge"], 1.8, line["minimum_freight_charge"])
+    rec_prices = recommended_price_ladder(line["rc_mapping"], line["multi_market"], cust_prices[1], non_mat_costs[1], line["cust_service_percent_adder"], line["cust_service_dollar_adder"], line["floor_price"], line["automated_tuning_magnitude"], line["bw_rating_adder"], line["price_adjustment"])
+
+    return cust_prices, order_costs, non_mat_costs, rec_prices
+
+
+def exact(ladders: tuple) -> list:
+    # Bit for bit, floats are compared by their exact representation
+    return [[value.hex() if isinstance(value, float) else value for value in ladder] for ladder in ladders]
+
+
+def run(lines: int, repeat: int, seed: int):
+    generator = random.Random(seed)
+    quote_lines = [random_line(generator) for _ in range(lines)]
+
+    for line in quote_lines:
+        if exact(scalar_ladder(line)) != exact(vector_ladder(line)):
+            raise AssertionError(f"Ladders differ for {line}")
+
+    print(f"{lines} lines match bit for bit")
+
+    for (name, ladder) in [("per class calls", scalar_ladder), ("ladder", vector_ladder)]:
+        best = min(timeit.repeat(lambda: [ladder(line) for line in quote_lines], number=1, repeat=repeat))
+
+        print(f"{name:<20}{best * 1e6 / lines:>10.2f} us per line")
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Checks the weight class ladder against the per class calculations and times both")
+    parser.add_argument('-n', '--lines', default=20000, type=int, help='random quote lines')
+    parser.add_argument('-r', '--repeat', default=5, type=int, help='runs, the fastest is reported')
+    parser.add_argument('-s', '--seed', default=7, type=int, help='seed of the random quote lines')
+    args = parser.parse_args()
+
+    run(args.lines, args.repeat, args.seed)
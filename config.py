@@ -13,3 +13,21 @@ class Config(object):
     base_calculation_endpoint = environ.get('baseCalculationEndpoint') or "http://localhost:44359"
     fan_out = environ.get('fanOut') or False
     connection = environ.get("localDataBasePath") or "C:\\VendorData\\SQLLite\\ryerson.db"
+    lookup_service_type = environ.get("lookupServiceType") or "sqlite"
+    lookup_index_check = environ.get("lookupIndexCheck") or "warn"
+    lookup_open_mode = environ.get("lookupOpenMode") or "default"
+    lookup_mmap_size = environ.get("lookupMmapSize") or 268435456
+    lookup_cache_size = environ.get("lookupCacheSize") or -65536
+    lookup_temp_store = environ.get("lookupTempStore") or "MEMORY"
+    lookup_shm_copy = False if environ.get('lookupShmCopy') is None else environ.get('lookupShmCopy').casefold() == "true".casefold()
+    lookup_shm_directory = environ.get("lookupShmDirectory") or "/dev/shm"
+    lookup_reload_interval = environ.get("lookupReloadInterval") or 0
+    lookup_result_cache_entries = environ.get("lookupResultCacheEntries") or 10000
+    lookup_result_cache_ttl = environ.get("lookupResultCacheTtl") or 600
+    material_cost_cache_entries = environ.get("materialCostCacheEntries") or 10000
+    lookup_concurrency = environ.get("lookupConcurrency") or 0
+    lookup_store_path = environ.get("lookupStorePath") or ""
+    lookup_telemetry = False if environ.get('lookupTelemetry') is None else environ.get('lookupTelemetry').casefold() == "true".casefold()
+    calculation_trace = environ.get("calculationTrace") or "off"
+    admin_token = environ.get("adminToken") or ""
+    compiled_model_path = environ.get("compiledModelPath") or ""
@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import tempfile
+
+from config import Config
+
+WEIGHT_CLASSES = [1, 200, 500, 1000, 2000, 5000, 6500, 10000, 20000, 24000, 40000]
+
+TABLES = {
+    "customers": ["uniqueid", "customernumber", "sapind", "multimarket_name", "customersalesoffice", "isroffice", "customername", "rcmapping", "dso", "waive_skid", "dsoadder", "percentadder", "dollaradder"],
+    "products": ["uniqueid", "rcmapping", "material", "bellwethermaterial", "product", "form", "index", "bellwetherbasecost", "marketmovementadder", "percentadjustment", "dollaradjustment", "modeledcost", "unithandlingcost", "pertonpackagingcost", "pertonstockingcost", "materialdescription", "exchangerate"],
+    "packaging_cost_lookups": ["uniqueid", "overheadgroup", "overheadgroupname", "pertonpackagingcost", "pertonstockingcost", "unithandlingcost"],
+    "OverheadGroupLookups": ["uniqueid", "overheadgroup"],
+    "tm_adjustments": ["uniqueid", "multimarket_name", "product", "form"] + [f"weightclass{w}" for w in WEIGHT_CLASSES],
+    "MaterialSalesOfficeLookups": ["uniqueid", "material", "isroffice", "starteffectivedate", "endeffectivedate", "redmarginthreshold", "yellowmarginthreshold", "priceadjustment"],
+    "sap_freight_lookups": ["uniqueid", "shipplant", "zipcode", "weightclass0"] + [f"weightclass{w}" for w in WEIGHT_CLASSES] + ["minimumfreightcharge"],
+    "south_skid_charge_lookup": ["uniqueid", "product", "form", "weightperskid", "skidcharge"],
+    "opcodes": ["uniqueid", "opcode", "cuttingoperation", "fabindicator", "netweightlow", "netweighthigh", "pieceweightlow", "pieceweighthigh", "longbasepulltime", "opcodetype"],
+    "south_freight_lookups": ["uniqueid", "shipplant", "zone", "weightclass0"] + [f"weightclass{w}" for w in WEIGHT_CLASSES] + ["minimumfreightcharge"],
+    "ship_zone_lookups": ["uniqueid", "customerid", "shipplant", "zone"],
+    "so_bw_floor_price_lookup": ["uniqueid", "isroffice", "bellwethermaterial", "floorprice"],
+    "bw_rating_lookup": ["uniqueid", "multimarketname", "bellwethermaterial", "bwrating", "bwratingadder"],
+    "freight_defaults": ["uniqueid", "shipplant", "state", "defaultfreightchargeper100pounds", "defaultminimumfreightcharge"],
+    "target_margin_lookups": ["uniqueid", "isroffice", "bellwethermaterial", "targetmargin"],
+    "cl_codes": ["uniqueid", "customernumber", "customersalesoffice", "product", "clcode", "form", "cldiscount"],
+    "ido_lookup": ["uniqueid", "stockplant", "shipplant", "idoperpound", "idomax", "idomin"],
+    "automated_tuning_lookup": ["uniqueid", "product", "condensedform", "locationgroup", "saltvalue", "priceupactiveflag", "priceupmeasurementlevel", "priceupconcentration", "priceupmagnitude", "priceuprealization", "priceupminwinratediff", "priceupsiglevel", "priceuppower", "priceupobsreq", "pricedownactiveflag", "pricedownmeasurementlevel", "pricedownconcentration", "pricedownmagnitude", "pricedownrealization", "pricedownminwinratediff", "pricedownsiglevel", "pricedownpower", "pricedownobsreq"],
+    "cost_adjustment_test_materials": ["uniqueid", "product", "cost", "form", "material", "materialclassification", "materialdescription", "stockplant", "targetmargin"],
+    "location_group_lookup": ["uniqueid", "locationgroup", "rcmapping", "region"],
+    "mill_to_plant_freights": ["uniqueid", "bellwethermaterial", "shipplant", "milltoplantfreight"],
+    "weight_class": ["uniqueid", "min", "max", "totalquotepounds"]
+}
+
+PRODUCTS = [("PLATE", "FLAT"), ("BAR", "ROUND"), ("SHEET", "FLAT"), ("TUBE", "SQUARE")]
+
+
+def insert(connection: sqlite3.Connection, table: str, rows: list[tuple]):
+    columns = ", ".join(f'"{c}"' for c in TABLES[table])
+    placeholders = ", ".join("?" for _ in TABLES[table])
+
+    connection.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+
+
+def create_lookup_database(connection: sqlite3.Connection, materials: int = 6, customers: int = 3):
+    """Creates every lookup table read by the lookup services and seeds deterministic rows"""
+    for table, columns in TABLES.items():
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        connection.execute(f"CREATE TABLE {table} ({column_list})")
+
+    customer_rows = []
+
+    for i in range(customers):
+        sap_ind = "Y" if i % 2 == 0 else "N"
+        rc_mapping = "CENTRAL" if sap_ind == "Y" else "SOUTH"
+        multi_market = "MIDWEST" if sap_ind == "Y" else "SOUTHEAST"
+        name = "CL2 PRICE MASTER" if i == 2 else f"Customer {i}"
+        waive_skid = "Y" if i % 4 == 3 else "N"
+
+        customer_rows.append((f"C{i}|OFF{i % 2}", f"C{i}", sap_ind, multi_market, f"OFF{i % 2}", f"ISR{i % 2}", name, rc_mapping, 30.0, waive_skid, 0.01 * (i % 3), 0.02, 5.0 + i))
+
+    insert(connection, "customers", customer_rows)
+
+    product_rows = []
+    tm_rows = []
+    target_margin_rows = []
+    floor_rows = []
+    bw_rating_rows = []
+    mtp_rows = []
+    overhead_rows = []
+    packaging_rows = []
+    cost_adjustment_rows = []
+    cl_code_rows = []
+
+    for m in range(materials):
+        material = f"M{m}"
+        bellwether = f"BW{m % 3}"
+        product, form = PRODUCTS[m % len(PRODUCTS)]
+
+        for rc_mapping in ["CENTRAL", "SOUTH"]:
+            product_rows.append((f"{rc_mapping}|{material}", rc_mapping, material, bellwether, product, form, f"IDX{m % 2}", 90.0 + m, 0.5, 1.0, 0.0, 100.0 + 3.5 * m, 12.0 + m, 40.0 + m, 20.0 + m, f"Material {m}", 1.0 + 0.01 * m))
+
+        overhead_rows.append((f"{material}|P2", f"OG{m}"))
+        overhead_rows.append((f"{material}|9999", f"OG{m}"))
+        packaging_rows.append((f"OG{m}", f"OG{m}", f"Group {m}", 30.0 + m, 18.0 + m, 9.0 + m))
+
+        if m % 3 == 2:
+            cost_adjustment_rows.append((f"{material}|P1", product, 120.0 + m, form, material, "CPL" if m % 2 == 0 else "LM", f"Cost plus {m}", "P1", 0.3))
+
+    for b in range(3):
+        bellwether = f"BW{b}"
+
+        for isr in ["ISR0", "ISR1"]:
+            target_margin_rows.append((f"{isr}|{bellwether}", isr, bellwether, 0.2 + 0.01 * b))
+            floor_rows.append((f"{isr}|{bellwether}", isr, bellwether, 0.4 + 0.1 * b))
+
+        bw_rating_rows.append((f"MIDWEST|{bellwether}", "MIDWEST", bellwether, "A", 0.01 * b))
+        mtp_rows.append((f"{bellwether}|P2", bellwether, "P2", 0.015 * (b + 1)))
+
+    for m in range(materials):
+        if m % 3 == 2:
+            # Cost plus materials use themselves as the bellwether
+            for isr in ["ISR0", "ISR1"]:
+                target_margin_rows.append((f"{isr}|M{m}", isr, f"M{m}", 0.18))
+
+    for multi_market in ["MIDWEST", "SOUTHEAST"]:
+        for product, form in PRODUCTS:
+            tm_rows.append((f"{multi_market}|{product}|{form}", multi_market, product, form) + tuple(0.12 - 0.01 * i for i in range(len(WEIGHT_CLASSES))))
+
+    cl_code_rows.append(("C0|OFF0|PLATE|FLAT", "C0", "OFF0", "PLATE", "1", "FLAT", 0.04))
+    cl_code_rows.append(("C1|OFF1|BAR|ROUND", "C1", "OFF1", "BAR", "", "ROUND", 0.02))
+
+    insert(connection, "products", product_rows)
+    insert(connection, "tm_adjustments", tm_rows)
+    insert(connection, "target_margin_lookups", target_margin_rows)
+    insert(connection, "so_bw_floor_price_lookup", floor_rows)
+    insert(connection, "bw_rating_lookup", bw_rating_rows)
+    insert(connection, "mill_to_plant_freights", mtp_rows)
+    insert(connection, "OverheadGroupLookups", overhead_rows)
+    insert(connection, "packaging_cost_lookups", packaging_rows)
+    insert(connection, "cost_adjustment_test_materials", cost_adjustment_rows)
+    insert(connection, "cl_codes", cl_code_rows)
+
+    insert(connection, "ido_lookup", [("P1|P2", "P1", "P2", 1.5, 500.0, 10.0), ("P1|P3", "P1", "P3", 0.5, 50.0, 0.0)])
+    insert(connection, "south_skid_charge_lookup", [(f"{p}|{f}", p, f, 3000.0 + i * 500, 25.0 + i) for i, (p, f) in enumerate(PRODUCTS)])
+    insert(connection, "sap_freight_lookups", [("P2|60601", "P2", "60601", 9.0) + tuple(8.0 - 0.5 * i for i in range(len(WEIGHT_CLASSES))) + (75.0,)])
+    insert(connection, "south_freight_lookups", [("P2|2", "P2", "2", 7.0) + tuple(6.0 - 0.25 * i for i in range(len(WEIGHT_CLASSES))) + (60.0,), ("P2|3", "P2", "3", 7.5) + tuple(6.5 - 0.25 * i for i in range(len(WEIGHT_CLASSES))) + (65.0,)])
+    insert(connection, "ship_zone_lookups", [("C1|P2", "C1", "P2", "2")])
+    insert(connection, "freight_defaults", [("P2|IL", "P2", "IL", 4.5, 55.0), ("P3|IL", "P3", "IL", 5.5, 45.0)])
+    insert(connection, "location_group_lookup", [("CENTRAL", "LG1", "CENTRAL", "NORTH"), ("SOUTH", "LG2", "SOUTH", "SOUTH")])
+    insert(connection, "automated_tuning_lookup", [
+        ("LG1|PLATE|FR", "PLATE", "FR", "LG1", "SALT1", "TRUE", "CUSTOMER", 0.2, 0.03, 0.5, 0.01, 0.05, 0.8, 100, "FALSE", "CUSTOMER", 0.1, -0.02, 0.5, 0.01, 0.05, 0.8, 100),
+        ("LG2|BAR|ROUND", "BAR", "ROUND", "LG2", "SALT2", "FALSE", "CUSTOMER", 0.3, 0.04, 0.5, 0.01, 0.05, 0.8, 50, "TRUE", "CUSTOMER", 0.3, -0.03, 0.5, 0.01, 0.05, 0.8, 50)
+    ])
+    insert(connection, "opcodes", [
+        ("1", "SAW", "CUT", "N", 0.0, 500.0, 0.0, 100.0, 1.5, "A"),
+        ("2", "SAW", "CUT", "N", 500.0, 5000.0, 0.0, 100.0, 2.5, "A"),
+        ("3", "SAW", "CUT", "N", 0.0, 5000.0, 100.0, 1000.0, 3.5, "B"),
+        ("4", "BURN", "BURN", "Y", 0.0, 10000.0, 0.0, 10000.0, 4.5, "C")
+    ])
+
+    weight_class_rows = [("0", 0, 0.9999, 0)]
+    bounds = WEIGHT_CLASSES + [None]
+
+    for i, low in enumerate(WEIGHT_CLASSES):
+        high = None if bounds[i + 1] is None else bounds[i + 1] - 0.0001
+        weight_class_rows.append((str(low), low, high, low))
+
+    insert(connection, "weight_class", weight_class_rows)
+
+    connection.commit()
+
+
+def create_lookup_database_file(path: str, materials: int = 6, customers: int = 3):
+    connection = sqlite3.connect(path)
+
+    try:
+        create_lookup_database(connection, materials, customers)
+    finally:
+        connection.close()
+
+
+class TemporaryLookupDatabase:
+    """Lookup database in a temporary directory, with the test configuration that reads it. Compiled models are cached in the same
+    directory, so tests never write into the source tree"""
+
+    def __init__(self, materials: int = 6, customers: int = 3):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.path = os.path.join(self.directory, "ryerson.db")
+
+        create_lookup_database_file(self.path, materials, customers)
+
+    def configuration(self, **settings) -> type[Config]:
+        return type("TestConfig", (Config,), {"connection": self.path, "compiled_model_path": self.directory} | settings)
+
+    def cleanup(self):
+        self._directory.cleanup()
+
+    def __enter__(self) -> "TemporaryLookupDatabase":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cleanup()
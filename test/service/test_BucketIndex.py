@@ -0,0 +1,41 @@
+import sqlite3
+import sys
+from unittest import TestCase
+
+from api.service.bucketindex import BucketIndex
+from api.service.sqllitelookupservice import BUCKET_QUERY
+from test.service.lookupdatabase import create_lookup_database
+
+
+class TestBucketIndex(TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        create_lookup_database(self.connection)
+
+        self.connection.row_factory = sqlite3.Row
+
+    def tearDown(self):
+        self.connection.close()
+
+    def sql_lookup(self, table_id: str, val: float, column: str):
+        row = self.connection.execute(BUCKET_QUERY.format(table_id=table_id), {"max_size": sys.maxsize, "val": val}).fetchone()
+
+        return None if row is None else row[column]
+
+    def test_matches_sql_for_weight_class(self):
+        bucket_index = BucketIndex.load(self.connection, "weight_class")
+        values = [-5, 0, 0.5, 0.9999, 0.99995, 1, 199.9999, 200, 4999.99995, 5000, 39999.9999, 40000, 1e9, sys.maxsize, sys.maxsize + 1.0e4]
+
+        for val in values:
+            self.assertEqual(self.sql_lookup("weight_class", val, "totalquotepounds"), bucket_index.lookup(val, "totalquotepounds"), val)
+
+        self.assertEqual([bucket_index.lookup(val, "uniqueid") for val in values], bucket_index.lookup_many(values, "uniqueid"))
+
+    def test_overlapping_buckets_return_first_row_like_sql(self):
+        self.connection.execute("CREATE TABLE overlapping (uniqueid, min, max)")
+        self.connection.executemany("INSERT INTO overlapping VALUES (?, ?, ?)", [("a", 10, 20), ("b", 0, 15), ("c", 15, None), ("d", None, 5)])
+
+        bucket_index = BucketIndex.load(self.connection, "overlapping")
+
+        for val in [-1, 0, 5, 9.5, 10, 14, 15, 17.5, 20, 21, 1000, sys.maxsize]:
+            self.assertEqual(self.sql_lookup("overlapping", val, "uniqueid"), bucket_index.lookup(val, "uniqueid"), val)
@@ -0,0 +1,66 @@
+import time
+from unittest import TestCase
+
+from api.service.cachinglookupservice import CachingLookupService
+from api.service.lrucache import LruCache, MISSING
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from test.service.lookupdatabase import TemporaryLookupDatabase
+
+
+class TestCachingLookupService(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = TemporaryLookupDatabase()
+
+        cls.sql_service = SqlLiteLookupService(cls.database.configuration())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sql_service.close()
+        cls.database.cleanup()
+
+    def setUp(self):
+        self.statements = list()
+        self.sql_service._connection.set_trace_callback(self.statements.append)
+
+    def tearDown(self):
+        self.sql_service._connection.set_trace_callback(None)
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = LruCache(2)
+
+        cache.put("a", 1)
+        cache.put("b", None)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertIs(MISSING, cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual({"entries": 2, "hits": 2, "misses": 1, "evictions": 1, "expirations": 0}, cache.statistics())
+
+    def test_misses_are_cached_until_they_expire(self):
+        caching_service = CachingLookupService(self.sql_service, 100, 0.2)
+
+        for _ in range(3):
+            self.assertIsNone(caching_service.lookup_cl_code("client", "cl_codes", "C9|OFF0|PLATE|FLAT", None))
+            self.assertIsNone(caching_service.lookup_ship_zone("client", "ship_zone_lookups", "C0|P9", None))
+
+        self.assertEqual(2, len(self.statements))
+        self.assertEqual({"entries": 1, "hits": 2, "misses": 1, "evictions": 0, "expirations": 0}, caching_service.statistics()["cl_codes"])
+
+        time.sleep(0.25)
+
+        caching_service.lookup_cl_code("client", "cl_codes", "c9|off0|plate|flat", None)
+
+        self.assertEqual(3, len(self.statements))
+        self.assertEqual(1, caching_service.statistics()["cl_codes"]["expirations"])
+
+    def test_many_lookups_only_query_uncached_keys(self):
+        caching_service = CachingLookupService(self.sql_service, 100, 0)
+
+        caching_service.lookup_product("client", "products", "CENTRAL|M1", None)
+        products = caching_service.lookup_product_many("client", "products", ["central|m1", "CENTRAL|M2", "CENTRAL|MISSING"])
+        caching_service.lookup_product_many("client", "products", ["CENTRAL|M2", "CENTRAL|MISSING"])
+
+        self.assertEqual(["central|m1", "central|m2"], sorted(products))
+        self.assertEqual(2, len(self.statements))
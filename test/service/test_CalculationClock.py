@@ -0,0 +1,15 @@
+import datetime
+from unittest import TestCase
+
+from api.service.calculationclock import calculation_clock
+
+
+class TestCalculationClock(TestCase):
+    def test_monday_date_is_the_monday_of_the_week(self):
+        for day in range(7):
+            now = datetime.datetime(2024, 2, 26, 13, 30) + datetime.timedelta(days=day)
+
+            self.assertEqual("2024-02-26", calculation_clock(now).monday_date)
+
+        self.assertEqual("2024-03-04", calculation_clock(datetime.datetime(2024, 3, 4)).monday_date)
+        self.assertEqual(datetime.datetime(2025, 2, 28), calculation_clock(datetime.datetime(2024, 2, 29)).year_from_now)
@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from api.exceptions.breakerror import BreakError
+from api.exceptions.symbolnotfounderror import SymbolNotFoundError
+from api.model.calculationnode import CalculationNodeModel as Node
+from api.model.product import ProductModel
+from api.schema.product import ProductSchema
+from api.service.calculationgraph import CalculationGraph, break_when
+from api.service.calculationtrace import CalculationTrace
+
+NODES = [
+    Node("weight", 'float(inputs.get("weight"))', "weight", check=True),
+    Node("weight_found", 'break_when(weight <= 0, "Weight not found.")', check=True),
+    Node("product_info", 'inputs.get("product")', "productInfo", ProductSchema, row=True),
+    Node("pounds", 'weight * 2', "pounds"),
+    Node("tons", 'weight / 2000.0', "tons"),
+    Node("product", 'product_info.product_name.upper()', "product")
+]
+
+
+class TestCalculationGraph(TestCase):
+    def setUp(self):
+        self.graph = CalculationGraph(NODES, ("inputs",), {"break_when": break_when})
+
+    def test_evaluates_only_what_the_targets_need(self):
+        values = self.graph.evaluate(self.graph.plan(["tons"]), {"inputs": {"weight": "500"}}, CalculationTrace("off"))
+
+        self.assertEqual(0.25, values["tons"])
+        self.assertNotIn("pounds", values)
+        self.assertNotIn("product", values)
+
+    def test_checks_run_for_every_plan(self):
+        with self.assertRaises(BreakError):
+            self.graph.evaluate(self.graph.plan(["tons"]), {"inputs": {"weight": "0"}}, CalculationTrace("off"))
+
+        self.assertEqual(["weight", "weight_found", "pounds"], [step.name for step in self.graph.plan(["pounds"])])
+
+    def test_trace_keeps_traced_nodes_in_order(self):
+        trace = CalculationTrace("full")
+        product = ProductModel(product_name="Bar")
+
+        self.graph.evaluate(self.graph.plan(self.graph.traced()), {"inputs": {"weight": "500", "product": product}}, trace)
+
+        self.assertEqual(["weight", "productInfo", "pounds", "tons", "product"], list(trace))
+        self.assertEqual(ProductSchema().dump(product), trace["productInfo"])
+        self.assertEqual([("productInfo", ProductSchema().dump(product)), ("pounds", 1000.0)], list(self.graph.read([("productInfo", "product_info"), ("pounds", "pounds")], {"product_info": product, "pounds": 1000.0})))
+
+    def test_rows_that_are_not_found_are_not_traced(self):
+        trace = CalculationTrace("full")
+
+        self.graph.evaluate(self.graph.plan(["pounds", "product_info"]), {"inputs": {"weight": "500", "product": None}}, trace)
+
+        self.assertEqual(["weight", "pounds"], list(trace))
+
+    def test_names_must_be_declared_before_they_are_read(self):
+        with self.assertRaises(SymbolNotFoundError):
+            CalculationGraph([Node("tons", 'weight / 2000.0'), Node("weight", '1.0')], ("inputs",), {})
+
+        with self.assertRaises(SymbolNotFoundError):
+            self.graph.plan(["margin"])
+
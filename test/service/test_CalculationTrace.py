@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from api.model.product import ProductModel
+from api.schema.product import ProductSchema
+from api.service.calculationtrace import CalculationTrace, trace_level
+
+
+class CountingProductSchema(ProductSchema):
+    dumps = 0
+
+    def dump(self, obj, *, many=None):
+        CountingProductSchema.dumps += 1
+
+        return super().dump(obj, many=many)
+
+
+class TestCalculationTrace(TestCase):
+    def trace(self, level: str) -> CalculationTrace:
+        trace = CalculationTrace(level)
+        trace["weight"] = 1200.0
+        trace.update((f"recPriceWC{name}", price) for (name, price) in [("1", "2.5"), ("200", "2.1")])
+        trace.dump("productInfo", CountingProductSchema, ProductModel(material="M"))
+
+        return trace
+
+    def test_off_keeps_nothing(self):
+        self.assertEqual({}, dict(self.trace("off")))
+
+    def test_keys_keeps_values_without_rows(self):
+        self.assertEqual({"weight": 1200.0, "recPriceWC1": "2.5", "recPriceWC200": "2.1"}, dict(self.trace("keys")))
+
+    def test_full_dumps_rows_once_when_read(self):
+        CountingProductSchema.dumps = 0
+        trace = self.trace("Full")
+
+        self.assertEqual(["weight", "recPriceWC1", "recPriceWC200", "productInfo"], list(trace))
+        self.assertEqual(0, CountingProductSchema.dumps)
+
+        self.assertEqual("M", trace["productInfo"]["material"])
+        self.assertEqual(trace["productInfo"], dict(trace)["productInfo"])
+        self.assertEqual(1, CountingProductSchema.dumps)
+
+    def test_unknown_level_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CalculationTrace("verbose")
+
+    def test_configured_levels_are_normalized(self):
+        self.assertEqual("full", trace_level(" Full "))
+        self.assertEqual("keys", CalculationTrace("KEYS").level)
+
+        with self.assertRaises(ValueError):
+            trace_level("Fulll")
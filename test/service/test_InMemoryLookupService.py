@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from api.service.inmemorylookupservice import InMemoryLookupService
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from test.service.lookupdatabase import TemporaryLookupDatabase
+
+
+def as_comparable(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+
+    return value._asdict()
+
+
+class TestInMemoryLookupService(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = TemporaryLookupDatabase()
+
+        cls.configuration = cls.database.configuration()
+
+        cls.sql_service = SqlLiteLookupService(cls.configuration)
+        cls.memory_service = InMemoryLookupService(cls.configuration)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sql_service._connection.close()
+        cls.database.cleanup()
+
+    def assert_same_lookup(self, method: str, table_id: str, labels: list[str]):
+        for label in labels:
+            expected = getattr(self.sql_service, method)("client", table_id, label, None)
+            actual = getattr(self.memory_service, method)("client", table_id, label, None)
+
+            self.assertEqual(as_comparable(expected), as_comparable(actual), f"{method}({label})")
+
+    def test_uniqueid_lookups_match_sql(self):
+        self.assert_same_lookup("lookup_product", "products", ["CENTRAL|M1", "south|m4", "CENTRAL|MISSING"])
+        self.assert_same_lookup("lookup_customer", "customers", ["C0|OFF0", "c1|off1", "C9|OFF0"])
+        self.assert_same_lookup("lookup_tm_adjustment", "tm_adjustments", ["MIDWEST|PLATE|FLAT", "midwest|bar|round", "X|Y|Z"])
+        self.assert_same_lookup("lookup_target_margin", "target_margin_lookups", ["ISR0|BW1", "ISR9|BW1"])
+        self.assert_same_lookup("lookup_cl_code", "cl_codes", ["C0|OFF0|PLATE|FLAT", "C0|OFF0|BAR|ROUND"])
+        self.assert_same_lookup("lookup_automated_tuning", "automated_tuning_lookup", ["LG1|PLATE|FR", "LG9|PLATE|FR"])
+        self.assert_same_lookup("lookup_packaging_cost", "packaging_cost_lookups", ["M1|P2", "m2|9999", "M1|P9"])
+
+    def test_exchange_rate_matches_sql(self):
+        self.assert_same_lookup("lookup_exchange_rate", "products", ["CENTRAL", "central", "NORTH"])
+
+    def test_customer_fallbacks_match_sql(self):
+        self.assertEqual(as_comparable(self.sql_service.get_customer_without_office("c1")), as_comparable(self.memory_service.get_customer_without_office("c1")))
+        self.assertEqual(as_comparable(self.sql_service.get_default_office("OFF0")), as_comparable(self.memory_service.get_default_office("OFF0")))
+        self.assertIsNone(self.memory_service.get_default_office("OFF9"))
+
+    def test_bucketed_lookup_matches_sql(self):
+        for value in [0.5, 1, 199, 200, 4999.5, 40000, 250000]:
+            expected = self.sql_service.bucketed_lookup("client", "weight_class", value, "totalquotepounds")
+            actual = self.memory_service.bucketed_lookup("client", "weight_class", value, "totalquotepounds")
+
+            self.assertEqual(expected, actual, value)
+
+    def test_op_code_lookup_matches_sql(self):
+        for args in [("SAW", 100.0, 50.0), ("SAW", 600.0, 50.0), ("SAW", 600.0, 500.0), ("BURN", 1.0, 1.0), ("NONE", 1.0, 1.0)]:
+            self.assertEqual(as_comparable(self.sql_service.lookup_op_code(*args)), as_comparable(self.memory_service.lookup_op_code(*args)), args)
@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+from requests.structures import CaseInsensitiveDict
+
+from api.service.inmemorylookupservice import InMemoryLookupService
+from api.service.linecontext import line_context_keys, compose_line_context
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from test.service.lookupdatabase import TemporaryLookupDatabase
+
+LINES = [
+    {"rcMapping": "CENTRAL", "material": "M1", "stockPlant": "P1", "shipPlant": "P2", "isrOffice": "ISR0", "sapInd": "Y"},
+    {"rcMapping": "south", "material": "m4", "stockPlant": "P1", "shipPlant": "P3", "isrOffice": "ISR1", "sapInd": "N"},
+    {"rcMapping": "SOUTH_SAP", "material": "M2", "stockPlant": "P1", "shipPlant": "P2", "isrOffice": "ISR0", "sapInd": "Y"},
+    {"rcMapping": "CENTRAL", "material": "M8", "stockPlant": "P1", "shipPlant": "P2", "isrOffice": "ISR0", "sapInd": "Y"},
+    {"rcMapping": "CENTRAL", "material": "MISSING", "stockPlant": "P1", "shipPlant": "P2", "isrOffice": "ISR0", "sapInd": "Y"},
+    {"rcMapping": "CENTRAL", "material": None, "stockPlant": "P1", "shipPlant": "P2", "sapInd": None}
+]
+
+
+class TestLineContext(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = TemporaryLookupDatabase()
+
+        configuration = cls.database.configuration()
+
+        cls.sql_service = SqlLiteLookupService(configuration)
+        cls.memory_service = InMemoryLookupService(configuration)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sql_service.close()
+        cls.database.cleanup()
+
+    def test_joined_query_matches_single_lookups(self):
+        statements = list()
+
+        for line in LINES:
+            keys = line_context_keys(CaseInsensitiveDict(line))
+            expected = compose_line_context(self.sql_service, "client", keys)
+
+            self.sql_service._connection.set_trace_callback(statements.append)
+
+            try:
+                actual = self.sql_service.lookup_line_context("client", keys)
+            finally:
+                self.sql_service._connection.set_trace_callback(None)
+
+            self.assertEqual(expected, actual, line)
+            self.assertEqual(expected, self.memory_service.lookup_line_context("client", keys), line)
+
+        self.assertEqual(len(LINES), len(statements))
+
+    def test_keys_follow_the_line_inputs(self):
+        keys = line_context_keys(CaseInsensitiveDict(LINES[2]))
+
+        self.assertEqual("SOUTH_SAP|M2", keys.product_key)
+        self.assertEqual("M2|9999", keys.overhead_group_key)
+        self.assertIsNone(line_context_keys(CaseInsensitiveDict(LINES[1])).overhead_group_key)
+        self.assertIsNone(line_context_keys(CaseInsensitiveDict(LINES[5])).material_sales_office_key)
+
+    def test_cost_plus_material_is_its_own_bellwether(self):
+        context = self.sql_service.lookup_line_context("client", line_context_keys(CaseInsensitiveDict(LINES[2] | {"rcMapping": "CENTRAL"})))
+
+        self.assertEqual("CPL", context.cost_adjustment.material_classification)
+        self.assertEqual("M2|P2", context.mill_to_plant_freight_key)
+        self.assertEqual("M2", context.product.material)
+        self.assertEqual("OG2", context.packaging_cost.overhead_group)
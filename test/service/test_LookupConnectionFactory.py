@@ -0,0 +1,46 @@
+import os
+import sqlite3
+from unittest import TestCase
+
+from api.service.lookupconnectionfactory import LookupConnectionFactory
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from test.service.lookupdatabase import TemporaryLookupDatabase
+
+
+class TestLookupConnectionFactory(TestCase):
+    def setUp(self):
+        self.database = TemporaryLookupDatabase()
+
+        self.shm_directory = os.path.join(self.database.directory, "shm")
+        os.mkdir(self.shm_directory)
+
+    def tearDown(self):
+        self.database.cleanup()
+
+    def configuration(self, **settings):
+        return self.database.configuration(**settings)
+
+    def test_read_only_connection_applies_pragmas_and_refuses_writes(self):
+        connection = LookupConnectionFactory(self.configuration(lookup_open_mode="readonly", lookup_mmap_size=1048576)).connect()
+
+        try:
+            self.assertEqual(1048576, connection.execute("PRAGMA mmap_size").fetchone()[0])
+            self.assertEqual(1, connection.execute("PRAGMA query_only").fetchone()[0])
+
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute("DELETE FROM products")
+        finally:
+            connection.close()
+
+    def test_shm_copy_serves_the_same_lookups(self):
+        configuration = self.configuration(lookup_open_mode="readonly", lookup_shm_copy=True, lookup_shm_directory=self.shm_directory)
+
+        read_only_service = SqlLiteLookupService(configuration)
+        default_service = SqlLiteLookupService(self.configuration())
+
+        try:
+            self.assertEqual(os.path.join(self.shm_directory, "ryerson.db"), LookupConnectionFactory(configuration).database_path)
+            self.assertEqual(default_service.lookup_product("client", "products", "CENTRAL|M1", None)._asdict(), read_only_service.lookup_product("client", "products", "central|m1", None)._asdict())
+        finally:
+            read_only_service.close()
+            default_service.close()
@@ -0,0 +1,41 @@
+import sqlite3
+from unittest import TestCase
+
+from api.exceptions.lookupindexerror import LookupIndexError
+from api.service.lookupindexprovisioner import LookupIndexProvisioner, check_lookup_indexes
+from test.service.lookupdatabase import create_lookup_database, TemporaryLookupDatabase
+
+
+class TestLookupIndexProvisioner(TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        create_lookup_database(self.connection)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_provision_removes_table_scans(self):
+        provisioner = LookupIndexProvisioner(self.connection)
+
+        self.assertIn("lookup products", provisioner.find_table_scans())
+        self.assertIn("get_customer_without_office", provisioner.find_table_scans())
+
+        self.assertGreater(len(provisioner.provision()), 0)
+        self.assertEqual({}, provisioner.find_table_scans())
+        self.assertEqual([], provisioner.provision())
+
+    def test_strict_check_refuses_unindexed_database(self):
+        with TemporaryLookupDatabase() as database:
+            strict = database.configuration(lookup_index_check="strict")
+
+            with self.assertRaises(LookupIndexError):
+                check_lookup_indexes(strict)
+
+            connection = sqlite3.connect(database.path)
+
+            try:
+                LookupIndexProvisioner(connection).provision()
+            finally:
+                connection.close()
+
+            check_lookup_indexes(strict)
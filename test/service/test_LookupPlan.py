@@ -0,0 +1,32 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from api.service.lookupplan import LookupPlan
+
+
+class TestLookupPlan(TestCase):
+    def test_independent_lookups_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        with ThreadPoolExecutor(2) as executor:
+            plan = LookupPlan(executor)
+
+            products = plan.submit(lambda key: barrier.wait() is not None and {key: "product"}, "m1")
+            cost_adjustments = plan.submit(lambda key: barrier.wait() is not None and {key: "cost"}, "m1|p1")
+            dependent = plan.submit(lambda: products.result()["m1"] + "|" + cost_adjustments.result()["m1|p1"])
+
+            plan.wait()
+
+        self.assertEqual("product|cost", dependent.result())
+
+    def test_inline_plan_raises_on_wait(self):
+        plan = LookupPlan(None)
+
+        first = plan.submit(lambda: 1)
+        plan.submit(lambda: 1 / 0)
+
+        self.assertEqual(1, first.result())
+
+        with self.assertRaises(ZeroDivisionError):
+            plan.wait()
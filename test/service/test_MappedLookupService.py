@@ -0,0 +1,86 @@
+import os
+import sqlite3
+from unittest import TestCase
+
+from api.service.lookupstore import LookupStore, ensure_lookup_store, compile_lookup_store
+from api.service.mappedlookupservice import MappedLookupService
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from test.service.lookupdatabase import insert, TemporaryLookupDatabase
+
+
+class TestMappedLookupService(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = TemporaryLookupDatabase()
+
+        cls.configuration = cls.database.configuration(lookup_shm_directory=cls.database.directory)
+
+        cls.sql_service = SqlLiteLookupService(cls.configuration)
+        cls.mapped_service = MappedLookupService(cls.configuration)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sql_service.close()
+        cls.database.cleanup()
+
+    def assert_same_lookup(self, method: str, table_id: str, labels: list[str]):
+        for label in labels:
+            expected = getattr(self.sql_service, method)("client", table_id, label, None)
+            actual = getattr(self.mapped_service, method)("client", table_id, label, None)
+
+            self.assertEqual(expected, actual, f"{method}({label})")
+
+    def test_lookups_match_sql(self):
+        self.assert_same_lookup("lookup_product", "products", ["CENTRAL|M1", "south|m4", "CENTRAL|MISSING"])
+        self.assert_same_lookup("lookup_customer", "customers", ["C0|OFF0", "c1|off1", "C9|OFF0"])
+        self.assert_same_lookup("lookup_tm_adjustment", "tm_adjustments", ["MIDWEST|PLATE|FLAT", "midwest|bar|round", "X|Y|Z"])
+        self.assert_same_lookup("lookup_target_margin", "target_margin_lookups", ["ISR0|BW1", "ISR9|BW1"])
+        self.assert_same_lookup("lookup_ido", "ido_lookup", ["P1|P2", "p1|p3", "P9|P2"])
+        self.assert_same_lookup("lookup_packaging_cost", "packaging_cost_lookups", ["M1|P2", "m2|9999", "M1|P9"])
+        self.assert_same_lookup("lookup_exchange_rate", "products", ["CENTRAL", "central", "NORTH"])
+
+        self.assertEqual(self.sql_service.get_default_office("OFF0"), self.mapped_service.get_default_office("off0"))
+        self.assertEqual(self.sql_service.lookup_op_code("SAW", 600.0, 50.0), self.mapped_service.lookup_op_code("SAW", 600.0, 50.0))
+        self.assertEqual(self.sql_service.bucketed_lookup("client", "weight_class", 199, "totalquotepounds"), self.mapped_service.bucketed_lookup("client", "weight_class", 199, "totalquotepounds"))
+
+    def test_store_keeps_column_types(self):
+        store = LookupStore(ensure_lookup_store(self.configuration))
+        ido_lookup = store.table("ido_lookup")
+
+        self.assertEqual(("P1|P2", "P1", "P2", 1.5, 500.0, 10.0), ido_lookup.row(0))
+        self.assertEqual({"d"}, {column["kind"] for column in store.directory["tables"]["ido_lookup"]["columns"][3:]})
+
+    def test_store_is_rebuilt_when_the_database_changes(self):
+        database = TemporaryLookupDatabase()
+        connection = sqlite3.connect(database.path)
+        configuration = database.configuration(lookup_shm_directory=database.directory)
+
+        try:
+            store_path = ensure_lookup_store(configuration)
+            modified = os.stat(store_path).st_mtime_ns
+
+            self.assertEqual(store_path, ensure_lookup_store(configuration))
+            self.assertEqual(modified, os.stat(store_path).st_mtime_ns)
+
+            insert(connection, "ido_lookup", [("P4|P2", "P4", "P2", None, 5.0, 1)])
+            connection.commit()
+            os.utime(database.path, ns=(modified + 10 ** 9, modified + 10 ** 9))
+
+            service = MappedLookupService(configuration)
+
+            self.assertEqual((None, 1.0, 5.0), tuple(service.lookup_ido("client", "ido_lookup", "p4|p2", None)[3:]))
+        finally:
+            connection.close()
+            database.cleanup()
+
+    def test_compiled_store_is_mapped_as_is(self):
+        store_path = os.path.join(self.database.directory, "compiled.store")
+
+        compile_lookup_store(self.configuration.connection, store_path)
+
+        configuration = type("TestConfig", (self.configuration,), {"lookup_store_path": store_path, "connection": os.path.join(self.database.directory, "missing.db")})
+        service = MappedLookupService(configuration)
+
+        self.assertEqual(self.sql_service.lookup_product("client", "products", "CENTRAL|M1", None), service.lookup_product("client", "products", "central|m1", None))
+        self.assertEqual(self.sql_service.get_customer_without_office("C1"), service.get_customer_without_office("c1"))
+        self.assertIsNone(service.lookup_cl_code("client", "cl_codes", "C9|OFF0|PLATE|FLAT", None))
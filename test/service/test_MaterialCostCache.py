@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+from requests.structures import CaseInsensitiveDict
+
+from api.service.materialcostcache import MaterialCostCache
+from api.service.quotelinesapgraph import material_cost_key, material_cost_value, material_costs
+from api.service.requestlookupservice import RequestLookupService
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from test.service.lookupdatabase import TemporaryLookupDatabase
+
+
+class TestMaterialCostCache(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = TemporaryLookupDatabase()
+
+        cls.sql_service = SqlLiteLookupService(cls.database.configuration())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sql_service.close()
+        cls.database.cleanup()
+
+    def setUp(self):
+        self.calculated = list()
+
+    def calculate(self, inputs, client_id, lookup_service):
+        self.calculated.append(inputs.get("material"))
+
+        return material_costs(inputs, client_id, lookup_service)
+
+    @staticmethod
+    def line(**values) -> CaseInsensitiveDict:
+        inputs = {"rcMapping": "CENTRAL", "material": "M1", "stockPlant": "P1", "shipPlant": "P2", "sapInd": "Y", "customerId": "C0", "isrOffice": "OFF0"}
+
+        return CaseInsensitiveDict(inputs | values)
+
+    def test_customers_share_the_material_costs_of_a_snapshot(self):
+        cache = MaterialCostCache(material_cost_key, self.calculate, 100)
+
+        first = cache.get(self.line(), "client", RequestLookupService(self.sql_service))
+        second = cache.get(self.line(customerId="C1", isrOffice="OFF1"), "client", RequestLookupService(self.sql_service))
+
+        self.assertIs(first, second)
+        self.assertEqual(["M1"], self.calculated)
+        self.assertEqual(1, cache.statistics(self.sql_service)["hits"])
+
+        # Lines of a new snapshot are calculated from its own lookups
+        snapshot_service = SqlLiteLookupService(self.database.configuration())
+
+        try:
+            cache.get(self.line(), "client", snapshot_service)
+            cache.get(self.line(material=1), "client", snapshot_service)
+            cache.get(self.line(material=1.0), "client", snapshot_service)
+        finally:
+            snapshot_service.close()
+
+        self.assertEqual(["M1", "M1", 1, 1.0], self.calculated)
+
+    def test_lines_that_can_not_be_cached_are_calculated_every_time(self):
+        cache = MaterialCostCache(material_cost_key, self.calculate, 100)
+        disabled_cache = MaterialCostCache(material_cost_key, self.calculate, 0)
+
+        for _ in range(2):
+            cache.get(self.line(material=["M1"]), "client", self.sql_service)
+            disabled_cache.get(self.line(), "client", self.sql_service)
+
+        self.assertEqual(4, len(self.calculated))
+        self.assertEqual({}, disabled_cache.statistics(self.sql_service))
+
+    def test_failed_fields_raise_where_they_are_read(self):
+        costs = material_costs(self.line(sapInd=None), "client", self.sql_service)
+
+        self.assertEqual("M1", material_cost_value(costs, "product_info").material)
+        self.assertEqual(costs.ido_info, material_cost_value(costs, "ido_info"))
+
+        for name in ["packaging_cost_info", "unit_handling_cost", "stocking_cost_per_pound"]:
+            with self.assertRaises(AttributeError):
+                material_cost_value(costs, name)
+
+        self.assertTrue(all(error.__traceback__ is None for (name, error) in costs.errors))
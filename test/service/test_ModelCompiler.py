@@ -0,0 +1,89 @@
+import math
+import os
+import tempfile
+from unittest import TestCase
+
+from api.exceptions.breakerror import BreakError
+from api.model.calculationnode import CalculationNodeModel as Node
+from api.service.calculationgraph import CalculationGraph, break_when
+from api.service.calculationtrace import CalculationTrace
+from api.service.modelcompiler import ModelCompiler
+
+NODES = [
+    Node("weight", 'float(inputs.get("weight"))', check=True),
+    Node("sap_ind", 'inputs.get("sapind")'),
+    Node("weight_found", 'break_when(weight <= 0, "Weight not found.")', check=True),
+    Node("skid_charge", 'lookups["skid"] if sap_ind.casefold() == "N".casefold() else None'),
+    Node("packaging_cost", 'lookups["packaging"] if sap_ind.casefold() == "Y".casefold() else 0.0'),
+    Node("skid_cost", '0.0 if skid_charge is None else skid_charge * math.ceil(weight / 2000.0)'),
+    Node("order_cost", '(packaging_cost + skid_cost) / weight')
+]
+
+VARIANTS = {sap_ind: {'sap_ind.casefold()': sap_ind} for sap_ind in ["y", "n"]}
+
+
+class CountingModelCompiler(ModelCompiler):
+    generated = 0
+
+    def generate(self, targets, specialization):
+        CountingModelCompiler.generated += 1
+
+        return super().generate(targets, specialization)
+
+
+class TestModelCompiler(TestCase):
+    def setUp(self):
+        self.graph = CalculationGraph(NODES, ("inputs", "lookups"), {"math": math, "break_when": break_when})
+
+    def evaluate(self, inputs: dict) -> dict:
+        values = self.graph.evaluate(self.graph.plan(["order_cost"]), {"inputs": inputs, "lookups": {"skid": 30.0, "packaging": 12.0}}, CalculationTrace("off"))
+
+        return {"order_cost": values["order_cost"]}
+
+    def test_specialized_paths_match_the_graph(self):
+        compiler = ModelCompiler(self.graph, "orderCost", 1)
+
+        for (sap_ind, specialization) in VARIANTS.items():
+            for weight in ["500", "4500"]:
+                inputs = {"weight": weight, "sapind": sap_ind.upper()}
+
+                self.assertEqual(self.evaluate(inputs), compiler.compile(["order_cost"], specialization)(inputs, {"skid": 30.0, "packaging": 12.0}))
+                self.assertEqual(self.evaluate(inputs), compiler.compile(["order_cost"])(inputs, {"skid": 30.0, "packaging": 12.0}))
+
+    def test_branches_a_specialization_rules_out_are_removed(self):
+        compiler = ModelCompiler(self.graph, "orderCost", 1)
+
+        sap_source = compiler.generate(("order_cost",), VARIANTS["y"])
+        non_sap_source = compiler.generate(("order_cost",), VARIANTS["n"])
+
+        self.assertNotIn("skid", sap_source)
+        self.assertIn("order_cost = (packaging_cost + 0.0) / weight", sap_source)
+        self.assertNotIn("packaging", non_sap_source)
+        self.assertNotIn("sap_ind", non_sap_source)
+
+    def test_checks_raise_inline(self):
+        function = ModelCompiler(self.graph, "orderCost", 1).compile(["order_cost"], VARIANTS["y"])
+
+        with self.assertRaises(BreakError):
+            function({"weight": "0", "sapind": "Y"}, {})
+
+        with self.assertRaises(ValueError):
+            function({"weight": "heavy", "sapind": "Y"}, {})
+
+    def test_compiled_code_is_cached_on_disk(self):
+        with tempfile.TemporaryDirectory() as cache_path:
+            CountingModelCompiler.generated = 0
+
+            first = CountingModelCompiler(self.graph, "orderCost", 1, cache_path).compile(["order_cost"], VARIANTS["n"])
+            second = CountingModelCompiler(self.graph, "orderCost", 1, cache_path).compile(["order_cost"], VARIANTS["n"])
+            CountingModelCompiler(self.graph, "orderCost", 2, cache_path).compile(["order_cost"], VARIANTS["n"])
+
+            self.assertEqual(2, CountingModelCompiler.generated)
+            self.assertEqual(4, len(os.listdir(cache_path)))
+            self.assertEqual(first({"weight": "4500", "sapind": "N"}, {"skid": 30.0}), second({"weight": "4500", "sapind": "N"}, {"skid": 30.0}))
+
+    def test_nodes_can_not_hide_namespace_names(self):
+        graph = CalculationGraph([Node("math", '1.0')], ("inputs",), {"math": None})
+
+        with self.assertRaises(ValueError):
+            ModelCompiler(graph, "hidden", 1)
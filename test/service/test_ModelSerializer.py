@@ -0,0 +1,30 @@
+import datetime
+from unittest import TestCase
+
+from api.model.product import ProductModel
+from api.model.sapfreight import SapFreightModel
+from api.schema.freight import FreightSchema
+from api.schema.product import ProductSchema
+from api.schema.responsewrapperwithmeta import ResponseWrapperWithMetaSchema
+from api.service.modelserializer import model_serializer
+
+
+class TestModelSerializer(TestCase):
+    def test_dumps_models_as_the_schema_does(self):
+        product = ProductModel("M|1", "CENTRAL", "M", "BW", "Bar", "Round", "IDX", 1.25, 0.5, 0.0, 3.0, 1.75, 12.0, 40.0, 25.0, "Round bar", 1.0)
+
+        self.assertEqual(ProductSchema().dump(product), model_serializer(ProductSchema)(product))
+        self.assertIs(model_serializer(ProductSchema), model_serializer(ProductSchema))
+
+    def test_leaves_out_fields_the_model_does_not_have(self):
+        self.assertEqual(FreightSchema().dump(SapFreightModel()), model_serializer(FreightSchema)(SapFreightModel()))
+
+    def test_values_that_are_not_plain_go_through_the_schema(self):
+        product = ProductModel(unique_id="M|1", bellwether_base_cost=datetime.date(2022, 5, 2))
+
+        self.assertEqual("2022-05-02", model_serializer(ProductSchema)(product)["bellwether_base_cost"])
+
+    def test_declared_fields_go_through_the_schema(self):
+        response = {"data": {"recPriceWC1": "2.5"}, "metadata": {"lookupversion": 3}}
+
+        self.assertEqual(ResponseWrapperWithMetaSchema().dump(response), model_serializer(ResponseWrapperWithMetaSchema)(response))
@@ -0,0 +1,46 @@
+import random
+import sqlite3
+from unittest import TestCase
+
+from api.service.opcodeindex import OpCodeIndex
+from api.service.sqllitelookupservice import OP_CODE_QUERY, op_code_from_row
+from test.service.lookupdatabase import create_lookup_database, insert
+
+
+class TestOpCodeIndex(TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        create_lookup_database(self.connection)
+
+        self.connection.row_factory = sqlite3.Row
+
+    def tearDown(self):
+        self.connection.close()
+
+    def assert_matches_sql(self, op_codes: list[str], weights: list[float]):
+        op_code_index = OpCodeIndex.load(self.connection, op_code_from_row)
+
+        for op_code in op_codes:
+            for adjusted_net_weight in weights:
+                for net_weight in weights:
+                    row = self.connection.execute(OP_CODE_QUERY, {"op_code": op_code, "adjusted_net_weight": adjusted_net_weight, "net_weight": net_weight}).fetchone()
+                    found = op_code_index.find(op_code, adjusted_net_weight, net_weight)
+
+                    self.assertEqual(None if row is None else row["uniqueid"], None if found is None else found.unique_id, (op_code, adjusted_net_weight, net_weight))
+
+    def test_matches_sql_on_seeded_op_codes(self):
+        self.assert_matches_sql(["SAW", "BURN", "saw", "NONE"], [-1.0, 0.0, 50.0, 99.9, 100.0, 500.0, 4999.0, 5000.0, 10000.0, 20000.0])
+
+    def test_overlapping_ranges_return_first_row_like_sql(self):
+        generator = random.Random(7)
+        rows = list()
+
+        for i in range(40):
+            net_weight_low = generator.choice([0.0, 10.0, 25.0, 50.0, 100.0])
+            piece_weight_low = generator.choice([0.0, 5.0, 20.0, 40.0])
+
+            rows.append((f"R{i}", "MIX", "CUT", "N", net_weight_low, net_weight_low + generator.choice([10.0, 40.0, 200.0]), piece_weight_low, piece_weight_low + generator.choice([5.0, 30.0, 100.0]), 1.0, "A"))
+
+        insert(self.connection, "opcodes", rows)
+
+        self.assert_matches_sql(["MIX"], [-5.0, 0.0, 4.9, 5.0, 10.0, 19.99, 20.0, 25.0, 35.0, 40.0, 49.0, 50.0, 75.0, 100.0, 140.0, 250.0, 300.0, 1000.0])
@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from api.service.miscoperations import MiscOperations
+from api.service.partitionvaluecache import PartitionValueCache
+
+
+class TestPartitionValueCache(TestCase):
+    def test_values_match_the_hash_and_reset_weekly(self):
+        cache = PartitionValueCache(100)
+
+        for value in ["C0|OFF0|BW1|2024-02-26|SALT", "C0|OFF0|M1|IE_COST_ADJUSTMENT_TEST"]:
+            self.assertEqual(MiscOperations.get_partition_value(value), cache.get(value, "2024-02-26"))
+            self.assertEqual(MiscOperations.get_partition_value(value), cache.get(value, "2024-02-26"))
+
+        self.assertEqual(2, len(cache))
+
+        cache.get("C0|OFF0|BW1|2024-03-04|SALT", "2024-03-04")
+
+        self.assertEqual(1, len(cache))
+
+    def test_cache_is_bounded(self):
+        cache = PartitionValueCache(3)
+
+        for customer in range(10):
+            cache.get(f"C{customer}|OFF0|M1|IE_COST_ADJUSTMENT_TEST", "2024-02-26")
+
+        self.assertLessEqual(len(cache), 3)
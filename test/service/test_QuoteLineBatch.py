@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+from unittest import TestCase
+
+from requests.structures import CaseInsensitiveDict
+
+from api.service.modelservice import ModelService
+from api.service.queuedlogger import QueuedLogger
+from api.service.quotelinebatch import QuoteLineBatch
+from api.service.quotelinesap import QuoteLineSap
+from api.service.requestlookupservice import RequestLookupService
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from test.service.lookupdatabase import TemporaryLookupDatabase
+
+
+def quote_line(material: str, ship_plant: str, weight: float, sap_ind: str) -> dict:
+    return {
+        "material": material, "itemNumber": f"{material}-{ship_plant}-{weight}", "shipPlant": ship_plant, "stockPlant": "P1", "weight": weight,
+        "rcMapping": "CENTRAL" if sap_ind == "Y" else "SOUTH", "isrOffice": "ISR0", "multiMarket": "MIDWEST", "customerId": "C0", "customerName": "Customer 0",
+        "sapInd": sap_ind, "customerSalesOffice": "OFF0", "shipToState": "IL", "shipToZipCode": "60601", "isrName": None, "dsoAdder": 0.0, "waiveSkid": "N",
+        "dollarAdder": 5.0, "percentAdder": 0.02, "totalQuotePounds": 4000.0, "IndependentCalculationFlag": False
+    }
+
+
+class ThreadRecordingLookupService(SqlLiteLookupService):
+    def __init__(self, configuration):
+        super().__init__(configuration)
+        self.threads = set()
+
+    def lookup_target_margin_many(self, client_id: str, table_id: str, labels: list[str]) -> dict[str, float]:
+        self.threads.add(threading.current_thread().name)
+
+        return super().lookup_target_margin_many(client_id, table_id, labels)
+
+
+class TestQuoteLineBatch(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = TemporaryLookupDatabase()
+
+        cls.configuration = cls.database.configuration(disable_Logging=True, fan_out="False")
+        cls.sql_service = SqlLiteLookupService(cls.configuration)
+        cls.quote_line_sap = QuoteLineSap(lambda: cls.sql_service, QueuedLogger(), cls.configuration)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sql_service.close()
+        cls.database.cleanup()
+
+    def test_lines_are_read_from_json_arrays_and_json_lines(self):
+        lines = [{"material": "M1", "weight": 10.0}, {"Weight": 20.0, "material": "M2", "opCode": "SAW"}]
+
+        for text in [json.dumps(lines), "\n".join(json.dumps(line) for line in lines) + "\n\n"]:
+            path = os.path.join(self.database.directory, "lines.json")
+
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(text)
+
+            batch = QuoteLineBatch.from_file(path)
+
+            self.assertEqual(2, len(batch))
+            self.assertEqual(lines, batch.lines())
+            self.assertEqual(lines[1], batch.line(1))
+
+    def test_batch_prices_lines_as_execute_model_does(self):
+        lines = [quote_line(material, ship_plant, weight, sap_ind) for (material, ship_plant, weight, sap_ind) in [("M1", "P2", 150.0, "Y"), ("M2", "P3", 12000.0, "Y"), ("M4", "P2", 900.0, "N"), ("M9", "P2", 900.0, "Y")]]
+        lines[1]["bundles"] = 3
+        lines[2]["bundles"] = 2
+        lines[2]["BUNDLES"] = None
+
+        for debug_mode in [False, True]:
+            model = ModelService().get_model("quotelinesap", debug_mode)
+
+            expected = [self.quote_line_sap.execute_model("me", "client", model, CaseInsensitiveDict({"ModelInputs": dict(line), "IncludeInResponse": None}), "", "", RequestLookupService(self.sql_service)) for line in lines]
+            actual = self.quote_line_sap.execute_batch("me", "client", model, QuoteLineBatch.from_lines(lines), "", "", self.sql_service)
+
+            # Dates defaulted from the clock differ between runs
+            for output in expected + actual:
+                output.pop("startEffectiveDate", None)
+                output.pop("endEffectiveDate", None)
+
+            self.assertEqual(expected, actual)
+
+    def test_missing_required_inputs_are_reported_for_the_line(self):
+        lines = [quote_line("M1", "P2", 150.0, "Y"), quote_line("M2", "P2", 150.0, "Y")]
+        lines[1]["weight"] = None
+        del lines[1]["stockPlant"]
+
+        with self.assertRaisesRegex(Exception, "all required inputs not set.  stockPlant,weight"):
+            self.quote_line_sap.execute_batch("me", "client", ModelService().get_model("quotelinesap", False), QuoteLineBatch.from_lines(lines), "", "", self.sql_service)
+
+    def test_single_lines_plan_their_lookups_on_the_lookup_workers(self):
+        configuration = type("TestConfig", (self.configuration,), {"lookup_concurrency": 2})
+        recording_service = ThreadRecordingLookupService(configuration)
+        model = ModelService().get_model("quotelinesap", False)
+
+        try:
+            concurrent_quote_line_sap = QuoteLineSap(lambda: recording_service, QueuedLogger(), configuration)
+
+            for line in [quote_line("M1", "P2", 150.0, "Y"), quote_line("M4", "P2", 900.0, "N")]:
+                expected = self.quote_line_sap.execute_model("me", "client", model, CaseInsensitiveDict({"ModelInputs": dict(line), "IncludeInResponse": None}), "", "", RequestLookupService(self.sql_service))
+                actual = concurrent_quote_line_sap.execute_model("me", "client", model, CaseInsensitiveDict({"ModelInputs": dict(line), "IncludeInResponse": None}), "", "", RequestLookupService(recording_service))
+
+                for output in [expected, actual]:
+                    output.pop("startEffectiveDate", None)
+                    output.pop("endEffectiveDate", None)
+
+                self.assertEqual(expected, actual)
+        finally:
+            recording_service.close()
+
+        self.assertTrue(all(name.startswith("lookup") for name in recording_service.threads), recording_service.threads)
+        self.assertNotEqual(set(), recording_service.threads)
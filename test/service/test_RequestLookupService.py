@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+from api.service.cachinglookupservice import CachingLookupService
+from api.service.inmemorylookupservice import InMemoryLookupService
+from api.service.interfaces.lookupserviceinterface import LookupServiceInterface
+from api.service.requestlookupservice import RequestLookupService
+from api.service.sqllitelookupservice import SqlLiteLookupService
+from test.service.lookupdatabase import TemporaryLookupDatabase
+
+
+class TestRequestLookupService(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = TemporaryLookupDatabase()
+
+        cls.configuration = cls.database.configuration()
+
+        cls.sql_service = SqlLiteLookupService(cls.configuration)
+        cls.memory_service = InMemoryLookupService(cls.configuration)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sql_service.close()
+        cls.database.cleanup()
+
+    def test_many_lookups_match_single_lookups(self):
+        labels = ["CENTRAL|M1", "central|m1", "SOUTH|M4", "CENTRAL|MISSING"]
+
+        for service in [self.sql_service, self.memory_service]:
+            products = service.lookup_product_many("client", "products", labels)
+
+            self.assertEqual(["central|m1", "south|m4"], sorted(products))
+
+            for label in labels:
+                expected = self.sql_service.lookup_product("client", "products", label, None)
+                actual = products.get(label.casefold())
+
+                self.assertEqual(None if expected is None else expected._asdict(), None if actual is None else actual._asdict(), label)
+
+        self.assertEqual(self.sql_service.lookup_packaging_cost_many("client", "packaging_cost_lookups", ["M1|P2", "m2|9999"]).keys(), self.memory_service.lookup_packaging_cost_many("client", "packaging_cost_lookups", ["M1|P2", "m2|9999"]).keys())
+        self.assertEqual(["isr0|bw1"], list(self.sql_service.lookup_target_margin_many("client", "target_margin_lookups", ["ISR0|BW1", "ISR9|BW1"])))
+
+    def test_prefetched_lookups_do_not_query(self):
+        statements = list()
+        self.sql_service._connection.set_trace_callback(statements.append)
+
+        try:
+            request_service = RequestLookupService(self.sql_service)
+            request_service.lookup_product_many("client", "products", ["CENTRAL|M1", "CENTRAL|MISSING"])
+
+            self.assertEqual(1, len(statements))
+
+            self.assertEqual("M1", request_service.lookup_product("client", "products", "central|m1", None).material)
+            self.assertIsNone(request_service.lookup_product("client", "products", "CENTRAL|MISSING", None))
+            self.assertEqual(1, len(statements))
+
+            self.assertEqual("M2", request_service.lookup_product("client", "products", "CENTRAL|M2", None).material)
+            self.assertEqual(2, len(statements))
+        finally:
+            self.sql_service._connection.set_trace_callback(None)
+
+    def test_single_lookups_are_memoized_with_misses(self):
+        statements = list()
+        self.sql_service._connection.set_trace_callback(statements.append)
+
+        try:
+            request_service = RequestLookupService(self.sql_service)
+
+            for _ in range(3):
+                request_service.lookup_cl_code("client", "cl_codes", "C9|OFF0|PLATE|FLAT", None)
+                request_service.lookup_location_group("client", "location_group_lookup", "CENTRAL", None)
+                request_service.get_default_office("OFF0")
+                request_service.lookup_exchange_rate("client", "products", "CENTRAL", None)
+
+            self.assertEqual(4, len(statements))
+            self.assertEqual(4, request_service.queries)
+            self.assertEqual(8, request_service.saved_queries)
+            self.assertIsNone(request_service.lookup_cl_code("client", "cl_codes", "c9|off0|plate|flat", None))
+        finally:
+            self.sql_service._connection.set_trace_callback(None)
+
+    def test_lookup_services_are_only_instances_of_their_own_classes(self):
+        request_service = RequestLookupService(self.sql_service)
+        caching_service = CachingLookupService(self.sql_service, 10, 60.0)
+
+        for service in [self.sql_service, self.memory_service, request_service, caching_service]:
+            self.assertIsInstance(service, LookupServiceInterface)
+
+        self.assertIsInstance(request_service, RequestLookupService)
+        self.assertNotIsInstance(caching_service, RequestLookupService)
+        self.assertNotIsInstance(request_service, CachingLookupService)
+        self.assertNotIsInstance(self.sql_service, InMemoryLookupService)
@@ -0,0 +1,43 @@
+import sqlite3
+from unittest import TestCase
+
+from api.model.opcode import OpCodeModel
+from api.service.sqllitelookupservice import op_code_from_row
+
+
+class TestRowDecoder(TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE opcodes (OpCodeType, uniqueid, opcode, cuttingoperation, fabindicator, netweightlow, netweighthigh, pieceweightlow, pieceweighthigh, longbasepulltime)")
+        self.connection.execute("INSERT INTO opcodes VALUES ('SAW', 'OP1|1', 'OP1', 'CUT', 'N', 0, 10, '0', 5, 2)")
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_decodes_by_position_with_conversions_and_defaults(self):
+        cursor = self.connection.execute("SELECT * FROM opcodes")
+
+        op_code = op_code_from_row.for_cursor(cursor)(cursor.fetchone())
+
+        self.assertEqual(OpCodeModel("OP1|1", "OP1", "", "CUT", "N", 0.0, 10.0, 0.0, 5.0, 2.0, "SAW"), op_code)
+        self.assertIsInstance(op_code.pieces_weight_low, float)
+
+    def test_matches_name_based_decoding(self):
+        cursor = self.connection.cursor()
+        cursor.row_factory = sqlite3.Row
+
+        by_name = op_code_from_row(cursor.execute("SELECT uniqueid AS lookupkey, * FROM opcodes").fetchone())
+
+        cursor = self.connection.execute("SELECT uniqueid AS lookupkey, * FROM opcodes")
+
+        self.assertEqual(by_name, op_code_from_row.for_cursor(cursor)(cursor.fetchone()))
+
+    def test_models_are_immutable(self):
+        cursor = self.connection.execute("SELECT * FROM opcodes")
+
+        op_code = op_code_from_row.for_cursor(cursor)(cursor.fetchone())
+
+        with self.assertRaises(AttributeError):
+            op_code.op_code_value = "OP2"
+
+        self.assertFalse(hasattr(op_code, "__dict__"))
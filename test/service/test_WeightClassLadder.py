@@ -0,0 +1,42 @@
+import math
+from unittest import TestCase
+
+from api.model.southskidcharge import SouthSkidChargeModel
+from api.model.tmadjustment import TmAdjustmentModel
+from api.service.weightclassladder import WEIGHT_CLASSES, WEIGHT_CLASS_NAMES, weight_class_columns, cust_price_weight_class, cust_price_ladder, order_cost_weight_class, order_cost_ladder, non_mat_cost_weight_class, non_mat_cost_ladder, recommended_price_ladder
+
+
+class TestWeightClassLadder(TestCase):
+    def test_columns_follow_the_ladder(self):
+        tm_adjustment = TmAdjustmentModel("K", "MM", "P", "F", *(float(position) for position in range(len(WEIGHT_CLASSES))))
+
+        self.assertEqual(("1", "200", "40000"), (WEIGHT_CLASS_NAMES[0], WEIGHT_CLASS_NAMES[1], WEIGHT_CLASS_NAMES[-1]))
+        self.assertEqual((tm_adjustment.weight_class_1, tm_adjustment.weight_class_6500, tm_adjustment.weight_class_40000), tuple(weight_class_columns(tm_adjustment)[position] for position in [0, 6, 10]))
+
+    def test_matches_the_per_class_expressions(self):
+        adjustments = tuple(0.01 * position for position in range(len(WEIGHT_CLASSES)))
+        cust_prices = cust_price_ladder(1.37, 0.31, adjustments, 0.02, 0.03)
+        order_costs = order_cost_ladder(12.5, "N", 0.004, "N", SouthSkidChargeModel(), 1500.0, 17.0, 0.0035)
+        non_mat_costs = non_mat_cost_ladder(order_costs, "Level2", (0.0,) * len(WEIGHT_CLASSES), 3.1, 1.8, 50.0)
+
+        for (position, weight_class) in enumerate(WEIGHT_CLASSES):
+            order_cost = 12.5 / weight_class + math.ceil(weight_class / 1500.0) * 17.0 / 1.0 + 0.0035
+
+            self.assertEqual((1.37 / (1 - round(max(min(0.31 + adjustments[position], 0.98), -0.20), 4)) + 0.02) * (1 + 0.03), cust_prices[position])
+            self.assertEqual(order_cost, order_costs[position])
+            self.assertEqual(order_cost + max(3.1 / 100.0, 50.0 / weight_class) + max(15 / weight_class, 0.01), non_mat_costs[position])
+
+    def test_weight_class_functions_match_the_ladders(self):
+        adjustments = tuple(0.01 * position for position in range(len(WEIGHT_CLASSES)))
+        freight_charges = tuple(2.0 + position for position in range(len(WEIGHT_CLASSES)))
+        order_costs = order_cost_ladder(12.5, "N", 0.004, "N", SouthSkidChargeModel(), 1500.0, 17.0, 0.0035)
+
+        self.assertEqual(cust_price_ladder(1.37, 0.31, adjustments, 0.02, 0.03), [cust_price_weight_class(1.37, 0.31, adjustment, 0.02, 0.03) for adjustment in adjustments])
+        self.assertEqual(order_costs, [order_cost_weight_class(weight_class, 12.5, "N", 0.004, "N", SouthSkidChargeModel(), 1500.0, 17.0, 0.0035) for weight_class in WEIGHT_CLASSES])
+        self.assertEqual(non_mat_cost_ladder(order_costs, "Level1", freight_charges, 3.1, 1.8, 50.0), [non_mat_cost_weight_class(weight_class, order_cost, "Level1", freight_charge, 3.1, 1.8, 50.0) for (weight_class, order_cost, freight_charge) in zip(WEIGHT_CLASSES, order_costs, freight_charges)])
+
+    def test_recommended_prices_add_the_small_order_charge_of_the_class(self):
+        rec_prices = recommended_price_ladder("SOUTH", "MIDWEST", 2.0, 0.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        self.assertEqual(str(round(2.5 + 25.0 / 200.0, 4)), rec_prices[1])
+        self.assertEqual(str(round(2.5, 4)), rec_prices[-1])